@@ -0,0 +1,91 @@
+import asyncio
+import random
+import time
+import httpx
+import requests
+from config import Config
+from .circuit import circuit_breakers
+from .http_client import RETRY_STATUS_CODES, check_retry_after, retry_after_seconds
+from .metrics import record_upstream
+from .quota import quota_limiter
+
+# httpx clients are bound to the event loop that created them.
+_clients = {}
+
+def _get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(Config.HTTP_READ_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=Config.ASYNC_HTTP_MAX_CONNECTIONS,
+                                max_keepalive_connections=Config.HTTP_POOL_MAXSIZE),
+            transport=httpx.AsyncHTTPTransport(retries=Config.HTTP_MAX_RETRIES),
+            headers={'Accept': 'application/json', 'Accept-Encoding': 'gzip, deflate'}
+        )
+    return client
+
+async def close():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+def _as_requests_response(response):
+    # Services inspect requests-style errors, so status failures are reported the same way.
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.url = str(response.url)
+    converted.reason = response.reason_phrase
+    converted.headers.update(response.headers)
+    converted._content = response.content
+    return converted
+
+def _retry_delay(attempt, response):
+    retry_after = retry_after_seconds(response.headers)
+    if retry_after is not None:
+        return min(retry_after, Config.HTTP_MAX_RETRY_AFTER)
+    return random.uniform(0, Config.HTTP_BACKOFF_FACTOR * (2 ** attempt))
+
+async def get(url, params=None, timeout=None):
+    breaker = circuit_breakers.for_url(url)
+    breaker.before_call()
+    try:
+        quota_limiter.acquire(url, params)
+        client = _get_client()
+    except Exception:
+        breaker.cancel()
+        raise
+    attempt = 0
+    started = time.perf_counter()
+    while True:
+        try:
+            response = await client.get(url, params=params, timeout=timeout or client.timeout)
+        except asyncio.CancelledError:
+            breaker.cancel()
+            raise
+        except httpx.TimeoutException as e:
+            breaker.record(True, time.perf_counter() - started)
+            record_upstream(url, 'error', time.perf_counter() - started, attempt)
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.HTTPError as e:
+            breaker.record(True, time.perf_counter() - started)
+            record_upstream(url, 'error', time.perf_counter() - started, attempt)
+            raise requests.exceptions.ConnectionError(str(e))
+        retry_after = retry_after_seconds(response.headers)
+        if (response.status_code not in RETRY_STATUS_CODES or attempt >= Config.HTTP_MAX_RETRIES
+                or (retry_after is not None and retry_after > Config.HTTP_MAX_RETRY_AFTER)):
+            elapsed = time.perf_counter() - started
+            breaker.record(response.status_code in RETRY_STATUS_CODES, elapsed)
+            record_upstream(url, response.status_code, elapsed, attempt, len(response.content))
+            check_retry_after(breaker, response.status_code, response.headers)
+            return response
+        await asyncio.sleep(_retry_delay(attempt, response))
+        attempt += 1
+
+async def get_json(url, params=None, timeout=None):
+    response = await get(url, params=params, timeout=timeout)
+    if response.is_error:
+        converted = _as_requests_response(response)
+        raise requests.exceptions.HTTPError(f"{response.status_code} Error for url: {response.url}",
+                                            response=converted)
+    return response.json()
@@ -0,0 +1,108 @@
+import asyncio
+import requests
+from datetime import datetime
+from config import Config
+from .cache import fetch_json_async
+from .services import (MLB_API_BASE, _game_feed_ttl, _store_completed_seasons, merge_season_splits,
+                       build_player_details, build_team_details, weather_city_for_team,
+                       get_weather_for_city, game_fallback_urls, finish_game_details)
+from .store import history_store
+from .weather import venue_weather
+
+async def get_player_stats_async(player_id):
+    current_season = datetime.now().year
+    try:
+        # SQLite reads and writes run on a worker thread so they never stall the event loop.
+        history = await asyncio.to_thread(history_store.get, 'player_seasons', player_id)
+        if history and history.get('through') == current_season - 1:
+            stats_url = (f"{MLB_API_BASE}/people/{player_id}/stats?stats=season"
+                         f"&season={current_season}&group=hitting,pitching")
+            raw_stats = (await fetch_json_async(stats_url, ttl=Config.CACHE_TTL_PLAYER)).get('stats', [])
+            season_stats = merge_season_splits(raw_stats, dict(history['seasons']))
+        else:
+            stats_url = f"{MLB_API_BASE}/people/{player_id}/stats?stats=yearByYear&group=hitting,pitching"
+            raw_stats = (await fetch_json_async(stats_url, ttl=Config.CACHE_TTL_PLAYER)).get('stats', [])
+            season_stats = merge_season_splits(raw_stats)
+            await asyncio.to_thread(_store_completed_seasons, player_id, season_stats, current_season)
+        if not season_stats:
+            return {"error": "No statistical data found for this player."}
+        return season_stats
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching player stats from MLB API: {e}")
+        return {"error": "Failed to fetch player stats from the provider."}
+
+async def get_player_details_async(player_id):
+    try:
+        detailed_player_url = f"{MLB_API_BASE}/people/{player_id}?hydrate=currentTeam,primaryPosition"
+        player_list = (await fetch_json_async(detailed_player_url, ttl=Config.CACHE_TTL_PLAYER)).get('people', [])
+        if not player_list:
+            return {"error": "Player not found."}
+        return build_player_details(player_list[0])
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching player details from MLB API: {e}")
+        return {"error": "Failed to fetch player details from the provider."}
+
+async def _optional(awaitable, default=None):
+    try:
+        return await asyncio.wait_for(awaitable, Config.FANOUT_OPTIONAL_TIMEOUT)
+    except asyncio.TimeoutError:
+        return default
+    except Exception as e:
+        print(f"Optional upstream call failed: {e}")
+        return default
+
+async def get_team_details_async(team_id):
+    try:
+        team_info_task = asyncio.ensure_future(
+            fetch_json_async(f"{MLB_API_BASE}/teams/{team_id}", ttl=Config.CACHE_TTL_TEAM))
+        roster_task = asyncio.ensure_future(
+            fetch_json_async(f"{MLB_API_BASE}/teams/{team_id}/roster", ttl=Config.CACHE_TTL_ROSTER))
+        try:
+            teams = (await team_info_task).get('teams', [])
+        except Exception:
+            roster_task.cancel()
+            raise
+        if not teams:
+            roster_task.cancel()
+            return {"error": "Team not found."}
+        team_data = teams[0]
+        venue_id = team_data.get('venue', {}).get('id')
+        if venue_weather.knows(venue_id):
+            weather_call = asyncio.to_thread(venue_weather.get, venue_id)
+        else:
+            weather_call = asyncio.to_thread(get_weather_for_city, weather_city_for_team(team_data))
+        roster_data, weather = await asyncio.gather(roster_task, _optional(
+            weather_call, default={"error": "Weather service unavailable"}))
+        return build_team_details(team_id, team_data, roster_data, weather)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching team details from MLB API: {e}")
+        return {"error": "Failed to fetch team details from the provider."}
+
+async def get_game_details_async(game_id):
+    stored = await asyncio.to_thread(history_store.get, 'games', game_id)
+    if stored is not None:
+        return stored
+    try:
+        try:
+            data = await fetch_json_async(f"{MLB_API_BASE}/game/{game_id}/feed/live", ttl=_game_feed_ttl)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            data = None
+
+        if data is None:
+            context_data, linescore, boxscore_data = await asyncio.gather(*[
+                fetch_json_async(url, ttl=Config.CACHE_TTL_GAME) for url in game_fallback_urls(game_id)
+            ])
+            game_data = context_data.get('game', {})
+            boxscore = boxscore_data.get('teams', {})
+        else:
+            live_data = data.get('liveData', {})
+            game_data = data.get('gameData', {})
+            linescore = live_data.get('linescore', {})
+            boxscore = live_data.get('boxscore', {}).get('teams', {})
+
+        return await asyncio.to_thread(finish_game_details, game_id, game_data, linescore, boxscore)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching game details from MLB API: {e}")
+        return {"error": "Failed to fetch game details from the provider."}
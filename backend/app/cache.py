@@ -0,0 +1,346 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from config import Config
+from . import async_client, http_client
+from .circuit import CircuitOpenError
+from .codec import dumps, loads
+from .metrics import record_cache_lookup, record_stale_fallback
+from .quota import quota_limiter, QuotaExceededError
+from .shared_cache import create_backend
+
+IMMUTABLE = float('inf')
+MISS = object()
+
+_force_refresh = ContextVar('force_refresh', default=False)
+
+@contextmanager
+def forced_refresh():
+    # Inside this block cached entries are bypassed and replaced with fresh upstream data.
+    token = _force_refresh.set(True)
+    try:
+        yield
+    finally:
+        _force_refresh.reset(token)
+
+# Credentials are sent upstream but never become part of a cache key.
+SECRET_PARAMS = frozenset(['apikey', 'appid', 'key'])
+
+def normalize_key(url, params=None):
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((k, str(v)) for k, v in params.items() if v is not None)
+    query = sorted((k, v) for k, v in query if k.lower() not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'),
+                       urlencode(query), ''))
+
+class _Entry:
+    __slots__ = ('value', 'stored_at', 'ttl')
+
+    def __init__(self, value, ttl, age=0):
+        self.value = value
+        self.stored_at = time.monotonic() - age
+        self.ttl = ttl
+
+    def age(self, now):
+        return now - self.stored_at
+
+class _PendingFetch:
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+class ResponseCache:
+    def __init__(self, max_entries, stale_seconds, shared=None):
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._async_pending = {}
+        self._refreshing = set()
+        # Strong references, so a pending revalidation is not garbage-collected mid-flight.
+        self._refresh_tasks = set()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        # Called with the lock held. Returns the usable cached value (or MISS) and
+        # whether the caller should start a background revalidation.
+        entry = self._entries.get(key)
+        if entry is None or _force_refresh.get():
+            record_cache_lookup('local', 'miss')
+            return MISS, False
+        self._entries.move_to_end(key)
+        age = entry.age(time.monotonic())
+        if age < entry.ttl:
+            record_cache_lookup('local', 'hit')
+            return entry.value, False
+        if age < entry.ttl + min(self.stale_seconds, entry.ttl):
+            record_cache_lookup('local', 'stale')
+            if key in self._refreshing:
+                return entry.value, False
+            self._refreshing.add(key)
+            return entry.value, True
+        record_cache_lookup('local', 'miss')
+        return MISS, False
+
+    def get_or_fetch(self, key, fetch, ttl):
+        with self._lock:
+            value, revalidate = self._lookup(key)
+            if revalidate:
+                threading.Thread(target=self._refresh, args=(key, fetch, ttl), daemon=True).start()
+            if value is not MISS:
+                return value
+            pending = self._pending.get(key)
+            is_leader = pending is None
+            if is_leader:
+                pending = self._pending[key] = _PendingFetch()
+
+        if not is_leader:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            value = self._from_shared(key)
+            if value is MISS:
+                value = fetch()
+                self.set(key, value, ttl)
+            pending.value = value
+            return value
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.event.set()
+
+    async def get_or_fetch_async(self, key, fetch, ttl):
+        with self._lock:
+            value, revalidate = self._lookup(key)
+            if revalidate:
+                task = asyncio.get_running_loop().create_task(self._refresh_async(key, fetch, ttl))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            if value is not MISS:
+                return value
+            pending = self._async_pending.get(key)
+            is_leader = pending is None
+            if is_leader:
+                pending = self._async_pending[key] = asyncio.get_running_loop().create_future()
+
+        if not is_leader:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+            # The leader was cancelled rather than this caller; take over the fetch.
+            return await self.get_or_fetch_async(key, fetch, ttl)
+
+        try:
+            value = MISS if self.shared is None else await asyncio.to_thread(self._from_shared, key)
+            if value is MISS:
+                value = await fetch()
+                await asyncio.to_thread(self.set, key, value, ttl)
+            pending.set_result(value)
+            return value
+        except Exception as e:
+            pending.set_exception(e)
+            # Mark the exception retrieved so a leader without followers does not log it.
+            pending.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_pending.pop(key, None)
+            # A cancelled leader leaves the future unresolved; cancel it so followers stop waiting.
+            if not pending.done():
+                pending.cancel()
+
+    async def _refresh_async(self, key, fetch, ttl):
+        try:
+            value = await fetch()
+            await asyncio.to_thread(self.set, key, value, ttl)
+        except Exception as e:
+            print(f"Background refresh failed for '{key}': {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh(self, key, fetch, ttl):
+        try:
+            self.set(key, fetch(), ttl)
+        except Exception as e:
+            print(f"Background refresh failed for '{key}': {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _from_shared(self, key):
+        # Second tier: another worker may already have fetched this key.
+        if self.shared is None or _force_refresh.get():
+            return MISS
+        hit = self.shared.get(key)
+        record_cache_lookup('shared', 'miss' if hit is None else 'hit')
+        if hit is None:
+            return MISS
+        value, age, ttl = hit
+        self._store_local(key, value, ttl, age)
+        return value
+
+    def _store_local(self, key, value, ttl, age=0):
+        with self._lock:
+            self._entries[key] = _Entry(value, ttl, age)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def last_good(self, key):
+        # Expired entries linger until the LRU evicts them, which makes them the
+        # last-known-good copy when the provider cannot be asked.
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry.value
+        if self.shared is not None:
+            hit = self.shared.get(key)
+            if hit is not None:
+                return hit[0]
+        return MISS
+
+    def set(self, key, value, ttl):
+        if callable(ttl):
+            ttl = ttl(value)
+        if not ttl or ttl <= 0:
+            return
+        self._store_local(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def export_entries(self):
+        # Oldest first, so importing them replays the LRU order.
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.items())
+        return [[key, entry.value, None if entry.ttl == IMMUTABLE else entry.ttl, entry.age(now)]
+                for key, entry in entries]
+
+    def import_entries(self, entries, extra_age=0):
+        # Restored entries rank behind anything fetched since startup.
+        with self._lock:
+            for key, value, ttl, age in reversed(entries):
+                if key not in self._entries:
+                    self._entries[key] = _Entry(value, IMMUTABLE if ttl is None else ttl, age + extra_age)
+                    self._entries.move_to_end(key, last=False)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return len(entries)
+
+response_cache = ResponseCache(Config.CACHE_MAX_ENTRIES, Config.CACHE_STALE_SECONDS,
+                               shared=create_backend(Config.SHARED_CACHE_URL))
+
+def save_cache_snapshot(path=None):
+    path = path or Config.CACHE_SNAPSHOT_PATH
+    entries = response_cache.export_entries()
+    data = dumps({'saved_at': time.time(), 'entries': entries})
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return {"entries": len(entries), "bytes": len(data)}
+
+def load_cache_snapshot(path=None):
+    # Entries keep their original age, so anything past its TTL is only used for
+    # stale-while-revalidate or as a last-known-good copy.
+    path = path or Config.CACHE_SNAPSHOT_PATH
+    try:
+        with open(path, 'rb') as f:
+            snapshot = loads(f.read())
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Error loading cache snapshot '{path}': {e}")
+        return 0
+    extra_age = max(0, time.time() - snapshot.get('saved_at', 0))
+    return response_cache.import_entries(snapshot.get('entries', []), extra_age)
+
+def fetch_json(url, params=None, ttl=0, cache_key=None):
+    key = cache_key or normalize_key(url, params)
+
+    def fetch():
+        response = http_client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    if quota_limiter.is_tracked(url):
+        fetch = _with_last_good(key, url, params, fetch)
+    if not ttl:
+        return fetch()
+    try:
+        return response_cache.get_or_fetch(key, fetch, ttl)
+    except CircuitOpenError as e:
+        return _last_good_or_raise(key, url, e)
+
+async def fetch_json_async(url, params=None, ttl=0, cache_key=None):
+    key = cache_key or normalize_key(url, params)
+    if quota_limiter.is_tracked(url):
+        # Metered providers keep their last-good bookkeeping on the threaded path.
+        return await asyncio.to_thread(fetch_json, url, params, ttl, cache_key)
+
+    def fetch():
+        return async_client.get_json(url, params=params)
+
+    if not ttl:
+        return await fetch()
+    try:
+        return await response_cache.get_or_fetch_async(key, fetch, ttl)
+    except CircuitOpenError as e:
+        return await asyncio.to_thread(_last_good_or_raise, key, url, e)
+
+def _last_good_or_raise(key, url, error):
+    value = response_cache.last_good(key)
+    if value is MISS:
+        raise error
+    record_stale_fallback(url)
+    return value
+
+def _with_last_good(key, url, params, fetch):
+    # Quota-metered providers fall back to their last good payload instead of
+    # spending the remaining budget, or when the budget is gone altogether.
+    def guarded_fetch():
+        last_good = quota_limiter.last_good(key)
+        if last_good is not None and quota_limiter.is_low(url, params):
+            return last_good
+        try:
+            value = fetch()
+        except QuotaExceededError:
+            if last_good is None:
+                raise
+            return last_good
+        quota_limiter.remember(key, value)
+        return value
+    return guarded_fetch
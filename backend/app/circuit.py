@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+import requests
+from config import Config
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+CIRCUIT_GAUGE_VALUES = {CLOSED: 0, HALF_OPEN: 0.5, OPEN: 1}
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    pass
+
+class CircuitBreaker:
+    # Closed: calls flow and outcomes are tallied over a sliding window. Too many
+    # errors or slow calls open the circuit, which rejects calls without touching
+    # the network until the cool-down passes; then a few probe calls decide
+    # whether it closes again or re-opens.
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at = None
+        self.open_seconds = Config.CIRCUIT_OPEN_SECONDS
+        self.times_opened = 0
+        self._calls = deque()
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        if not Config.CIRCUIT_ENABLED:
+            return
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    raise CircuitOpenError(f"Circuit for {self.name} is open.")
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= Config.CIRCUIT_HALF_OPEN_PROBES:
+                    raise CircuitOpenError(f"Circuit for {self.name} is half-open and probing.")
+                self._probes += 1
+
+    def cancel(self):
+        # The call was admitted but never reached the provider.
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, failed, seconds):
+        if not Config.CIRCUIT_ENABLED:
+            return
+        slow = seconds >= Config.CIRCUIT_SLOW_CALL_SECONDS
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self.state = CLOSED
+                    self._calls.clear()
+                return
+            if self.state == OPEN:
+                return
+            self._calls.append((now, failed, slow))
+            while self._calls and now - self._calls[0][0] > Config.CIRCUIT_WINDOW_SECONDS:
+                self._calls.popleft()
+            total = len(self._calls)
+            if total < Config.CIRCUIT_MIN_CALLS:
+                return
+            errors = sum(1 for _, call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+            if errors / total >= Config.CIRCUIT_ERROR_RATE or slow_calls / total >= Config.CIRCUIT_SLOW_RATE:
+                self._open(now)
+
+    def trip(self, seconds):
+        # The provider asked us to stay away (a long Retry-After), so open for at least that long.
+        if not Config.CIRCUIT_ENABLED:
+            return
+        with self._lock:
+            self._open(time.monotonic(), max(seconds, Config.CIRCUIT_OPEN_SECONDS))
+
+    def _open(self, now, seconds=None):
+        self.open_seconds = seconds or Config.CIRCUIT_OPEN_SECONDS
+        print(f"Circuit for {self.name} opened; rejecting calls for {self.open_seconds:.0f}s.")
+        self.state = OPEN
+        self.opened_at = now
+        self.times_opened += 1
+        self._calls.clear()
+
+    def snapshot(self):
+        with self._lock:
+            calls = len(self._calls)
+            errors = sum(1 for _, failed, _ in self._calls if failed)
+            return {"provider": self.name, "state": self.state, "window_calls": calls,
+                    "window_errors": errors, "times_opened": self.times_opened}
+
+class CircuitBreakers:
+    def __init__(self):
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host)
+            return breaker
+
+    def snapshot(self):
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,49 @@
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from config import Config
+
+_local = threading.local()
+
+def _mark_worker():
+    _local.is_worker = True
+
+_executor = ThreadPoolExecutor(max_workers=Config.FANOUT_MAX_WORKERS,
+                               thread_name_prefix='upstream',
+                               initializer=_mark_worker)
+
+def submit(fn, *args, **kwargs):
+    # Calls made from inside a pool worker run inline so nested fan-outs
+    # can never exhaust the pool and deadlock waiting on each other.
+    if getattr(_local, 'is_worker', False):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    context = contextvars.copy_context()
+    return _executor.submit(context.run, fn, *args, **kwargs)
+
+def gather(*calls, return_exceptions=False):
+    futures = [submit(call) for call in calls]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+def optional_result(future, timeout=None, default=None):
+    if timeout is None:
+        timeout = Config.FANOUT_OPTIONAL_TIMEOUT
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        return default
+    except Exception as e:
+        print(f"Optional upstream call failed: {e}")
+        return default
@@ -0,0 +1,335 @@
+import heapq
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from itertools import accumulate
+import requests
+from config import Config
+from .cache import fetch_json
+from .fanout import gather
+from .leaderboards import QUALIFIER, is_ascending, leader_row, leaderboard
+
+MLB_API_BASE = Config.MLB_API_BASE
+
+GROUP_COLUMNS = {
+    'hitting': ('plateAppearances', 'atBats', 'runs', 'hits', 'doubles', 'triples', 'homeRuns',
+                'rbi', 'baseOnBalls', 'strikeOuts', 'hitByPitch', 'sacFlies', 'stolenBases',
+                'caughtStealing', 'totalBases'),
+    'pitching': ('outs', 'battersFaced', 'hits', 'runs', 'earnedRuns', 'homeRuns', 'baseOnBalls',
+                 'strikeOuts', 'hitByPitch', 'numberOfPitches', 'gamesStarted', 'wins', 'losses',
+                 'saves', 'holds'),
+}
+RATE_STATS = {
+    'hitting': ('avg', 'obp', 'slg', 'ops'),
+    'pitching': ('era', 'whip', 'strikeoutsPer9'),
+}
+# The column a qualifier is counted in: plate appearances for hitters, outs (three per inning) for pitchers.
+VOLUME_COLUMN = {'hitting': 'plateAppearances', 'pitching': 'outs'}
+VOLUME_SCALE = {'hitting': 1, 'pitching': 3}
+
+def _ratio(numerator, denominator, scale=1):
+    return round(scale * numerator / denominator, 3) if denominator else None
+
+def _rates(group, totals):
+    if group == 'hitting':
+        avg = _ratio(totals['hits'], totals['atBats'])
+        obp = _ratio(totals['hits'] + totals['baseOnBalls'] + totals['hitByPitch'],
+                     totals['atBats'] + totals['baseOnBalls'] + totals['hitByPitch'] + totals['sacFlies'])
+        slg = _ratio(totals['totalBases'], totals['atBats'])
+        ops = round(obp + slg, 3) if obp is not None and slg is not None else None
+        return {'avg': avg, 'obp': obp, 'slg': slg, 'ops': ops}
+    outs = totals['outs']
+    return {
+        'inningsPitched': f"{outs // 3}.{outs % 3}",
+        'era': _ratio(totals['earnedRuns'], outs, 27),
+        'whip': _ratio(totals['baseOnBalls'] + totals['hits'], outs, 3),
+        'strikeoutsPer9': _ratio(totals['strikeOuts'], outs, 27),
+    }
+
+def _stat_value(stat, column):
+    value = stat.get(column)
+    if value is None and column == 'outs':
+        innings, _, partial = str(stat.get('inningsPitched', '0')).partition('.')
+        try:
+            return int(innings or 0) * 3 + int(partial or 0)
+        except ValueError:
+            return 0
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def _game_log_rows(person):
+    player_id = person.get('id')
+    for entry in person.get('stats', []):
+        group = entry.get('group', {}).get('displayName')
+        if group not in GROUP_COLUMNS or entry.get('type', {}).get('displayName') != 'gameLog':
+            continue
+        columns = GROUP_COLUMNS[group]
+        for split in entry.get('splits', []):
+            try:
+                day = date.fromisoformat(split.get('date') or '').toordinal()
+            except ValueError:
+                continue
+            stat = split.get('stat', {})
+            values = tuple(_stat_value(stat, column) for column in columns)
+            yield group, (player_id, day, 1 if split.get('isHome') else 0, values)
+
+class GameLogTable:
+    # Rows are sorted by (player, date) so each player owns one contiguous slice.
+    # Only 32-bit prefix sums are kept per column: any slice total is prefix[hi] - prefix[lo],
+    # and the "home" prefixes give home/away splits the same way.
+    def __init__(self, group, player_ids, names, offsets, dates, home_rows, prefix, home_prefix):
+        self.group = group
+        self.columns = GROUP_COLUMNS[group]
+        self.player_ids = player_ids
+        self.names = names
+        self.offsets = offsets
+        self.dates = dates
+        self.home_rows = home_rows
+        self.prefix = prefix
+        self.home_prefix = home_prefix
+        self.index = {player_id: i for i, player_id in enumerate(player_ids)}
+        self.first_day = min(dates) if dates else None
+        self.last_day = max(dates) if dates else None
+
+    @classmethod
+    def from_rows(cls, group, rows, names):
+        rows.sort(key=lambda row: (row[0], row[1]))
+        player_ids = array('i')
+        offsets = array('i')
+        for i, row in enumerate(rows):
+            if not player_ids or player_ids[-1] != row[0]:
+                player_ids.append(row[0])
+                offsets.append(i)
+        offsets.append(len(rows))
+        dates = array('i', (row[1] for row in rows))
+        home = [row[2] for row in rows]
+        home_rows = array('i', accumulate(home, initial=0))
+        prefix = {}
+        home_prefix = {}
+        for c, column in enumerate(GROUP_COLUMNS[group]):
+            values = [row[3][c] for row in rows]
+            prefix[column] = array('i', accumulate(values, initial=0))
+            home_prefix[column] = array('i', accumulate((v * h for v, h in zip(values, home)), initial=0))
+        return cls(group, player_ids, [names.get(player_id) for player_id in player_ids],
+                   offsets, dates, home_rows, prefix, home_prefix)
+
+    def _arrays(self):
+        yield self.player_ids
+        yield self.offsets
+        yield self.dates
+        yield self.home_rows
+        for column in self.columns:
+            yield self.prefix[column]
+            yield self.home_prefix[column]
+
+    def save(self, path):
+        header = {'group': self.group, 'columns': list(self.columns), 'names': self.names,
+                  'lengths': [len(values) for values in self._arrays()]}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            for values in self._arrays():
+                values.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            if tuple(header['columns']) != GROUP_COLUMNS[header['group']]:
+                raise ValueError("column layout changed since the snapshot was written")
+            loaded = []
+            for length in header['lengths']:
+                values = array('i')
+                values.fromfile(f, length)
+                loaded.append(values)
+        player_ids, offsets, dates, home_rows = loaded[:4]
+        columns = GROUP_COLUMNS[header['group']]
+        prefix = {column: loaded[4 + 2 * c] for c, column in enumerate(columns)}
+        home_prefix = {column: loaded[5 + 2 * c] for c, column in enumerate(columns)}
+        return cls(header['group'], player_ids, header['names'], offsets, dates, home_rows,
+                   prefix, home_prefix)
+
+    def player_slice(self, i, first_day=None, last_day=None):
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        if first_day is not None:
+            lo = bisect_left(self.dates, first_day, lo, hi)
+        if last_day is not None:
+            hi = bisect_right(self.dates, last_day, lo, hi)
+        return lo, hi
+
+    def total(self, column, lo, hi, side=None):
+        value = self.prefix[column][hi] - self.prefix[column][lo]
+        if side is None:
+            return value
+        home = self.home_prefix[column][hi] - self.home_prefix[column][lo]
+        return home if side == 'home' else value - home
+
+    def summarize(self, lo, hi, side=None):
+        games = hi - lo
+        if side is not None:
+            home_games = self.home_rows[hi] - self.home_rows[lo]
+            games = home_games if side == 'home' else games - home_games
+        totals = {column: self.total(column, lo, hi, side) for column in self.columns}
+        return {'games': games, **totals, **_rates(self.group, totals)}
+
+    def stat_value(self, stat, lo, hi):
+        if stat in self.prefix:
+            return self.total(stat, lo, hi)
+        totals = {column: self.total(column, lo, hi) for column in self.columns}
+        return _rates(self.group, totals)[stat]
+
+class GameLogStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._ingesting = threading.Lock()
+
+    def _path(self, season, group):
+        return os.path.join(self.directory, f"{season}-{group}.bin")
+
+    def table(self, group, season=None):
+        # Snapshots are reloaded when the file changes, so workers that did not
+        # run the ingestion pick up the leader's latest write.
+        season = season or datetime.now().year
+        path = self._path(season, group)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            cached = self._tables.get((season, group))
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            table = GameLogTable.load(path)
+        except (OSError, EOFError, ValueError, KeyError) as e:
+            print(f"Error loading game log snapshot '{path}': {e}")
+            return cached[1] if cached is not None else None
+        with self._lock:
+            self._tables[(season, group)] = (mtime, table)
+        return table
+
+    def is_due(self, season=None):
+        season = season or datetime.now().year
+        try:
+            age = time.time() - min(os.stat(self._path(season, group)).st_mtime for group in GROUP_COLUMNS)
+        except FileNotFoundError:
+            return True
+        return age >= Config.GAME_LOG_REFRESH_SECONDS
+
+    def ingest_if_due(self):
+        if not self._ingesting.acquire(blocking=False):
+            return None
+        try:
+            if self.is_due():
+                return self.ingest()
+        finally:
+            self._ingesting.release()
+
+    def ingest(self, season=None):
+        season = season or datetime.now().year
+        try:
+            players = fetch_json(f"{MLB_API_BASE}/sports/1/players?season={season}",
+                                 ttl=Config.CACHE_TTL_PLAYER).get('people', [])
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching the {season} player pool from MLB API: {e}")
+            return {"error": "Failed to fetch the player pool from the provider."}
+        names = {person['id']: person.get('fullName') for person in players if person.get('id')}
+        player_ids = list(names)
+        chunk_size = Config.BULK_CHUNK_SIZE
+        chunks = [player_ids[i:i + chunk_size] for i in range(0, len(player_ids), chunk_size)]
+        hydrate = f"stats(group=[hitting,pitching],type=[gameLog],season={season})"
+        results = gather(*[
+            (lambda chunk: lambda: fetch_json(
+                f"{MLB_API_BASE}/people?personIds={','.join(str(i) for i in chunk)}&hydrate={hydrate}"
+            ).get('people', []))(chunk)
+            for chunk in chunks
+        ], return_exceptions=True)
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            # A partial pass would silently drop players, so the previous snapshot is kept.
+            print(f"Error fetching game logs from MLB API ({len(failures)} of {len(chunks)} chunks): {failures[0]}")
+            return {"error": "Failed to fetch game logs from the provider."}
+        rows = {group: [] for group in GROUP_COLUMNS}
+        for people in results:
+            for person in people:
+                for group, row in _game_log_rows(person):
+                    rows[group].append(row)
+        for group, group_rows in rows.items():
+            GameLogTable.from_rows(group, group_rows, names).save(self._path(season, group))
+        return {"season": season, "players": len(player_ids),
+                "rows": {group: len(group_rows) for group, group_rows in rows.items()}}
+
+game_log_store = GameLogStore(Config.GAME_LOG_DIR)
+
+def _as_of(table, as_of=None):
+    today = date.today().toordinal()
+    last_day = table.last_day if table.last_day is not None else today
+    return min(as_of.toordinal() if as_of else today, last_day)
+
+def _missing_table(season):
+    return {"error": f"Game logs for the {season or datetime.now().year} season have not been ingested yet."}
+
+def get_player_rolling_stats(player_id, group, windows, season=None, as_of=None):
+    table = game_log_store.table(group, season)
+    if table is None:
+        return _missing_table(season)
+    i = table.index.get(player_id)
+    if i is None:
+        return {"error": "No game logs found for this player."}
+    end = _as_of(table, as_of)
+    results = {'asOf': date.fromordinal(end).isoformat(), 'group': group, 'windows': {}}
+    for days in windows:
+        lo, hi = table.player_slice(i, end - days + 1, end)
+        results['windows'][str(days)] = table.summarize(lo, hi)
+    lo, hi = table.player_slice(i, None, end)
+    results['season'] = table.summarize(lo, hi)
+    return results
+
+def get_player_splits(player_id, group, season=None):
+    table = game_log_store.table(group, season)
+    if table is None:
+        return _missing_table(season)
+    i = table.index.get(player_id)
+    if i is None:
+        return {"error": "No game logs found for this player."}
+    lo, hi = table.player_slice(i)
+    return {'group': group, 'home': table.summarize(lo, hi, 'home'),
+            'away': table.summarize(lo, hi, 'away'), 'total': table.summarize(lo, hi)}
+
+def get_game_log_leaders(group, stat, days=None, limit=10, min_volume=None, order=None, season=None, as_of=None):
+    table = game_log_store.table(group, season)
+    if table is None:
+        return _missing_table(season)
+    end = _as_of(table, as_of)
+    start = end - days + 1 if days else None
+    volume_column = VOLUME_COLUMN[group]
+    scale = VOLUME_SCALE[group]
+    if min_volume is None and stat in RATE_STATS[group]:
+        span = days or (end - table.first_day + 1 if table.first_day is not None else 0)
+        min_volume = round(span * QUALIFIER[group][2], 1)
+    threshold = (min_volume or 0) * scale
+    candidates = []
+    for i, player_id in enumerate(table.player_ids):
+        lo, hi = table.player_slice(i, start, end)
+        if hi == lo or table.total(volume_column, lo, hi) < threshold:
+            continue
+        value = table.stat_value(stat, lo, hi)
+        if value is not None:
+            candidates.append((value, i, lo, hi))
+    ascending = is_ascending(group, stat, order)
+    pick = heapq.nsmallest if ascending else heapq.nlargest
+    leaders = [leader_row(rank, table.player_ids[i], table.names[i], None, group, stat, value, hi - lo,
+                          table.total(volume_column, lo, hi) / scale)
+               for rank, (value, i, lo, hi) in enumerate(pick(limit, candidates, key=lambda c: c[0]), start=1)]
+    return leaderboard(group, stat, ascending, min_volume, leaders,
+                       days=days, asOf=date.fromordinal(end).isoformat())
@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader, MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+from config import Config
+from .circuit import circuit_breakers, CircuitOpenError
+from .metrics import record_upstream
+from .quota import quota_limiter
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class JitteredRetry(Retry):
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return random.uniform(0, backoff)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        # A Retry-After longer than a request can wait ends the retries; the
+        # response goes back to the caller instead of parking this thread.
+        retry_after = None if response is None else retry_after_seconds(response.headers)
+        if retry_after is not None and retry_after > Config.HTTP_MAX_RETRY_AFTER:
+            raise MaxRetryError(_pool, url, ResponseError(f"Retry-After of {retry_after:.0f}s is too long"))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+def retry_after_seconds(headers):
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return JitteredRetry(0).parse_retry_after(value)
+    except InvalidHeader:
+        return None
+
+def _build_session():
+    retry = JitteredRetry(
+        total=Config.HTTP_MAX_RETRIES,
+        connect=Config.HTTP_MAX_RETRIES,
+        read=Config.HTTP_MAX_RETRIES,
+        status=Config.HTTP_MAX_RETRIES,
+        backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+# Built on first use so importing the app does not set up connection pools.
+_session = None
+_session_lock = threading.Lock()
+
+def _get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def warm_up():
+    _get_session()
+
+def is_warm():
+    return _session is not None
+
+def check_retry_after(breaker, status, headers):
+    # Past the cap, the provider's back-off becomes an open circuit: callers get
+    # CircuitOpenError and fall back to their last-known-good copy.
+    retry_after = retry_after_seconds(headers) if status in RETRY_STATUS_CODES else None
+    if retry_after is not None and retry_after > Config.HTTP_MAX_RETRY_AFTER:
+        breaker.trip(retry_after)
+        raise CircuitOpenError(f"{breaker.name} asked to retry after {retry_after:.0f}s.")
+
+def get(url, params=None, timeout=None, **kwargs):
+    breaker = circuit_breakers.for_url(url)
+    breaker.before_call()
+    try:
+        quota_limiter.acquire(url, params)
+    except Exception:
+        breaker.cancel()
+        raise
+    if timeout is None:
+        timeout = (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
+    started = time.perf_counter()
+    try:
+        response = _get_session().get(url, params=params, timeout=timeout, **kwargs)
+    except requests.exceptions.RequestException:
+        elapsed = time.perf_counter() - started
+        breaker.record(True, elapsed)
+        record_upstream(url, 'error', elapsed)
+        raise
+    elapsed = time.perf_counter() - started
+    breaker.record(response.status_code in RETRY_STATUS_CODES, elapsed)
+    retries = getattr(getattr(response.raw, 'retries', None), 'history', ())
+    record_upstream(url, response.status_code, elapsed, len(retries), len(response.content))
+    check_retry_after(breaker, response.status_code, response.headers)
+    return response
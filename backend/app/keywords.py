@@ -0,0 +1,32 @@
+MLB_TEAM_KEYWORDS = [
+    'd-backs', 'diamondbacks', 'braves', 'orioles', 'red sox', 'cubs', 'white sox', 
+    'reds', 'guardians', 'rockies', 'tigers', 'astros', 'royals', 'angels', 
+    'dodgers', 'marlins', 'brewers', 'twins', 'mets', 'yankees', 'athletics', 
+    'a\'s', 'phillies', 'pirates', 'padres', 'giants', 'mariners', 'cardinals', 
+    'rays', 'rangers', 'blue jays', 'nationals'
+]
+MLB_SUPERSTAR_KEYWORDS = [
+    'ohtani', 'judge', 'trout', 'soto', 'betts', 'acuna',  'raleigh', 'springer', 
+    'freeman', 'harper', 'kershaw', 'degrom', 'scherzer', 'verlander', 'cole', 'schwarber', 
+    'skenes', 'skubal', 'duran', 'snell', 'yamamoto'
+]
+# The same stars by MLB person id, so search can boost them without boosting everyone who shares a surname.
+MLB_SUPERSTAR_PLAYER_IDS = {
+    660271: 'Shohei Ohtani', 592450: 'Aaron Judge', 545361: 'Mike Trout', 665742: 'Juan Soto',
+    605141: 'Mookie Betts', 660670: 'Ronald Acuna Jr.', 663728: 'Cal Raleigh', 543807: 'George Springer',
+    518692: 'Freddie Freeman', 547180: 'Bryce Harper', 477132: 'Clayton Kershaw', 594798: 'Jacob deGrom',
+    453286: 'Max Scherzer', 434378: 'Justin Verlander', 543037: 'Gerrit Cole', 656941: 'Kyle Schwarber',
+    694973: 'Paul Skenes', 669373: 'Tarik Skubal', 680776: 'Jarren Duran', 605483: 'Blake Snell',
+    808967: 'Yoshinobu Yamamoto',
+}
+MLB_JARGON_KEYWORDS = [
+    'pitcher', 'catcher', 'infielder', 'outfielder', 'hitter', 'batter', 'bullpen',
+    'strikeout', 'home run', 'grand slam', 'no-hitter', 'perfect game', 'inning',
+    'dugout', 'umpire', 'world series', 'cy young', 'double play'
+]
+MLB_GENERAL_KEYWORDS = [
+    'playoffs', 'all-star', 'mvp', 'championship', 'division series'
+]
+COMPETITOR_LEAGUE_KEYWORDS = [
+    'nfl', 'nba', 'nhl', 'pga', 'nascar', 'mls', 'premier league', 'f1', 'formula 1'
+]
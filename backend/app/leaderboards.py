@@ -0,0 +1,58 @@
+import math
+from config import Config
+
+# Shared by every custom leaderboard (season totals and game-log windows), so
+# the same stat ranks the same way and rows come back in one shape.
+
+STAT_GROUPS = ('hitting', 'pitching')
+# Stats where the smallest value leads when no explicit order is requested.
+LOWER_IS_BETTER = {
+    'hitting': {'strikeOuts', 'groundIntoDoublePlay', 'caughtStealing'},
+    'pitching': {'era', 'whip', 'avg', 'obp', 'slg', 'ops', 'hitsPer9Inn', 'walksPer9Inn',
+                 'homeRunsPer9', 'runsScoredPer9', 'losses', 'blownSaves', 'wildPitches'},
+}
+# Qualifier volume and how much of it a player needs per team game (the MLB rule)
+# or, where team games are unknown, per calendar day of the window.
+QUALIFIER = {
+    'hitting': ('plateAppearances', Config.SEASON_STATS_QUALIFY_PA_PER_GAME,
+                Config.GAME_LOG_QUALIFY_PER_DAY['hitting']),
+    'pitching': ('inningsPitched', Config.SEASON_STATS_QUALIFY_IP_PER_GAME,
+                 Config.GAME_LOG_QUALIFY_PER_DAY['pitching']),
+}
+# Decimal places, and whether values below one drop the leading zero, for rates
+# that are computed locally rather than read from the provider.
+RATE_FORMATS = {
+    'avg': (3, True), 'obp': (3, True), 'slg': (3, True), 'ops': (3, True),
+    'era': (2, False), 'whip': (2, False), 'strikeoutsPer9': (2, False),
+}
+
+def is_ascending(group, stat, order=None):
+    return stat in LOWER_IS_BETTER[group] if order is None else order == 'asc'
+
+def display_value(name, value, rate_format=None):
+    # Values come back the way the provider writes them: counts as integers and
+    # rates as strings with the provider's precision (".285", "3.41").
+    if value is None or math.isnan(value):
+        return None
+    if name == 'inningsPitched':
+        outs = round(value * 3)
+        return f"{outs // 3}.{outs % 3}"
+    if rate_format is None:
+        return int(value) if float(value).is_integer() else round(value, 3)
+    decimals, bare = rate_format
+    text = f"{value:.{decimals}f}"
+    if bare and text.startswith(('0.', '-0.')):
+        text = text.replace('0.', '.', 1)
+    return text
+
+def leader_row(rank, player_id, name, team, group, stat, value, games, volume, rate_format=None):
+    volume_name = QUALIFIER[group][0]
+    return {'rank': rank, 'id': player_id, 'name': name, 'team': team,
+            'value': display_value(stat, value, rate_format or RATE_FORMATS.get(stat)),
+            'games': display_value('games', games),
+            volume_name: display_value(volume_name, volume)}
+
+def leaderboard(group, stat, ascending, minimum, leaders, **context):
+    # minimum is a volume threshold, 'qualified' when it varies by team, or None.
+    return {'group': group, 'stat': stat, **context, 'order': 'asc' if ascending else 'desc',
+            'qualifier': QUALIFIER[group][0], 'minimum': minimum, 'leaders': leaders}
@@ -0,0 +1,76 @@
+import threading
+import time
+
+class Subsystem:
+    __slots__ = ('name', 'start', 'is_warm', 'required', 'blocking', 'started_at', 'error')
+
+    def __init__(self, name, start, is_warm, required, blocking):
+        self.name = name
+        self.start = start
+        self.is_warm = is_warm
+        self.required = required
+        self.blocking = blocking
+        self.started_at = None
+        self.error = None
+
+class Lifecycle:
+    # Heavy subsystems register here instead of starting at import. start() runs
+    # once the process is actually serving: blocking steps (cheap, and needed by
+    # the first requests) run inline, everything else warms up on a background thread.
+    def __init__(self):
+        self._subsystems = []
+        self._started = False
+        self._lock = threading.Lock()
+        # Set once the blocking steps have run; callers that arrive meanwhile wait for it.
+        self._ready = threading.Event()
+        self.started_at = None
+
+    def register(self, name, start=None, is_warm=None, required=False, blocking=False):
+        self._subsystems.append(Subsystem(name, start, is_warm, required, blocking))
+
+    def start(self):
+        if self._ready.is_set():
+            return
+        with self._lock:
+            starting = not self._started
+            if starting:
+                self._started = True
+                self.started_at = time.time()
+        if not starting:
+            self._ready.wait()
+            return
+        try:
+            for subsystem in self._subsystems:
+                if subsystem.blocking:
+                    self._start(subsystem)
+        finally:
+            self._ready.set()
+        threading.Thread(target=self._warm_up, name='warm-up', daemon=True).start()
+
+    def _warm_up(self):
+        for subsystem in self._subsystems:
+            if not subsystem.blocking:
+                self._start(subsystem)
+
+    def _start(self, subsystem):
+        try:
+            if subsystem.start is not None:
+                subsystem.start()
+        except Exception as e:
+            subsystem.error = str(e)
+            print(f"Starting subsystem '{subsystem.name}' failed: {e}")
+        subsystem.started_at = time.time()
+
+    def readiness(self):
+        subsystems = {}
+        for subsystem in self._subsystems:
+            if subsystem.started_at is None:
+                warm = False
+            else:
+                warm = subsystem.error is None and (subsystem.is_warm is None or bool(subsystem.is_warm()))
+            subsystems[subsystem.name] = {"warm": warm, "required": subsystem.required,
+                                          "error": subsystem.error}
+        ready = self._started and all(s["warm"] for s in subsystems.values() if s["required"])
+        return {"ready": ready, "started_at": self.started_at, "subsystems": subsystems}
+
+lifecycle = Lifecycle()
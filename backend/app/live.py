@@ -0,0 +1,296 @@
+import asyncio
+import copy
+import queue
+import threading
+import requests
+from config import Config
+from .cache import fetch_json
+from .services import build_game_details
+
+MLB_LIVE_API_BASE = Config.MLB_LIVE_API_BASE
+
+def _decode_pointer(path):
+    return [part.replace('~1', '/').replace('~0', '~') for part in path.split('/')[1:]]
+
+def _resolve(doc, parts):
+    for part in parts:
+        doc = doc[int(part)] if isinstance(doc, list) else doc[part]
+    return doc
+
+def apply_json_patch(doc, operations):
+    for operation in operations:
+        op = operation.get('op')
+        parts = _decode_pointer(operation.get('path', ''))
+        if not parts:
+            if op in ('add', 'replace'):
+                doc = operation.get('value')
+            continue
+        if op in ('copy', 'move'):
+            from_parts = _decode_pointer(operation['from'])
+            value = _resolve(doc, from_parts)
+            if op == 'copy':
+                # A copy must not alias its source, or later operations on one would change both.
+                value = copy.deepcopy(value)
+            if op == 'move':
+                parent = _resolve(doc, from_parts[:-1])
+                del parent[int(from_parts[-1]) if isinstance(parent, list) else from_parts[-1]]
+            op, operation = 'add', {'value': value}
+        parent = _resolve(doc, parts[:-1])
+        key = parts[-1]
+        if isinstance(parent, list):
+            if op == 'add':
+                parent.insert(len(parent) if key == '-' else int(key), operation.get('value'))
+            elif op == 'replace':
+                parent[int(key)] = operation.get('value')
+            elif op == 'remove':
+                del parent[int(key)]
+        else:
+            if op in ('add', 'replace'):
+                parent[key] = operation.get('value')
+            elif op == 'remove':
+                parent.pop(key, None)
+    return doc
+
+def _details_from_feed(feed):
+    live_data = feed.get('liveData', {})
+    return build_game_details(feed.get('gameData', {}), live_data.get('linescore', {}),
+                              live_data.get('boxscore', {}).get('teams', {}))
+
+def _score(details):
+    teams = details.get('linescore', {}).get('teams', {})
+    return {
+        "away": teams.get('away', {}).get('runs', 0),
+        "home": teams.get('home', {}).get('runs', 0)
+    }
+
+def diff_game_details(previous, current):
+    changes = {}
+    if previous.get('status') != current.get('status'):
+        changes['status'] = current.get('status')
+    if previous.get('linescore') != current.get('linescore'):
+        changes['linescore'] = current.get('linescore')
+        score = _score(current)
+        if score != _score(previous):
+            changes['score'] = score
+    changed_players = []
+    for team in ["away", "home"]:
+        old_stats = {p['id']: p['stats'] for p in previous.get('players', {}).get(team, [])}
+        for player in current.get('players', {}).get(team, []):
+            if old_stats.get(player['id']) != player['stats']:
+                changed_players.append({"team": team, "id": player['id'], "name": player['name'],
+                                        "stats": player['stats']})
+    if changed_players:
+        changes['players'] = changed_players
+    return changes
+
+class Subscription:
+    def __init__(self, hub, poller):
+        self._hub = hub
+        self._poller = poller
+        self.queue = queue.Queue(maxsize=Config.LIVE_SUBSCRIBER_QUEUE_SIZE)
+
+    def push(self, event, data):
+        try:
+            self.queue.put_nowait((event, data))
+        except queue.Full:
+            # A subscriber that fell behind would miss deltas, so resync it with a snapshot.
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.queue.put_nowait(('snapshot', self._poller.details))
+
+    def end(self):
+        while True:
+            try:
+                self.queue.put_nowait(None)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def events(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=Config.LIVE_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield 'heartbeat', None
+                continue
+            if item is None:
+                return
+            yield item
+
+    def close(self):
+        self._hub.unsubscribe(self._poller, self)
+
+class AsyncSubscription(Subscription):
+    # Delivers into an asyncio.Queue on the subscriber's event loop, so an open
+    # stream costs a coroutine rather than a thread.
+    def __init__(self, hub, poller, loop):
+        self._hub = hub
+        self._poller = poller
+        self._loop = loop
+        self.queue = asyncio.Queue(maxsize=Config.LIVE_SUBSCRIBER_QUEUE_SIZE)
+
+    def push(self, event, data):
+        self._call_soon((event, data))
+
+    def end(self):
+        self._call_soon(None)
+
+    def _call_soon(self, item):
+        try:
+            self._loop.call_soon_threadsafe(self._put, item)
+        except RuntimeError:
+            # The loop has already shut down; nobody is listening any more.
+            pass
+
+    def _put(self, item):
+        if item is None or self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            if item is not None:
+                item = ('snapshot', self._poller.details)
+        self.queue.put_nowait(item)
+
+    async def events(self):
+        while True:
+            try:
+                item = await asyncio.wait_for(self.queue.get(), Config.LIVE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield 'heartbeat', None
+                continue
+            if item is None:
+                return
+            yield item
+
+class LiveGamePoller:
+    def __init__(self, hub, game_id):
+        self.hub = hub
+        self.game_id = game_id
+        self.subscribers = set()
+        self.feed = None
+        self.details = None
+        self.finished = False
+        self._wake = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name=f'live-{self.game_id}', daemon=True).start()
+
+    def _run(self):
+        failures = 0
+        try:
+            while self.hub.keep_polling(self):
+                try:
+                    self._poll()
+                    failures = 0
+                except (requests.exceptions.RequestException, KeyError, IndexError, ValueError) as e:
+                    print(f"Error polling live feed for game {self.game_id}: {e}")
+                    self.feed = None
+                    failures += 1
+                except Exception as e:
+                    print(f"Unexpected error polling live feed for game {self.game_id}: {e!r}")
+                    self.feed = None
+                    failures += 1
+                if self.finished:
+                    break
+                state = (self.feed or {}).get('gameData', {}).get('status', {}).get('abstractGameState')
+                if failures:
+                    delay = min(Config.LIVE_POLL_SECONDS * 2 ** failures, Config.LIVE_IDLE_POLL_SECONDS)
+                else:
+                    delay = Config.LIVE_POLL_SECONDS if state == 'Live' else Config.LIVE_IDLE_POLL_SECONDS
+                self._wake.wait(delay)
+        finally:
+            # However the loop ends, subscribers are released and the next one starts a fresh poller.
+            self.hub.finish(self)
+
+    def _timecode(self):
+        return (self.feed or {}).get('metaData', {}).get('timeStamp')
+
+    def _poll(self):
+        timecode = self._timecode()
+        if timecode is None:
+            self.feed = fetch_json(f"{MLB_LIVE_API_BASE}/game/{self.game_id}/feed/live")
+        else:
+            patch = fetch_json(f"{MLB_LIVE_API_BASE}/game/{self.game_id}/feed/live/diffPatch",
+                               params={'startTimecode': timecode})
+            if isinstance(patch, dict):
+                # Upstream answers with the full feed when the timecode is too old to diff.
+                self.feed = patch
+            else:
+                for entry in patch:
+                    self.feed = apply_json_patch(self.feed, entry.get('diff', []))
+
+        # Patches mutate the feed in place, so keep a private copy to diff against next time.
+        details = copy.deepcopy(_details_from_feed(self.feed))
+        previous, self.details = self.details, details
+        if previous is None:
+            self.hub.broadcast(self, 'snapshot', details)
+        else:
+            changes = diff_game_details(previous, details)
+            if changes:
+                self.hub.broadcast(self, 'update', changes)
+        if self.feed.get('gameData', {}).get('status', {}).get('abstractGameState') == 'Final':
+            self.finished = True
+            self.hub.broadcast(self, 'final', {"status": details.get('status')})
+
+class LiveGameHub:
+    def __init__(self):
+        self._pollers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, game_id, loop=None):
+        # Threaded streams each pin a worker thread, so they are capped separately
+        # from event-loop streams. Returns None once the cap is reached.
+        kind, limit = ((AsyncSubscription, Config.LIVE_MAX_ASYNC_STREAMS) if loop is not None
+                       else (Subscription, Config.LIVE_MAX_THREAD_STREAMS))
+        with self._lock:
+            streams = sum(1 for poller in self._pollers.values()
+                          for subscription in poller.subscribers if type(subscription) is kind)
+            if streams >= limit:
+                return None
+            poller = self._pollers.get(game_id)
+            is_new = poller is None
+            if is_new:
+                poller = self._pollers[game_id] = LiveGamePoller(self, game_id)
+            subscription = Subscription(self, poller) if loop is None else AsyncSubscription(self, poller, loop)
+            poller.subscribers.add(subscription)
+            if poller.details is not None:
+                subscription.push('snapshot', poller.details)
+        if is_new:
+            poller.start()
+        return subscription
+
+    def unsubscribe(self, poller, subscription):
+        with self._lock:
+            poller.subscribers.discard(subscription)
+
+    def keep_polling(self, poller):
+        with self._lock:
+            if poller.subscribers:
+                return True
+            self._pollers.pop(poller.game_id, None)
+            return False
+
+    def finish(self, poller):
+        with self._lock:
+            if self._pollers.get(poller.game_id) is poller:
+                del self._pollers[poller.game_id]
+            for subscription in poller.subscribers:
+                subscription.end()
+            poller.subscribers.clear()
+
+    def broadcast(self, poller, event, data):
+        with self._lock:
+            subscribers = list(poller.subscribers)
+        for subscription in subscribers:
+            subscription.push(event, data)
+
+    def active_games(self):
+        with self._lock:
+            return {game_id: len(poller.subscribers) for game_id, poller in self._pollers.items()}
+
+live_hub = LiveGameHub()
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import requests
+from config import Config
+from .responses import EncodedBody
+from .services import fetch_standings_data, process_standings, fetch_leaders_data, process_leaders
+
+def _team_row(team_entry, division_name):
+    team_info = team_entry.get('team', {})
+    league_record = team_entry.get('leagueRecord', {})
+    wins = league_record.get('wins', 0)
+    losses = league_record.get('losses', 0)
+    return {
+        'id': team_info.get('id'),
+        'name': team_info.get('name'),
+        'logo': f"https://www.mlbstatic.com/team-logos/{team_info.get('id')}.svg",
+        'division': division_name,
+        'wins': wins,
+        'losses': losses,
+        'pct': league_record.get('pct', '.000'),
+        'runDifferential': team_entry.get('runDifferential', 0),
+        'streak': team_entry.get('streak', {}).get('streakCode', '-')
+    }
+
+def _tiebreak_key(team):
+    # Win percentage, then run differential, then wins; name keeps the order deterministic.
+    games = team['wins'] + team['losses']
+    pct = team['wins'] / games if games else 0
+    return (-pct, -team['runDifferential'], -team['wins'], team['name'] or '')
+
+def _games_back(reference, team):
+    return ((reference['wins'] - team['wins']) + (team['losses'] - reference['losses'])) / 2
+
+def _format_games_back(games_back):
+    if games_back == 0:
+        return '-'
+    if games_back < 0:
+        return f"+{-games_back:.1f}"
+    return f"{games_back:.1f}"
+
+def _teams_by_league(data):
+    leagues = OrderedDict()
+    for record in data.get('records', []):
+        league_name = record.get('league', {}).get('name')
+        division_name = record.get('division', {}).get('name')
+        rows = sorted((_team_row(entry, division_name) for entry in record.get('teamRecords', [])),
+                      key=_tiebreak_key)
+        for rank, row in enumerate(rows, start=1):
+            row['divisionRank'] = rank
+        leagues.setdefault(league_name, []).extend(rows)
+    return leagues
+
+def build_league_view(data):
+    view = []
+    for league_name, teams in _teams_by_league(data).items():
+        ordered = sorted(teams, key=_tiebreak_key)
+        for team in ordered:
+            team['gb'] = _format_games_back(_games_back(ordered[0], team))
+        view.append({'league': league_name, 'teams': ordered})
+    return view
+
+def build_wildcard_view(data, spots=3):
+    view = []
+    for league_name, teams in _teams_by_league(data).items():
+        leaders = sorted((team for team in teams if team['divisionRank'] == 1), key=_tiebreak_key)
+        contenders = sorted((team for team in teams if team['divisionRank'] != 1), key=_tiebreak_key)
+        if contenders:
+            # Games back is measured against the last wild-card spot, so teams holding a spot show "+".
+            cut_line = contenders[min(spots, len(contenders)) - 1]
+            for position, team in enumerate(contenders, start=1):
+                team['wildCardRank'] = position
+                team['gb'] = _format_games_back(_games_back(cut_line, team))
+                team['inPosition'] = position <= spots
+        view.append({'league': league_name, 'divisionLeaders': leaders, 'teams': contenders})
+    return view
+
+STANDINGS_VIEWS = {
+    'division': process_standings,
+    'league': build_league_view,
+    'wildcard': build_wildcard_view,
+}
+
+class MaterializedView:
+    __slots__ = ('source', 'payload', 'body')
+
+    def __init__(self, source, payload):
+        self.source = source
+        self.payload = payload
+        self.body = EncodedBody(payload)
+
+class MaterializedViews:
+    def __init__(self, max_views):
+        self.max_views = max_views
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, source, build):
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                if view.source is source:
+                    return view
+        # A refreshed cache entry is a new object; only rebuild when its content really changed.
+        if view is not None and view.source == source:
+            view.source = source
+            return view
+        view = MaterializedView(source, build(source))
+        with self._lock:
+            self._views[key] = view
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        return view
+
+    def standings(self, view_name, season=None):
+        season = season or datetime.now().year
+        try:
+            data = fetch_standings_data(season)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching standings from MLB API: {e}")
+            return {"error": "Failed to fetch league standings from the provider."}
+        return self.get(('standings', view_name, season), data, STANDINGS_VIEWS[view_name])
+
+    def leaders(self, season=None, limit=5):
+        season = season or datetime.now().year
+        try:
+            sources = tuple(fetch_leaders_data(season, limit))
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching league leaders from MLB API: {e}")
+            return {"error": "Failed to fetch league leaders from the provider."}
+        return self.get(('leaders', season, limit), sources, lambda data: process_leaders(*data))
+
+materialized_views = MaterializedViews(Config.MATERIALIZED_MAX_VIEWS)
@@ -0,0 +1,309 @@
+import atexit
+import bisect
+import fcntl
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+from config import Config
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+METRICS = {
+    'mlb_http_request_duration_seconds': ('histogram', 'API request latency by route.', LATENCY_BUCKETS),
+    'mlb_http_response_size_bytes': ('histogram', 'API response body size by route.', SIZE_BUCKETS),
+    'mlb_upstream_requests_total': ('counter', 'Upstream HTTP calls by host and status.', None),
+    'mlb_upstream_request_duration_seconds': ('histogram', 'Upstream HTTP call latency by host.', LATENCY_BUCKETS),
+    'mlb_upstream_retries_total': ('counter', 'Upstream HTTP retries by host.', None),
+    'mlb_upstream_response_bytes_total': ('counter', 'Upstream response bytes by host.', None),
+    'mlb_cache_lookups_total': ('counter', 'Response cache lookups by tier and result.', None),
+    'mlb_stale_fallbacks_total': ('counter', 'Last-known-good payloads served while a provider circuit was open.', None),
+    'mlb_json_encode_seconds': ('histogram', 'Time spent serializing response payloads.', LATENCY_BUCKETS),
+}
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self._series = {name: {} for name in definitions}
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels=(), value=1):
+        labels = tuple(labels)
+        with self._lock:
+            series = self._series[name]
+            series[labels] = series.get(labels, 0) + value
+
+    def observe(self, name, value, labels=()):
+        labels = tuple(labels)
+        with self._lock:
+            series = self._series[name]
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = _Histogram(self.definitions[name][2])
+            histogram.observe(value)
+
+    def export(self, all_series=None):
+        # Plain lists, so one worker's series can be written to disk and merged by another.
+        with self._lock:
+            return {name: [[list(labels), value if self.definitions[name][0] == 'counter'
+                            else [list(value.counts), value.sum, value.count]]
+                           for labels, value in series.items()]
+                    for name, series in (all_series or self._series).items()}
+
+    def combine(self, exported):
+        return self.export(self._merge(exported))
+
+    def _merge(self, exported):
+        merged = {name: {} for name in self.definitions}
+        for data in exported:
+            for name, entries in data.items():
+                if name not in merged:
+                    continue
+                kind, _, buckets = self.definitions[name]
+                series = merged[name]
+                for labels, value in entries:
+                    labels = tuple(tuple(pair) for pair in labels)
+                    if kind == 'counter':
+                        series[labels] = series.get(labels, 0) + value
+                        continue
+                    histogram = series.get(labels)
+                    if histogram is None:
+                        histogram = series[labels] = _Histogram(buckets)
+                    counts, total, count = value
+                    histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                    histogram.sum += total
+                    histogram.count += count
+        return merged
+
+    def render(self, gauges=(), exported=None):
+        # With exported snapshots (one per worker) the output covers all of them instead of this process.
+        lines = []
+        with self._lock:
+            all_series = self._series if exported is None else self._merge(exported)
+            for name, (kind, help_text, _) in self.definitions.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in all_series[name].items():
+                    if kind == 'counter':
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(value.buckets, value.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {value.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {value.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+        for name, help_text, samples in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry(METRICS)
+
+# Under a multi-worker server each worker flushes its registry to
+# METRICS_MULTIPROC_DIR, and /metrics merges every worker's file, so a scrape
+# sees the whole server rather than whichever worker answered. Files of exited
+# workers are folded into one retired file, so counters never go backwards and
+# the directory holds one file per live worker; it is emptied when the server starts.
+
+RETIRED_FILE = 'retired.json'
+LOCK_FILE = 'metrics.lock'
+
+def _metrics_path(file_name):
+    return os.path.join(Config.METRICS_MULTIPROC_DIR, file_name)
+
+def _metrics_file(pid=None):
+    return _metrics_path(f"{pid or os.getpid()}.json")
+
+def _read_metrics(file_name):
+    try:
+        with open(_metrics_path(file_name)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading worker metrics '{file_name}': {e}")
+        return None
+
+def _write_metrics(path, exported):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(exported, f)
+    os.replace(tmp_path, path)
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _worker_files():
+    return [file_name for file_name in os.listdir(Config.METRICS_MULTIPROC_DIR)
+            if file_name.endswith('.json') and file_name[:-len('.json')].isdigit()]
+
+def _metrics_lock(mode):
+    lock_file = open(_metrics_path(LOCK_FILE), 'a')
+    fcntl.flock(lock_file, mode)
+    return lock_file
+
+def fold_retired_metrics(own_pid=None):
+    # own_pid: a file left under this process's pid by an earlier process that had the same pid.
+    with _metrics_lock(fcntl.LOCK_EX):
+        retired = [file_name for file_name in _worker_files()
+                   if int(file_name[:-len('.json')]) == own_pid or not _is_running(int(file_name[:-len('.json')]))]
+        if not retired:
+            return
+        exported = [data for data in map(_read_metrics, [RETIRED_FILE] + retired) if data is not None]
+        _write_metrics(_metrics_path(RETIRED_FILE), metrics.combine(exported))
+        for file_name in retired:
+            os.remove(_metrics_path(file_name))
+
+def flush_metrics():
+    _write_metrics(_metrics_file(), metrics.export())
+
+def _flush_quietly():
+    try:
+        flush_metrics()
+        fold_retired_metrics()
+    except OSError as e:
+        print(f"Error flushing metrics to '{Config.METRICS_MULTIPROC_DIR}': {e}")
+
+def start_metrics_flusher():
+    if not Config.METRICS_MULTIPROC_DIR:
+        return
+    os.makedirs(Config.METRICS_MULTIPROC_DIR, exist_ok=True)
+    fold_retired_metrics(own_pid=os.getpid())
+
+    def run():
+        while True:
+            time.sleep(Config.METRICS_FLUSH_SECONDS)
+            _flush_quietly()
+
+    threading.Thread(target=run, name='metrics-flush', daemon=True).start()
+    atexit.register(_flush_quietly)
+
+def reset_metrics_dir():
+    directory = Config.METRICS_MULTIPROC_DIR
+    os.makedirs(directory, exist_ok=True)
+    for file_name in os.listdir(directory):
+        if file_name.endswith(('.json', '.tmp')):
+            os.remove(os.path.join(directory, file_name))
+
+def render_metrics(gauges=()):
+    if not Config.METRICS_MULTIPROC_DIR:
+        return metrics.render(gauges)
+    own_file = os.path.basename(_metrics_file())
+    exported = [metrics.export()]
+    try:
+        # Shared with other scrapes, exclusive with a fold, so no worker is counted twice or missed.
+        with _metrics_lock(fcntl.LOCK_SH):
+            file_names = [RETIRED_FILE] + [name for name in _worker_files() if name != own_file]
+            exported.extend(data for data in map(_read_metrics, file_names) if data is not None)
+    except OSError as e:
+        print(f"Error reading worker metrics from '{Config.METRICS_MULTIPROC_DIR}': {e}")
+    return metrics.render(gauges, exported)
+
+class UpstreamCall:
+    __slots__ = ('host', 'path', 'status', 'seconds', 'retries', 'size')
+
+    def __init__(self, host, path, status, seconds, retries, size):
+        self.host = host
+        self.path = path
+        self.status = status
+        self.seconds = seconds
+        self.retries = retries
+        self.size = size
+
+class RequestTrace:
+    __slots__ = ('started', 'upstream', 'stale')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.upstream = []
+        self.stale = False
+
+# Fan-out workers and asyncio.to_thread copy the context, so their upstream calls land on the same trace.
+_current_trace = ContextVar('request_trace', default=None)
+
+def begin_trace():
+    trace = RequestTrace()
+    return trace, _current_trace.set(trace)
+
+def end_trace(token):
+    _current_trace.reset(token)
+
+def record_upstream(url, status, seconds, retries=0, size=0):
+    parts = urlsplit(url)
+    host = parts.hostname or ''
+    metrics.inc('mlb_upstream_requests_total', (('host', host), ('status', status)))
+    metrics.observe('mlb_upstream_request_duration_seconds', seconds, (('host', host),))
+    if retries:
+        metrics.inc('mlb_upstream_retries_total', (('host', host),), retries)
+    if size:
+        metrics.inc('mlb_upstream_response_bytes_total', (('host', host),), size)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.upstream.append(UpstreamCall(host, parts.path, status, seconds, retries, size))
+
+def record_cache_lookup(tier, result):
+    metrics.inc('mlb_cache_lookups_total', (('tier', tier), ('result', result)))
+
+def record_stale_fallback(url):
+    metrics.inc('mlb_stale_fallbacks_total', (('host', urlsplit(url).hostname or ''),))
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.stale = True
+
+def served_stale():
+    trace = _current_trace.get()
+    return trace is not None and trace.stale
+
+def record_encode(seconds):
+    metrics.observe('mlb_json_encode_seconds', seconds)
+
+def finish_request(trace, method, path, route, status, size):
+    seconds = time.perf_counter() - trace.started
+    labels = (('route', route), ('method', method), ('status', status))
+    metrics.observe('mlb_http_request_duration_seconds', seconds, labels)
+    if size is not None:
+        metrics.observe('mlb_http_response_size_bytes', size, (('route', route),))
+    if Config.SLOW_REQUEST_MS and seconds * 1000 >= Config.SLOW_REQUEST_MS:
+        breakdown = ', '.join(
+            f"{call.host}{call.path} {call.status} {call.seconds * 1000:.0f}ms"
+            + (f" ({call.retries} retries)" if call.retries else '')
+            for call in trace.upstream) or 'no upstream calls'
+        print(f"Slow request: {method} {path} -> {status} in {seconds * 1000:.0f}ms; upstream: {breakdown}")
@@ -0,0 +1,129 @@
+import heapq
+import re
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from .cache import fetch_json
+from .keywords import (MLB_TEAM_KEYWORDS, MLB_SUPERSTAR_KEYWORDS, MLB_JARGON_KEYWORDS,
+                       MLB_GENERAL_KEYWORDS, COMPETITOR_LEAGUE_KEYWORDS)
+
+NEWS_API_URL = f"{Config.NEWSAPI_BASE}/everything"
+NEWS_SOURCES = "espn,fox-sports,cbs-sports,bleacher-report,nbc-sports"
+# Fetches are spaced so one day's NewsAPI quota lasts the whole day.
+NEWS_REFRESH_SECONDS = max(Config.NEWS_REFRESH_SECONDS, 24 * 3600 / max(Config.QUOTA_NEWSAPI_DAILY_UNITS, 1))
+
+CATEGORY_KEYWORDS = [
+    ('team', MLB_TEAM_KEYWORDS, 4),
+    ('league', ['mlb', 'major league baseball'], 3),
+    ('star', MLB_SUPERSTAR_KEYWORDS, 3),
+    ('jargon', MLB_JARGON_KEYWORDS, 2),
+    ('general', MLB_GENERAL_KEYWORDS, 1),
+    ('competitor', COMPETITOR_LEAGUE_KEYWORDS, -3),
+]
+CATEGORY_SCORES = {name: score for name, _, score in CATEGORY_KEYWORDS}
+
+def _build_matcher():
+    groups = []
+    for name, keywords, _ in CATEGORY_KEYWORDS:
+        alternation = '|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+        groups.append(f"(?P<{name}>{alternation})")
+    # Keywords are singular, so an optional plural suffix keeps "pitchers" or "home runs" matching.
+    return re.compile(r"(?<![a-z0-9])(?:" + '|'.join(groups) + r")(?:e?s)?(?![a-z0-9])")
+
+KEYWORD_MATCHER = _build_matcher()
+
+def score_article(title, description):
+    title = (title or '').lower()
+    text = title + " " + (description or '').lower()
+    categories = set()
+    for match in KEYWORD_MATCHER.finditer(text):
+        category = match.lastgroup
+        # Competitor leagues only count against an article when they appear in its title.
+        if category == 'competitor' and match.start() >= len(title):
+            continue
+        categories.add(category)
+    return sum(CATEGORY_SCORES[category] for category in categories)
+
+class NewsFeed:
+    def __init__(self):
+        self._seen = OrderedDict()
+        self._articles = {}
+        self._ranked = []
+        self.fetched_at = None
+        self._lock = threading.Lock()
+
+    def is_due(self):
+        return self.fetched_at is None or time.monotonic() - self.fetched_at >= NEWS_REFRESH_SECONDS
+
+    def ensure_fresh(self):
+        if not self.is_due():
+            return
+        # One caller refreshes; the rest keep paging through the current ranking.
+        if not self._lock.acquire(blocking=self.fetched_at is None):
+            return
+        try:
+            if self.is_due():
+                self.refresh()
+        finally:
+            self._lock.release()
+
+    def refresh(self):
+        params = {
+            'q': '"MLB" OR "baseball"', 'apiKey': Config.NEWSAPI_KEY,
+            'sources': NEWS_SOURCES, 'sortBy': 'publishedAt',
+            'pageSize': 100, 'language': 'en'
+        }
+        # Cached for the refresh interval, so the other workers reuse this fetch instead of spending quota.
+        articles = fetch_json(NEWS_API_URL, params=params, ttl=NEWS_REFRESH_SECONDS).get('articles', [])
+        self.ingest(articles)
+        self.fetched_at = time.monotonic()
+
+    def ingest(self, articles):
+        added = 0
+        for article in articles:
+            url = article.get('url')
+            if not url:
+                continue
+            if url in self._seen:
+                # Still in the provider's window, so keep remembering it.
+                self._seen.move_to_end(url)
+                continue
+            self._seen[url] = None
+            if not article.get('content') or article.get('title') == '[Removed]':
+                continue
+            score = score_article(article.get('title'), article.get('description'))
+            if score >= 1:
+                self._articles[url] = (score, {
+                    'id': url, 'title': article.get('title'),
+                    'url': url, 'date': article.get('publishedAt'),
+                    'summary': article.get('description'), 'thumbnail': article.get('urlToImage')
+                })
+                added += 1
+        while len(self._seen) > Config.NEWS_SEEN_URLS:
+            self._seen.popitem(last=False)
+        if added:
+            self._rebuild()
+        return added
+
+    def _rebuild(self):
+        if len(self._articles) > Config.NEWS_MAX_STORED_ARTICLES:
+            newest = heapq.nlargest(Config.NEWS_MAX_STORED_ARTICLES, self._articles.items(),
+                                    key=lambda item: item[1][1]['date'] or '')
+            self._articles = dict(newest)
+        top = heapq.nlargest(Config.NEWS_TOP_ARTICLES, self._articles.values(),
+                             key=lambda item: (item[0], item[1]['date'] or ''))
+        ranked = [article for _, article in top]
+        ranked.sort(key=lambda article: article['date'] or '', reverse=True)
+        self._ranked = ranked
+
+    def page(self, page, per_page):
+        ranked = self._ranked
+        start_index = (page - 1) * per_page
+        end_index = start_index + per_page
+        return {
+            "articles": ranked[start_index:end_index], "page": page,
+            "totalResults": len(ranked), "hasMore": end_index < len(ranked)
+        }
+
+news_feed = NewsFeed()
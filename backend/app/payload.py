@@ -0,0 +1,105 @@
+PLAYER_IDENTITY_FIELDS = ["id", "name", "jerseyNumber", "position"]
+STAT_GROUPS = ("batting", "pitching")
+
+def parse_fields(fields):
+    tree = {}
+    for path in (fields or '').split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+def _select(value, tree):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _select(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
+def _select_player(player, tree):
+    groups = [group for group in STAT_GROUPS if group in tree] or list(STAT_GROUPS)
+    selected = {"id": player.get("id")}
+    attributes = [key for key in tree if key not in STAT_GROUPS]
+    for key in attributes or PLAYER_IDENTITY_FIELDS:
+        if key in player:
+            selected[key] = player[key]
+    stats = player.get("stats", {})
+    selected["stats"] = {group: _select(stats.get(group, {}), tree.get(group)) for group in groups}
+    return selected
+
+def select_game_fields(details, tree):
+    selected = {}
+    for key, subtree in tree.items():
+        if key not in details:
+            continue
+        if key == "players" and subtree:
+            # players.<group> picks stat groups; any other sub-field picks player attributes.
+            selected[key] = {
+                team: [_select_player(player, subtree) for player in players]
+                for team, players in details[key].items()
+            }
+        else:
+            selected[key] = _select(details[key], subtree)
+    return selected
+
+def _to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0
+
+def has_played(player):
+    stats = player.get("stats", {})
+    batting = stats.get("batting") or {}
+    pitching = stats.get("pitching") or {}
+    return (_to_number(batting.get("plateAppearances")) > 0 or _to_number(batting.get("atBats")) > 0 or
+            _to_number(pitching.get("battersFaced")) > 0 or _to_number(pitching.get("inningsPitched")) > 0)
+
+def drop_inactive_players(details):
+    if "players" not in details:
+        return details
+    trimmed = dict(details)
+    trimmed["players"] = {team: [p for p in players if has_played(p)]
+                          for team, players in details["players"].items()}
+    return trimmed
+
+def compact_players(players):
+    all_players = [player for team_players in players.values() for player in team_players]
+    identity = [key for key in PLAYER_IDENTITY_FIELDS if any(key in p for p in all_players)]
+    groups = [group for group in STAT_GROUPS if any(group in p.get("stats", {}) for p in all_players)]
+    columns = {}
+    for group in groups:
+        names = {}
+        for player in all_players:
+            for stat in player.get("stats", {}).get(group) or {}:
+                names.setdefault(stat, None)
+        columns[group] = list(names)
+
+    compact = {"fields": identity + groups}
+    compact.update(columns)
+    for team, team_players in players.items():
+        rows = []
+        for player in team_players:
+            row = [player.get(key) for key in identity]
+            for group in groups:
+                group_stats = player.get("stats", {}).get(group)
+                row.append([group_stats.get(stat) for stat in columns[group]] if group_stats else None)
+            rows.append(row)
+        compact[team] = rows
+    return compact
+
+def shape_game_details(details, fields=None, active_only=False, compact=False):
+    if active_only:
+        details = drop_inactive_players(details)
+    tree = parse_fields(fields)
+    if tree:
+        details = select_game_fields(details, tree)
+    if compact and "players" in details:
+        details = dict(details)
+        details["players"] = compact_players(details["players"])
+    return details
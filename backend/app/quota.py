@@ -0,0 +1,146 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+import requests
+from config import Config
+from .shared_cache import create_backend, MemoryCacheBackend
+
+class QuotaExceededError(requests.exceptions.RequestException):
+    pass
+
+class ProviderPolicy:
+    def __init__(self, name, host, key_param, daily_units, per_minute, path_costs=None):
+        self.name = name
+        self.host = host
+        self.key_param = key_param
+        self.daily_units = daily_units
+        self.per_minute = per_minute
+        self.path_costs = path_costs or {}
+
+    def cost(self, path):
+        return self.path_costs.get(path, 1)
+
+PROVIDER_POLICIES = [
+    ProviderPolicy('youtube', urlsplit(Config.YOUTUBE_API_BASE).netloc, 'key', Config.QUOTA_YOUTUBE_DAILY_UNITS,
+                   Config.QUOTA_YOUTUBE_PER_MINUTE,
+                   path_costs={urlsplit(Config.YOUTUBE_API_BASE).path + '/search': 100}),
+    ProviderPolicy('newsapi', urlsplit(Config.NEWSAPI_BASE).netloc, 'apiKey', Config.QUOTA_NEWSAPI_DAILY_UNITS,
+                   Config.QUOTA_NEWSAPI_PER_MINUTE),
+    ProviderPolicy('openweather', urlsplit(Config.OPENWEATHER_API_BASE).netloc, 'appid',
+                   Config.QUOTA_OPENWEATHER_DAILY_UNITS, Config.QUOTA_OPENWEATHER_PER_MINUTE),
+]
+
+# Daily counters outlive their quota day so a reader near midnight still finds them.
+COUNTER_TTL_SECONDS = 2 * 24 * 3600
+
+def _quota_day():
+    offset = timedelta(hours=Config.QUOTA_RESET_UTC_OFFSET_HOURS)
+    return (datetime.now(timezone.utc) + offset).date().isoformat()
+
+class KeyQuota:
+    # Usage lives in shared counters, so every worker draws from the same daily
+    # budget and the same per-minute window.
+    def __init__(self, policy, key_id, counters):
+        self.policy = policy
+        self.key_id = key_id
+        self.counters = counters
+        self.day = _quota_day()
+
+    def _key(self, name):
+        self.day = _quota_day()
+        return f"quota:{self.policy.name}:{self.key_id}:{self.day}:{name}"
+
+    def count(self, name):
+        return self.counters.counter(self._key(name)) or 0
+
+    def used_units(self):
+        return self.count('used')
+
+    def remaining(self):
+        return max(self.policy.daily_units - self.used_units(), 0)
+
+    def try_consume(self, cost):
+        minute = int(time.time() // 60)
+        in_minute = self.counters.incr(self._key(f"minute:{minute}"), 1, 120)
+        allowed = in_minute is None or in_minute <= max(self.policy.per_minute, 1)
+        if allowed:
+            used = self.counters.incr(self._key('used'), cost, COUNTER_TTL_SECONDS)
+            if used is not None and used > self.policy.daily_units:
+                self.counters.incr(self._key('used'), -cost, COUNTER_TTL_SECONDS)
+                allowed = False
+        self.counters.incr(self._key('calls' if allowed else 'denied'), 1, COUNTER_TTL_SECONDS)
+        return allowed
+
+class QuotaLimiter:
+    def __init__(self, policies, counters, last_good_size=256):
+        self._policies = {policy.host: policy for policy in policies}
+        self._counters = counters
+        self._keys = {}
+        self._last_good = OrderedDict()
+        self._last_good_size = last_good_size
+        self._lock = threading.Lock()
+
+    def _lookup(self, url, params):
+        parts = urlsplit(url)
+        policy = self._policies.get(parts.netloc)
+        if policy is None:
+            return None, None, 0
+        api_key = (params or {}).get(policy.key_param) or ''
+        if not api_key:
+            for pair in parts.query.split('&'):
+                name, _, value = pair.partition('=')
+                if name == policy.key_param:
+                    api_key = value
+        # Keys are tracked by a short digest so the secret itself never shows up in metrics.
+        key_id = hashlib.sha1(api_key.encode()).hexdigest()[:8]
+        with self._lock:
+            quota = self._keys.get((policy.name, key_id))
+            if quota is None:
+                quota = self._keys[(policy.name, key_id)] = KeyQuota(policy, key_id, self._counters)
+        return policy, quota, policy.cost(parts.path)
+
+    def acquire(self, url, params=None):
+        policy, quota, cost = self._lookup(url, params)
+        if quota is None:
+            return
+        if not quota.try_consume(cost):
+            raise QuotaExceededError(f"Quota for provider '{policy.name}' is exhausted or rate limited.")
+
+    def is_tracked(self, url):
+        return urlsplit(url).netloc in self._policies
+
+    def is_low(self, url, params=None):
+        policy, quota, cost = self._lookup(url, params)
+        if quota is None:
+            return False
+        return quota.remaining() - cost < policy.daily_units * Config.QUOTA_LOW_WATER_FRACTION
+
+    def remember(self, key, value):
+        with self._lock:
+            self._last_good[key] = value
+            self._last_good.move_to_end(key)
+            while len(self._last_good) > self._last_good_size:
+                self._last_good.popitem(last=False)
+
+    def last_good(self, key):
+        with self._lock:
+            return self._last_good.get(key)
+
+    def snapshot(self):
+        with self._lock:
+            quotas = list(self._keys.values())
+        snapshot = []
+        for quota in quotas:
+            used_units = quota.used_units()
+            snapshot.append({
+                "provider": quota.policy.name, "key": quota.key_id, "day": quota.day,
+                "daily_units": quota.policy.daily_units, "used_units": used_units,
+                "remaining_units": max(quota.policy.daily_units - used_units, 0),
+                "calls": quota.count('calls'), "denied": quota.count('denied')
+            })
+        return snapshot
+
+quota_limiter = QuotaLimiter(PROVIDER_POLICIES, create_backend(Config.SHARED_CACHE_URL) or MemoryCacheBackend())
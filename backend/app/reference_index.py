@@ -0,0 +1,263 @@
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from config import Config
+from .cache import fetch_json, forced_refresh
+from .fanout import gather
+from .keywords import MLB_SUPERSTAR_PLAYER_IDS
+
+MLB_API_BASE = Config.MLB_API_BASE
+HEADSHOT_URL = ("https://img.mlbstatic.com/mlb-photos/image/upload/d_people:generic:headshot:67:current.png"
+                "/w_426,q_auto:best/v1/people/{}/headshot/67/current")
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# Suggestions for one- and two-character prefixes are ranked once per snapshot,
+# since those prefixes match too many keys to rank on every keystroke.
+SHORT_PREFIX_LENGTH = 2
+SUGGEST_TABLE_SIZE = 20
+
+def normalize(text):
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(' ', stripped.lower()).strip()
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _Snapshot:
+    def __init__(self, entries):
+        self.entries = entries
+        self.keys = []
+        self.aliases = []
+        self.grams = {}
+        self.rank = []
+        for idx, entry in enumerate(entries):
+            self.rank.append((-entry['popular'], -entry['active'], entry['result']['name'] or ''))
+            for alias in entry['aliases']:
+                tokens = alias.split(' ')
+                for i in range(len(tokens)):
+                    self.keys.append((' '.join(tokens[i:]), idx, i))
+                alias_id = len(self.aliases)
+                alias_grams = trigrams(alias)
+                self.aliases.append((idx, alias, len(alias_grams)))
+                for gram in alias_grams:
+                    self.grams.setdefault(gram, set()).add(alias_id)
+        self.keys.sort()
+        self.short_prefixes = {}
+        for key, _, _ in self.keys:
+            for length in range(1, min(len(key), SHORT_PREFIX_LENGTH) + 1):
+                if key[:length] not in self.short_prefixes:
+                    self.short_prefixes[key[:length]] = self._rank_prefix(key[:length], SUGGEST_TABLE_SIZE)
+
+    def prefix(self, query):
+        matches = []
+        seen = set()
+        pos = bisect_left(self.keys, (query,))
+        while pos < len(self.keys) and self.keys[pos][0].startswith(query):
+            idx = self.keys[pos][1]
+            if idx not in seen:
+                seen.add(idx)
+                matches.append(idx)
+            pos += 1
+        return matches
+
+    def _rank_prefix(self, query, limit):
+        # Tier 3: an alias equals the query, 2: an alias starts with it, 1: a later word does.
+        tiers = {}
+        pos = bisect_left(self.keys, (query,))
+        while pos < len(self.keys) and self.keys[pos][0].startswith(query):
+            key, idx, offset = self.keys[pos]
+            tier = 1 if offset else (3 if key == query else 2)
+            if tier > tiers.get(idx, 0):
+                tiers[idx] = tier
+            pos += 1
+        return heapq.nsmallest(limit, tiers, key=lambda idx: (-tiers[idx],) + self.rank[idx])
+
+    def suggest(self, query, limit):
+        if len(query) <= SHORT_PREFIX_LENGTH and limit <= SUGGEST_TABLE_SIZE:
+            return self.short_prefixes.get(query, [])[:limit]
+        return self._rank_prefix(query, limit)
+
+    def substring(self, query):
+        # Padding grams mark word edges of the query, which a substring match need not share.
+        candidates = None
+        for gram in trigrams(query):
+            if not gram.startswith(' ') and not gram.endswith(' '):
+                postings = self.grams.get(gram, set())
+                candidates = postings if candidates is None else candidates & postings
+        if candidates is None:
+            candidates = range(len(self.aliases))
+        matches = []
+        seen = set()
+        for alias_id in sorted(candidates):
+            idx, alias, _ = self.aliases[alias_id]
+            if query in alias and idx not in seen:
+                seen.add(idx)
+                matches.append(idx)
+        return matches
+
+    def fuzzy(self, query, threshold):
+        query_grams = trigrams(query)
+        shared = {}
+        for gram in query_grams:
+            for alias_id in self.grams.get(gram, ()):
+                shared[alias_id] = shared.get(alias_id, 0) + 1
+        best = {}
+        for alias_id, count in shared.items():
+            idx, _, gram_count = self.aliases[alias_id]
+            similarity = count / (len(query_grams) + gram_count - count)
+            if similarity >= threshold and similarity > best.get(idx, 0):
+                best[idx] = similarity
+        return sorted(best, key=lambda idx: -best[idx])
+
+class ReferenceIndex:
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self.loaded_at = None
+
+    @property
+    def ready(self):
+        return self._snapshot is not None
+
+    def load(self):
+        # Cached (and so snapshotted) for the refresh interval, which lets a new worker
+        # build its index from the cache snapshot instead of ~30 upstream calls.
+        ttl = Config.REFERENCE_INDEX_REFRESH_SECONDS
+        teams = fetch_json(f"{MLB_API_BASE}/teams?sportId=1", ttl=ttl).get('teams', [])
+        rosters = gather(*[
+            (lambda team_id: lambda: fetch_json(
+                f"{MLB_API_BASE}/teams/{team_id}/roster?rosterType=40Man&hydrate=person", ttl=ttl))(team['id'])
+            for team in teams
+        ], return_exceptions=True)
+
+        entries = [self._team_entry(team) for team in teams]
+        seen_players = set()
+        for team, roster in zip(teams, rosters):
+            if isinstance(roster, Exception):
+                print(f"Could not load roster for team {team.get('id')}: {roster}")
+                continue
+            for player_entry in roster.get('roster', []):
+                person = player_entry.get('person', {})
+                if person.get('id') and person['id'] not in seen_players:
+                    seen_players.add(person['id'])
+                    entries.append(self._player_entry(person, player_entry, team))
+
+        snapshot = _Snapshot(entries)
+        with self._lock:
+            self._snapshot = snapshot
+            self.loaded_at = time.time()
+        return len(entries)
+
+    def _team_entry(self, team):
+        names = [team.get('name'), team.get('teamName'), team.get('clubName'), team.get('shortName'),
+                 team.get('franchiseName'), team.get('locationName'), team.get('abbreviation')]
+        return {
+            'type': 'team',
+            'popular': False,
+            'active': True,
+            'aliases': sorted({normalize(n) for n in names if n}),
+            'suggestion': {
+                'id': f"team-{team['id']}", 'type': 'team',
+                'name': team.get('name'),
+                'logo': f"https://www.mlbstatic.com/team-logos/{team['id']}.svg"
+            },
+            'result': {
+                'id': f"team-{team['id']}", 'type': 'team',
+                'name': team.get('name'),
+                'logo': f"https://www.mlbstatic.com/team-logos/{team['id']}.svg",
+                'venue': team.get('venue', {}).get('name'),
+                'league': team.get('league', {}).get('name'),
+                'division': team.get('division', {}).get('name'),
+            }
+        }
+
+    def _player_entry(self, person, player_entry, team):
+        names = [person.get('fullName'), person.get('nameFirstLast'), person.get('boxscoreName'),
+                 person.get('nickName'), person.get('lastName')]
+        if person.get('useName') and person.get('lastName'):
+            names.append(f"{person['useName']} {person['lastName']}")
+        position = player_entry.get('position') or person.get('primaryPosition') or {}
+        suggestion = {
+            'id': f"player-{person['id']}", 'type': 'player',
+            'name': person.get('fullName', 'N/A'),
+            'team': team.get('name'),
+            'position': position.get('abbreviation'),
+            'photo': HEADSHOT_URL.format(person['id'])
+        }
+        return {
+            'type': 'player',
+            'suggestion': suggestion,
+            'popular': person['id'] in MLB_SUPERSTAR_PLAYER_IDS,
+            'active': player_entry.get('status', {}).get('code') == 'A',
+            'aliases': sorted({normalize(n) for n in names if n}),
+            'result': {
+                'id': f"player-{person['id']}", 'type': 'player',
+                'name': person.get('fullName', 'N/A'),
+                'photo': HEADSHOT_URL.format(person['id']),
+                'age': person.get('currentAge'),
+                'team': team.get('name'),
+                'position': position.get('abbreviation')
+            }
+        }
+
+    def search(self, query, entry_type=None, limit=25, fuzzy=False):
+        snapshot = self._snapshot
+        normalized = normalize(query)
+        if snapshot is None or not normalized:
+            return []
+        ordered = snapshot.prefix(normalized)
+        if len(normalized) >= 3:
+            seen = set(ordered)
+            ordered += [idx for idx in snapshot.substring(normalized) if idx not in seen]
+            if not ordered and fuzzy:
+                ordered = snapshot.fuzzy(normalized, Config.REFERENCE_INDEX_FUZZY_THRESHOLD)
+        results = []
+        for idx in ordered:
+            entry = snapshot.entries[idx]
+            if entry_type is None or entry['type'] == entry_type:
+                results.append(entry['result'])
+                if len(results) >= limit:
+                    break
+        return results
+
+    def suggest(self, query, limit=8):
+        snapshot = self._snapshot
+        normalized = normalize(query)
+        if snapshot is None or not normalized:
+            return []
+        return [snapshot.entries[idx]['suggestion'] for idx in snapshot.suggest(normalized, limit)]
+
+    def start_background_refresh(self, interval=None):
+        if self._thread is not None:
+            return
+        interval = interval or Config.REFERENCE_INDEX_REFRESH_SECONDS
+        self._thread = threading.Thread(target=self._refresh_loop, args=(interval,),
+                                        name='reference-index', daemon=True)
+        self._thread.start()
+
+    def _refresh_loop(self, interval):
+        refresh = False
+        while True:
+            try:
+                if refresh:
+                    with forced_refresh():
+                        count = self.load()
+                else:
+                    count = self.load()
+                refresh = True
+                print(f"Reference index loaded with {count} entries.")
+                time.sleep(interval)
+            except Exception as e:
+                print(f"Error loading reference index: {e}")
+                time.sleep(min(interval, 60))
+
+reference_index = ReferenceIndex()
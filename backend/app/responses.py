@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import Response, request
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+from config import Config
+from .codec import dumps
+from .metrics import record_encode
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Set on responses built from a last-known-good payload while a provider's circuit is open.
+STALE_WARNING = '110 - "Response is Stale"'
+
+class EncodedBody:
+    __slots__ = ('raw', 'etag', 'encodings')
+
+    def __init__(self, payload, etag=None):
+        started = time.perf_counter()
+        self.raw = dumps(payload)
+        record_encode(time.perf_counter() - started)
+        self.etag = etag or hashlib.blake2b(self.raw, digest_size=16).hexdigest()
+        # Compression happens once here; every later request just picks the stored variant.
+        self.encodings = {}
+        if len(self.raw) >= Config.RESPONSE_COMPRESS_MIN_BYTES:
+            self.encodings['gzip'] = gzip.compress(self.raw, compresslevel=Config.RESPONSE_GZIP_LEVEL)
+            if brotli is not None:
+                self.encodings['br'] = brotli.compress(self.raw, quality=Config.RESPONSE_BROTLI_QUALITY)
+
+class EncodedBodyCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, payload, etag=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            source, body = entry
+            # Cached services hand back the same object; rebuilt ones are usually still equal.
+            if (source is payload or source == payload) and (etag is None or body.etag == etag):
+                if source is not payload:
+                    with self._lock:
+                        self._entries[key] = (payload, body)
+                return body
+        body = EncodedBody(payload, etag)
+        with self._lock:
+            self._entries[key] = (payload, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+encoded_bodies = EncodedBodyCache(Config.RESPONSE_CACHE_MAX_ENTRIES)
+
+def negotiate(body, if_none_match=None, accept_encoding=None):
+    encoding = None
+    if accept_encoding and body.encodings:
+        encoding = parse_accept_header(accept_encoding).best_match(list(body.encodings))
+    # Each encoding is a different byte sequence, so each gets its own strong ETag.
+    etag = f"{body.etag}-{encoding}" if encoding else body.etag
+    headers = {'ETag': quote_etag(etag), 'Vary': 'Accept-Encoding'}
+    if if_none_match and parse_etags(if_none_match).contains(etag):
+        return 304, b'', headers
+    headers['Content-Type'] = 'application/json'
+    if encoding:
+        headers['Content-Encoding'] = encoding
+        return 200, body.encodings[encoding], headers
+    return 200, body.raw, headers
+
+def encoded_response(body):
+    status, data, headers = negotiate(body, request.headers.get('If-None-Match'),
+                                      request.headers.get('Accept-Encoding'))
+    return Response(data, status=status, headers=headers)
+
+def json_response(payload, cache_key=None, etag=None):
+    if cache_key is None:
+        cache_key = request.full_path
+    return encoded_response(encoded_bodies.get(cache_key, payload, etag))
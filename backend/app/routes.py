@@ -1,18 +1,68 @@
-from flask import Blueprint, jsonify, request
-from .services import (get_schedule_and_scores, search_mlb_data, get_player_stats, 
-                       get_player_details, get_league_leaders, get_team_details,
-                       get_game_details, get_mlb_news, get_youtube_highlights, get_league_standings)
+import json
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
+from .services import (search_mlb_data, suggest_mlb_data, get_player_stats, 
+                       get_player_details, get_players_stats, get_players_details, get_team_details,
+                       get_game_details, get_mlb_news, get_youtube_highlights)
+from .game_logs import (GROUP_COLUMNS, RATE_STATS, get_game_log_leaders, get_player_rolling_stats,
+                        get_player_splits)
+from .lifecycle import lifecycle
+from .live import live_hub
+from .circuit import CIRCUIT_GAUGE_VALUES, circuit_breakers
+from .metrics import begin_trace, end_trace, finish_request, render_metrics
+from .materialized import materialized_views, STANDINGS_VIEWS
+from .payload import shape_game_details
+from .quota import quota_limiter
+from .responses import STALE_WARNING, encoded_response, json_response
+from .scoreboard import scoreboard
+from .leaderboards import STAT_GROUPS
+from .season_stats import LEAGUES, season_stats
 from datetime import datetime
+from config import Config
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
+metrics_bp = Blueprint('metrics', __name__)
+
+@api_bp.before_request
+def start_request_trace():
+    g.request_trace, g.request_trace_token = begin_trace()
+
+@api_bp.after_request
+def record_request_metrics(response):
+    trace = g.pop('request_trace', None)
+    if trace is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        size = None if response.is_streamed else response.calculate_content_length()
+        finish_request(trace, request.method, request.path, route, response.status_code, size)
+        if trace.stale:
+            response.headers['Warning'] = STALE_WARNING
+    return response
+
+@api_bp.teardown_request
+def end_request_trace(error=None):
+    token = g.pop('request_trace_token', None)
+    if token is not None:
+        end_trace(token)
 
 @api_bp.route('/schedule', methods=['GET'])
 @api_bp.route('/schedule/<date_str>', methods=['GET'])
 def schedule(date_str=None):
     if date_str is None:
         date_str = datetime.today().strftime('%Y-%m-%d')
-    data = get_schedule_and_scores(date_str)
-    return jsonify(data)
+    board = scoreboard.get(date_str)
+    etag, snapshot = board.current()
+    if etag is None:
+        return jsonify([])
+    if 'since' in request.args:
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = jsonify(board.delta(request.args.get('since')))
+        response.set_etag(etag)
+    else:
+        # The full board is served per encoding, each with its own ETag.
+        response = json_response(snapshot, etag=etag)
+    response.headers['X-Scoreboard-Version'] = etag
+    return response
 
 @api_bp.route('/search', methods=['GET'])
 def search():
@@ -22,7 +72,18 @@ def search():
     results = search_mlb_data(query)
     if 'error' in results:
         return jsonify(results), 500
-    return jsonify(results)
+    return json_response(results)
+
+@api_bp.route('/search/suggest', methods=['GET'])
+def search_suggest():
+    query = request.args.get('q')
+    if not query:
+        return jsonify({"error": "A search query 'q' is required."}), 400
+    try:
+        limit = min(int(request.args.get('limit', 8)), 20)
+    except ValueError:
+        limit = 8
+    return jsonify(suggest_mlb_data(query, limit=limit))
 
 @api_bp.route('/player/<int:player_id>/stats', methods=['GET'])
 def player_stats(player_id):
@@ -31,35 +92,191 @@ def player_stats(player_id):
         if "No statistical data" in stats['error']:
             return jsonify(stats), 404
         return jsonify(stats), 500
-    return jsonify(stats)
+    return json_response(stats)
 
 @api_bp.route('/player/<int:player_id>/details', methods=['GET'])
 def player_details(player_id):
     details = get_player_details(player_id)
     if 'error' in details:
         return jsonify(details), 404
-    return jsonify(details)
+    return json_response(details)
+
+def _parse_player_ids():
+    player_ids = []
+    for raw_id in request.args.get('ids', '').split(','):
+        raw_id = raw_id.strip()
+        if raw_id.isdigit() and int(raw_id) not in player_ids:
+            player_ids.append(int(raw_id))
+    return player_ids
+
+@api_bp.route('/players/stats', methods=['GET'])
+def players_stats():
+    player_ids = _parse_player_ids()
+    if not player_ids:
+        return jsonify({"error": "A comma-separated list of player 'ids' is required."}), 400
+    if len(player_ids) > Config.BULK_MAX_IDS:
+        return jsonify({"error": f"At most {Config.BULK_MAX_IDS} player ids can be requested at once."}), 400
+    stats = get_players_stats(player_ids)
+    if 'error' in stats:
+        return jsonify(stats), 500
+    return json_response(stats)
+
+@api_bp.route('/players/details', methods=['GET'])
+def players_details():
+    player_ids = _parse_player_ids()
+    if not player_ids:
+        return jsonify({"error": "A comma-separated list of player 'ids' is required."}), 400
+    if len(player_ids) > Config.BULK_MAX_IDS:
+        return jsonify({"error": f"At most {Config.BULK_MAX_IDS} player ids can be requested at once."}), 400
+    details = get_players_details(player_ids)
+    if 'error' in details:
+        return jsonify(details), 500
+    return json_response(details)
 
 @api_bp.route('/leaders', methods=['GET'])
 def league_leaders():
-    leaders = get_league_leaders()
-    if 'error' in leaders:
+    season = request.args.get('season', type=int)
+    limit = request.args.get('limit', 5, type=int)
+    if limit < 1 or limit > Config.LEADERS_MAX_LIMIT:
+        return jsonify({"error": f"'limit' must be between 1 and {Config.LEADERS_MAX_LIMIT}."}), 400
+    leaders = materialized_views.leaders(season=season, limit=limit)
+    if isinstance(leaders, dict):
         return jsonify(leaders), 500
-    return jsonify(leaders)
+    return encoded_response(leaders.body)
+
+@api_bp.route('/leaderboard', methods=['GET'])
+def leaderboard():
+    group = request.args.get('group', 'hitting')
+    if group not in STAT_GROUPS:
+        return jsonify({"error": f"'group' must be one of: {', '.join(STAT_GROUPS)}."}), 400
+    stat = request.args.get('stat')
+    if not stat:
+        return jsonify({"error": "A 'stat' to rank by is required."}), 400
+    limit = request.args.get('limit', 10, type=int)
+    if limit < 1 or limit > Config.LEADERS_MAX_LIMIT:
+        return jsonify({"error": f"'limit' must be between 1 and {Config.LEADERS_MAX_LIMIT}."}), 400
+    order = request.args.get('order')
+    if order not in (None, 'asc', 'desc'):
+        return jsonify({"error": "'order' must be 'asc' or 'desc'."}), 400
+    league = request.args.get('league')
+    league_id = LEAGUES.get(league.upper(), int(league) if league.isdigit() else None) if league else None
+    if league and league_id is None:
+        return jsonify({"error": f"'league' must be one of: {', '.join(LEAGUES)}."}), 400
+    qualified = request.args.get('qualified')
+    board = season_stats.leaderboard(
+        group, stat, limit=limit,
+        team_id=request.args.get('team', type=int),
+        league_id=league_id,
+        minimum=request.args.get('min', type=float),
+        qualified=None if qualified is None else qualified.lower() in ('1', 'true'),
+        order=order,
+        season=request.args.get('season', type=int))
+    if 'error' in board:
+        if board['error'].startswith('Unknown'):
+            return jsonify(board), 400
+        return jsonify(board), 500
+    return json_response(board)
+
+def _game_log_error(result):
+    if 'not been ingested' in result['error']:
+        return jsonify(result), 503
+    return jsonify(result), 404
+
+def _game_log_group():
+    group = request.args.get('group', 'hitting')
+    if group not in GROUP_COLUMNS:
+        return None, (jsonify({"error": f"'group' must be one of: {', '.join(GROUP_COLUMNS)}."}), 400)
+    return group, None
+
+@api_bp.route('/player/<int:player_id>/gamelog/rolling', methods=['GET'])
+def player_rolling_stats(player_id):
+    group, error = _game_log_group()
+    if error:
+        return error
+    windows = []
+    for raw_days in request.args.get('windows', Config.GAME_LOG_DEFAULT_WINDOWS).split(','):
+        raw_days = raw_days.strip()
+        if not raw_days.isdigit() or not 1 <= int(raw_days) <= Config.GAME_LOG_MAX_WINDOW_DAYS:
+            return jsonify({"error": f"'windows' must be day counts between 1 and {Config.GAME_LOG_MAX_WINDOW_DAYS}."}), 400
+        windows.append(int(raw_days))
+    stats = get_player_rolling_stats(player_id, group, windows, season=request.args.get('season', type=int))
+    if 'error' in stats:
+        return _game_log_error(stats)
+    return json_response(stats)
+
+@api_bp.route('/player/<int:player_id>/gamelog/splits', methods=['GET'])
+def player_game_log_splits(player_id):
+    group, error = _game_log_group()
+    if error:
+        return error
+    splits = get_player_splits(player_id, group, season=request.args.get('season', type=int))
+    if 'error' in splits:
+        return _game_log_error(splits)
+    return json_response(splits)
+
+@api_bp.route('/gamelog/leaders', methods=['GET'])
+def game_log_leaders():
+    group, error = _game_log_group()
+    if error:
+        return error
+    stat = request.args.get('stat', 'homeRuns' if group == 'hitting' else 'strikeOuts')
+    if stat not in GROUP_COLUMNS[group] and stat not in RATE_STATS[group]:
+        return jsonify({"error": f"Unknown {group} stat '{stat}'."}), 400
+    days = request.args.get('days', type=int)
+    if days is not None and not 1 <= days <= Config.GAME_LOG_MAX_WINDOW_DAYS:
+        return jsonify({"error": f"'days' must be between 1 and {Config.GAME_LOG_MAX_WINDOW_DAYS}."}), 400
+    limit = request.args.get('limit', 10, type=int)
+    if limit < 1 or limit > Config.LEADERS_MAX_LIMIT:
+        return jsonify({"error": f"'limit' must be between 1 and {Config.LEADERS_MAX_LIMIT}."}), 400
+    order = request.args.get('order')
+    if order not in (None, 'asc', 'desc'):
+        return jsonify({"error": "'order' must be 'asc' or 'desc'."}), 400
+    leaders = get_game_log_leaders(group, stat, days=days, limit=limit,
+                                   min_volume=request.args.get('min', type=float), order=order,
+                                   season=request.args.get('season', type=int))
+    if 'error' in leaders:
+        return _game_log_error(leaders)
+    return json_response(leaders)
 
 @api_bp.route('/team/<int:team_id>/details', methods=['GET'])
 def team_details(team_id):
     details = get_team_details(team_id)
     if 'error' in details:
         return jsonify(details), 404
-    return jsonify(details)
+    return json_response(details)
 
 @api_bp.route('/game/<int:game_id>/details', methods=['GET'])
 def game_details(game_id):
     details = get_game_details(game_id)
     if 'error' in details:
         return jsonify(details), 500
-    return jsonify(details)
+    details = shape_game_details(
+        details,
+        fields=request.args.get('fields'),
+        active_only=request.args.get('active', '').lower() in ('1', 'true'),
+        compact=request.args.get('format') == 'compact'
+    )
+    return json_response(details)
+
+@api_bp.route('/game/<int:game_id>/stream', methods=['GET'])
+def game_stream(game_id):
+    subscription = live_hub.subscribe(game_id)
+    if subscription is None:
+        return jsonify({"error": "Too many live streams open on this server."}), 503, {'Retry-After': '5'}
+
+    def events():
+        try:
+            yield "retry: 5000\n\n"
+            for event, data in subscription.events():
+                if event == 'heartbeat':
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @api_bp.route('/news', methods=['GET'])
 def get_news():
@@ -70,7 +287,7 @@ def get_news():
     news_data = get_mlb_news(page=page)
     if 'error' in news_data:
         return jsonify(news_data), 503
-    return jsonify(news_data)
+    return json_response(news_data)
 
 @api_bp.route('/highlights', methods=['GET'])
 def get_highlights():
@@ -78,11 +295,46 @@ def get_highlights():
     videos = get_youtube_highlights(query=query)
     if 'error' in videos:
         return jsonify(videos), 503
-    return jsonify(videos)
+    return json_response(videos)
 
 @api_bp.route('/standings', methods=['GET'])
 def league_standings():
-    standings_data = get_league_standings()
-    if 'error' in standings_data:
+    view = request.args.get('view', 'division')
+    if view not in STANDINGS_VIEWS:
+        return jsonify({"error": f"'view' must be one of: {', '.join(STANDINGS_VIEWS)}."}), 400
+    standings_data = materialized_views.standings(view, season=request.args.get('season', type=int))
+    if isinstance(standings_data, dict):
         return jsonify(standings_data), 500
-    return jsonify(standings_data)
\ No newline at end of file
+    return encoded_response(standings_data.body)
+
+@api_bp.route('/status/quota', methods=['GET'])
+def quota_status():
+    return jsonify(quota_limiter.snapshot())
+
+@api_bp.route('/status/ready', methods=['GET'])
+def readiness_status():
+    readiness = lifecycle.readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+@api_bp.route('/status/circuits', methods=['GET'])
+def circuit_status():
+    return jsonify(circuit_breakers.snapshot())
+
+def _quota_gauges():
+    quotas = quota_limiter.snapshot()
+
+    def samples(field):
+        return [((('provider', quota['provider']), ('key', quota['key'])), quota[field]) for quota in quotas]
+
+    return [
+        ('mlb_quota_remaining_units', 'Remaining daily quota units per provider key.', samples('remaining_units')),
+        ('mlb_quota_used_units', 'Daily quota units used per provider key.', samples('used_units')),
+        ('mlb_quota_denied_calls', 'Calls denied by the quota limiter today.', samples('denied')),
+        ('mlb_circuit_open', 'Whether the circuit for an upstream provider is open (1) or half-open (0.5).',
+         [((('provider', circuit['provider']),), CIRCUIT_GAUGE_VALUES[circuit['state']])
+          for circuit in circuit_breakers.snapshot()]),
+    ]
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(render_metrics(_quota_gauges()), mimetype='text/plain; version=0.0.4')
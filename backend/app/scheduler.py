@@ -0,0 +1,176 @@
+import fcntl
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import requests
+from config import Config
+from .cache import fetch_json, forced_refresh, save_cache_snapshot
+from .game_logs import game_log_store
+from .news import news_feed
+from .scoreboard import scoreboard
+from .season_stats import season_stats
+from .services import MLB_API_BASE, get_league_standings, get_league_leaders, get_team_details
+from .weather import venue_weather
+
+def _today():
+    return datetime.today().strftime('%Y-%m-%d')
+
+def _todays_games():
+    url = f"{MLB_API_BASE}/schedule?sportId=1&date={_today()}"
+    data = fetch_json(url, ttl=Config.CACHE_TTL_SCHEDULE)
+    return [game for date in data.get('dates', []) for game in date.get('games', [])]
+
+def _parse_game_time(value):
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+class PrefetchJob:
+    def __init__(self, name, interval, run, off_peak_scaling=True):
+        self.name = name
+        self.interval = interval
+        self.run = run
+        self.off_peak_scaling = off_peak_scaling
+        self.next_run = 0
+        self.last_run_at = None
+        self.last_error = None
+
+class LeaderLock:
+    # An exclusive flock on a shared file; the OS releases it if the holding worker dies.
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def try_acquire(self):
+        if self._file is not None:
+            return True
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+class PrefetchScheduler:
+    def __init__(self):
+        self.jobs = [
+            PrefetchJob('schedule', Config.PREFETCH_SCHEDULE_SECONDS, self._refresh_schedule),
+            PrefetchJob('standings', Config.PREFETCH_STANDINGS_SECONDS, self._refresh_standings),
+            PrefetchJob('leaders', Config.PREFETCH_LEADERS_SECONDS, self._refresh_leaders),
+            PrefetchJob('season_stats', Config.PREFETCH_SEASON_STATS_SECONDS, season_stats.refresh),
+            PrefetchJob('teams', Config.PREFETCH_TEAMS_SECONDS, self._refresh_teams_playing_today),
+            PrefetchJob('news', Config.NEWS_REFRESH_SECONDS, self._refresh_news),
+            PrefetchJob('venue_weather', Config.VENUE_WEATHER_REFRESH_SECONDS, venue_weather.refresh_if_due),
+            # Game logs only change once games end, so this job keeps its own cadence.
+            PrefetchJob('game_logs', Config.GAME_LOG_REFRESH_SECONDS, game_log_store.ingest_if_due,
+                        off_peak_scaling=False),
+        ]
+        if Config.CACHE_SNAPSHOT_ENABLED:
+            # Last, so the first snapshot already holds everything prefetched above.
+            self.jobs.append(PrefetchJob('cache_snapshot', Config.CACHE_SNAPSHOT_SECONDS, save_cache_snapshot,
+                                         off_peak_scaling=False))
+        self._thread = None
+        self._stop = threading.Event()
+        self._leader_lock = LeaderLock(Config.PREFETCH_LOCK_PATH)
+        self.is_leader = False
+
+    @property
+    def started(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None or not Config.PREFETCH_ENABLED:
+            return
+        self._thread = threading.Thread(target=self._loop, name='prefetch-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def in_game_window(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        lead = timedelta(minutes=Config.PREFETCH_WINDOW_LEAD_MINUTES)
+        length = timedelta(minutes=Config.PREFETCH_WINDOW_GAME_MINUTES)
+        for game in _todays_games():
+            start = _parse_game_time(game.get('gameDate'))
+            if start is not None and start - lead <= now <= start + length:
+                return True
+        return False
+
+    def _wait_for_leadership(self):
+        # With several workers only one prefetches; the rest read its results from the shared cache.
+        while not self._stop.is_set():
+            if self._leader_lock.try_acquire():
+                self.is_leader = True
+                return True
+            self._stop.wait(Config.PREFETCH_LEADER_RETRY_SECONDS)
+        return False
+
+    def _loop(self):
+        if not self._wait_for_leadership():
+            return
+        while not self._stop.is_set():
+            try:
+                peak = self.in_game_window()
+            except requests.exceptions.RequestException as e:
+                print(f"Could not determine game windows: {e}")
+                peak = False
+            factor = 1 if peak else Config.PREFETCH_OFF_PEAK_FACTOR
+            now = time.monotonic()
+            for job in self.jobs:
+                if now >= job.next_run:
+                    self._run_job(job)
+                    job.next_run = time.monotonic() + job.interval * (factor if job.off_peak_scaling else 1)
+            next_run = min(job.next_run for job in self.jobs)
+            # Wake at least every 30s so game windows opening are picked up promptly.
+            self._stop.wait(max(1, min(next_run - time.monotonic(), 30)))
+
+    def _run_job(self, job):
+        try:
+            with forced_refresh():
+                result = job.run()
+            job.last_error = result.get('error') if isinstance(result, dict) else None
+        except Exception as e:
+            job.last_error = str(e)
+        job.last_run_at = time.time()
+        if job.last_error:
+            print(f"Prefetch job '{job.name}' failed: {job.last_error}")
+
+    def _refresh_schedule(self):
+        scoreboard.get(_today(), force=True)
+
+    def _refresh_standings(self):
+        return get_league_standings()
+
+    def _refresh_leaders(self):
+        return get_league_leaders()
+
+    def _refresh_teams_playing_today(self):
+        team_ids = set()
+        for game in _todays_games():
+            for side in ('away', 'home'):
+                team_id = game.get('teams', {}).get(side, {}).get('team', {}).get('id')
+                if team_id:
+                    team_ids.add(team_id)
+        for team_id in sorted(team_ids):
+            details = get_team_details(team_id)
+            if 'error' in details:
+                print(f"Prefetch of team {team_id} failed: {details['error']}")
+
+    def _refresh_news(self):
+        # NewsFeed spaces its fetches to fit the NewsAPI daily quota, so this only fetches when due.
+        if Config.NEWSAPI_KEY:
+            news_feed.ensure_fresh()
+
+    def status(self):
+        return {job.name: {"last_run_at": job.last_run_at, "last_error": job.last_error}
+                for job in self.jobs}
+
+prefetch_scheduler = PrefetchScheduler()
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime
+import requests
+from config import Config
+from .cache import fetch_json, forced_refresh, response_cache, IMMUTABLE, MISS
+from .services import MLB_API_BASE, process_schedule
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode()).hexdigest()[:20]
+
+def _game_states(data):
+    return [game.get('status', {}).get('abstractGameState')
+            for date in data.get('dates', []) for game in date.get('games', [])]
+
+def _is_settled(date_str, states):
+    return date_str < datetime.today().strftime('%Y-%m-%d') and all(state == 'Final' for state in states)
+
+def _schedule_ttl(date_str):
+    # A past date whose games are all final never changes, so it is cached for good.
+    def ttl(data):
+        states = _game_states(data)
+        if _is_settled(date_str, states):
+            return IMMUTABLE
+        return Config.SCOREBOARD_LIVE_SECONDS if 'Live' in states else Config.SCOREBOARD_IDLE_SECONDS
+    return ttl
+
+class DateBoard:
+    # The version is a hash of the board's content, so every worker that sees the
+    # same games hands out the same version. Each version's per-game digests are
+    # kept in the shared cache, so a delta can be computed by any worker.
+    def __init__(self, date_str):
+        self.date_str = date_str
+        self.games = OrderedDict()
+        self.digests = {}
+        self.snapshot = []
+        self.etag = None
+        self.fetched_at = None
+        self.live = False
+        self.settled = False
+        self.lock = threading.Lock()
+        self._view_lock = threading.Lock()
+
+    def is_due(self, now):
+        if self.fetched_at is None:
+            return True
+        if self.settled:
+            return False
+        interval = Config.SCOREBOARD_LIVE_SECONDS if self.live else Config.SCOREBOARD_IDLE_SECONDS
+        return now - self.fetched_at >= interval
+
+    def _history_key(self, version):
+        return f"scoreboard:{self.date_str}:{version}"
+
+    def apply(self, data, now):
+        games = OrderedDict((game['id'], game) for game in process_schedule(data))
+        states = _game_states(data)
+        self.live = 'Live' in states
+        self.settled = _is_settled(self.date_str, states)
+        self.fetched_at = now
+
+        if games == self.games and self.etag is not None:
+            return
+        digests = {str(game_id): _digest(game) for game_id, game in games.items()}
+        etag = _digest(digests)
+        response_cache.set(self._history_key(etag), digests, Config.SCOREBOARD_HISTORY_SECONDS)
+        with self._view_lock:
+            self.games = games
+            self.digests = digests
+            self.snapshot = list(games.values())
+            self.etag = etag
+
+    def current(self):
+        with self._view_lock:
+            return self.etag, self.snapshot
+
+    def delta(self, since):
+        with self._view_lock:
+            etag, games, digests, snapshot = self.etag, self.games, self.digests, self.snapshot
+        if not since:
+            previous = MISS
+        elif since == etag:
+            previous = digests
+        else:
+            # Versions are content-addressed, so even an expired copy of one is still accurate.
+            previous = response_cache.last_good(self._history_key(since))
+        if previous is MISS:
+            return {"date": self.date_str, "version": etag, "full": True, "games": snapshot, "removed": []}
+        return {
+            "date": self.date_str, "version": etag, "full": False,
+            "games": [game for game_id, game in games.items() if previous.get(str(game_id)) != digests[str(game_id)]],
+            "removed": [int(game_id) for game_id in previous if game_id not in digests]
+        }
+
+class Scoreboard:
+    def __init__(self, max_dates):
+        self.max_dates = max_dates
+        self._boards = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _board(self, date_str):
+        with self._lock:
+            board = self._boards.get(date_str)
+            if board is None:
+                board = self._boards[date_str] = DateBoard(date_str)
+            self._boards.move_to_end(date_str)
+            while len(self._boards) > self.max_dates:
+                self._boards.popitem(last=False)
+            return board
+
+    def get(self, date_str, force=False):
+        board = self._board(date_str)
+        now = time.monotonic()
+        if not force and not board.is_due(now):
+            return board
+        # Only one request refreshes a date; the others keep serving the current snapshot.
+        if not board.lock.acquire(blocking=force or board.fetched_at is None):
+            return board
+        try:
+            if force or board.is_due(now):
+                url = f"{MLB_API_BASE}/schedule?sportId=1&date={date_str}"
+                # The shared tier lets one worker's fetch serve every other worker's refresh.
+                with forced_refresh() if force else nullcontext():
+                    data = fetch_json(url, ttl=_schedule_ttl(date_str))
+                board.apply(data, time.monotonic())
+        except requests.exceptions.RequestException as e:
+            print(f"Error refreshing scoreboard for {date_str}: {e}")
+        finally:
+            board.lock.release()
+        return board
+
+scoreboard = Scoreboard(Config.SCOREBOARD_MAX_DATES)
@@ -0,0 +1,176 @@
+import heapq
+import math
+import threading
+from array import array
+from datetime import datetime
+import requests
+from config import Config
+from .cache import fetch_json, IMMUTABLE
+from .fanout import gather
+from .leaderboards import QUALIFIER, STAT_GROUPS, is_ascending, leader_row, leaderboard
+
+MLB_API_BASE = Config.MLB_API_BASE
+
+LEAGUES = {'AL': 103, 'NL': 104}
+
+def _number(name, value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    if name == 'inningsPitched':
+        whole, _, outs = value.partition('.')
+        try:
+            return int(whole or 0) + int(outs or 0) / 3
+        except ValueError:
+            return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def _unique_splits(data):
+    # Traded players can appear once per club; the row with the most games is their season total.
+    splits = {}
+    for block in data.get('stats', []):
+        for split in block.get('splits', []):
+            player_id = split.get('player', {}).get('id')
+            if player_id is None:
+                continue
+            games = split.get('stat', {}).get('gamesPlayed') or 0
+            current = splits.get(player_id)
+            if current is None or games > (current.get('stat', {}).get('gamesPlayed') or 0):
+                splits[player_id] = split
+    return list(splits.values())
+
+class SeasonStatsTable:
+    # One float column per stat over the whole player pool; missing values are NaN.
+    def __init__(self, group, data):
+        self.group = group
+        splits = _unique_splits(data)
+        size = len(splits)
+        self.player_ids = array('i', [0]) * size
+        self.team_ids = array('i', [0]) * size
+        self.league_ids = array('i', [0]) * size
+        self.names = [None] * size
+        self.team_names = [None] * size
+        self.columns = {}
+        # Rate stat -> (decimal places, whether values below one drop the leading zero).
+        self.rate_columns = {}
+        for i, split in enumerate(splits):
+            team = split.get('team', {})
+            self.player_ids[i] = split['player']['id']
+            self.team_ids[i] = team.get('id') or 0
+            self.league_ids[i] = split.get('league', {}).get('id') or 0
+            self.names[i] = split['player'].get('fullName')
+            self.team_names[i] = team.get('name')
+            for name, value in split.get('stat', {}).items():
+                number = _number(name, value)
+                if number is None:
+                    continue
+                column = self.columns.get(name)
+                if column is None:
+                    column = self.columns[name] = array('d', [math.nan]) * size
+                column[i] = number
+                # The provider sends rates as strings (".285", "3.41") and counts as integers.
+                if isinstance(value, str) and name != 'inningsPitched':
+                    decimals, bare = self.rate_columns.get(name, (0, False))
+                    whole, _, fraction = value.partition('.')
+                    self.rate_columns[name] = (max(decimals, len(fraction)), bare or whole in ('', '-'))
+        self.team_games = {}
+        games = self.columns.get('gamesPlayed')
+        if games is not None:
+            for i in range(size):
+                if not math.isnan(games[i]):
+                    team_id = self.team_ids[i]
+                    self.team_games[team_id] = max(self.team_games.get(team_id, 0), games[i])
+
+    def top(self, stat, limit, ascending=False, team_id=None, league_id=None, minimum=None, team_games=None):
+        values = self.columns[stat]
+        volume_name, per_game, _ = QUALIFIER[self.group]
+        volume = self.columns.get(volume_name)
+        games = self.columns.get('gamesPlayed')
+        team_ids = self.team_ids
+        league_ids = self.league_ids
+
+        def eligible(i):
+            value = values[i]
+            if math.isnan(value):
+                return False
+            if team_id is not None and team_ids[i] != team_id:
+                return False
+            if league_id is not None and league_ids[i] != league_id:
+                return False
+            if volume is None or (minimum is None and team_games is None):
+                return True
+            threshold = minimum if minimum is not None else per_game * team_games.get(team_ids[i], 0)
+            return volume[i] >= threshold
+
+        pick = heapq.nsmallest if ascending else heapq.nlargest
+        top = pick(limit, filter(eligible, range(len(values))), key=values.__getitem__)
+        return [leader_row(rank, self.player_ids[i], self.names[i],
+                           {'id': self.team_ids[i], 'name': self.team_names[i]}, self.group, stat, values[i],
+                           games[i] if games is not None else None,
+                           volume[i] if volume is not None else None,
+                           self.rate_columns.get(stat))
+                for rank, i in enumerate(top, start=1)]
+
+def fetch_season_stats_data(group, season=None):
+    season = season or datetime.now().year
+    ttl = IMMUTABLE if int(season) < datetime.now().year else Config.CACHE_TTL_SEASON_STATS
+    url = (f"{MLB_API_BASE}/stats?stats=season&group={group}&playerPool=ALL&sportId=1"
+           f"&season={season}&gameType=R&limit={Config.SEASON_STATS_POOL_LIMIT}")
+    return fetch_json(url, ttl=ttl)
+
+class SeasonStats:
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def table(self, group, season=None):
+        season = season or datetime.now().year
+        data = fetch_season_stats_data(group, season)
+        key = (group, season)
+        with self._lock:
+            cached = self._tables.get(key)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        # A refreshed cache entry is a new object; only rebuild when its content really changed.
+        if cached is not None and cached[0] == data:
+            with self._lock:
+                self._tables[key] = (data, cached[1])
+            return cached[1]
+        table = SeasonStatsTable(group, data)
+        with self._lock:
+            self._tables[key] = (data, table)
+        return table
+
+    def refresh(self, season=None):
+        return gather(*[(lambda group: lambda: self.table(group, season))(group) for group in STAT_GROUPS])
+
+    def leaderboard(self, group, stat, limit=10, team_id=None, league_id=None, minimum=None,
+                    qualified=None, order=None, season=None):
+        try:
+            table = self.table(group, season)
+            if stat not in table.columns:
+                return {"error": f"Unknown {group} stat '{stat}'."}
+            if qualified is None:
+                qualified = stat in table.rate_columns
+            team_games = None
+            if minimum is None and qualified:
+                # Pitchers' games played say nothing about their club's, so team games come from hitting.
+                games_table = table if group == 'hitting' else self.table('hitting', season)
+                team_games = games_table.team_games
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching season stats from MLB API: {e}")
+            return {"error": "Failed to fetch season stats from the provider."}
+        ascending = is_ascending(group, stat, order)
+        leaders = table.top(stat, limit, ascending=ascending, team_id=team_id, league_id=league_id,
+                            minimum=minimum, team_games=team_games)
+        if minimum is None and team_games is not None:
+            minimum = 'qualified'
+        return leaderboard(group, stat, ascending, minimum, leaders, season=season or datetime.now().year)
+
+season_stats = SeasonStats()
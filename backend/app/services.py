@@ -1,76 +1,85 @@
 import requests
 from datetime import datetime
 from config import Config
-
-MLB_API_BASE = "https://statsapi.mlb.com/api/v1"
-
-def get_schedule_and_scores(date_str=None):
-    if not date_str:
-        date_str = datetime.today().strftime('%Y-%m-%d')
-    url = f"{MLB_API_BASE}/schedule?sportId=1&date={date_str}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        games_processed = []
-        if data.get("dates"):
-            raw_games = data["dates"][0]["games"]
-            for game in raw_games:
-                away_team_id = game["teams"]["away"]["team"]["id"]
-                home_team_id = game["teams"]["home"]["team"]["id"]
-                processed_game = {
-                    "id": game["gamePk"], "status": game["status"]["detailedState"],
-                    "home_team": game["teams"]["home"]["team"]["name"],
-                    "away_team": game["teams"]["away"]["team"]["name"],
-                    "home_score": game["teams"]["home"].get("score", 0),
-                    "away_score": game["teams"]["away"].get("score", 0),
-                    "venue": game["venue"]["name"], "time": game.get("gameDate"),
-                    "game_type": game["gameType"],
-                    "away_logo": f"https://www.mlbstatic.com/team-logos/{away_team_id}.svg",
-                    "home_logo": f"https://www.mlbstatic.com/team-logos/{home_team_id}.svg"
-                }
-                games_processed.append(processed_game)
-        return games_processed
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data from MLB API: {e}")
+from .cache import fetch_json, normalize_key, response_cache, IMMUTABLE
+from .fanout import submit, gather, optional_result
+from .reference_index import reference_index
+from .store import history_store
+from .news import news_feed
+from .weather import venue_weather, process_weather
+
+MLB_API_BASE = Config.MLB_API_BASE
+
+def _game_feed_ttl(data):
+    # Final games are answered from the history store once processed, so their
+    # multi-megabyte feed only needs to outlive that first request.
+    if data.get('gameData', {}).get('status', {}).get('abstractGameState') == 'Live':
+        return Config.CACHE_TTL_LIVE
+    return Config.CACHE_TTL_GAME
+
+def process_schedule(data):
+    games_processed = []
+    if data.get("dates"):
+        raw_games = data["dates"][0]["games"]
+        for game in raw_games:
+            away_team_id = game["teams"]["away"]["team"]["id"]
+            home_team_id = game["teams"]["home"]["team"]["id"]
+            processed_game = {
+                "id": game["gamePk"], "status": game["status"]["detailedState"],
+                "home_team": game["teams"]["home"]["team"]["name"],
+                "away_team": game["teams"]["away"]["team"]["name"],
+                "home_score": game["teams"]["home"].get("score", 0),
+                "away_score": game["teams"]["away"].get("score", 0),
+                "venue": game["venue"]["name"], "time": game.get("gameDate"),
+                "game_type": game["gameType"],
+                "away_logo": f"https://www.mlbstatic.com/team-logos/{away_team_id}.svg",
+                "home_logo": f"https://www.mlbstatic.com/team-logos/{home_team_id}.svg"
+            }
+            games_processed.append(processed_game)
+    return games_processed
+
+def _search_players(query):
+    player_search_url = f"{MLB_API_BASE}/people/search?names={query}"
+    players_data = fetch_json(player_search_url, ttl=Config.CACHE_TTL_SEARCH).get('people', [])
+    player_ids = [str(player.get('id')) for player in players_data if player.get('id')]
+    if not player_ids:
         return []
+    ids_string = ",".join(player_ids)
+    hydrate_params = "currentTeam,primaryPosition"
+    detailed_players_url = f"{MLB_API_BASE}/people?personIds={ids_string}&hydrate={hydrate_params}"
+    return fetch_json(detailed_players_url, ttl=Config.CACHE_TTL_SEARCH).get('people', [])
+
+def _search_reference_index(query, fuzzy=False):
+    return (reference_index.search(query, entry_type='player', fuzzy=fuzzy) +
+            reference_index.search(query, entry_type='team', fuzzy=fuzzy))
 
 def search_mlb_data(query):
+    if reference_index.ready:
+        indexed_results = _search_reference_index(query)
+        if indexed_results:
+            return indexed_results
+
     processed_results = []
     try:
-        player_search_url = f"{MLB_API_BASE}/people/search?names={query}"
-        player_response = requests.get(player_search_url)
-        player_response.raise_for_status()
-        
-        players_data = player_response.json().get('people', [])
-        player_ids = [str(player.get('id')) for player in players_data if player.get('id')]
-
-        if player_ids:
-            ids_string = ",".join(player_ids)
-            hydrate_params = "currentTeam,primaryPosition"
-            detailed_players_url = f"{MLB_API_BASE}/people?personIds={ids_string}&hydrate={hydrate_params}"
-            
-            detailed_response = requests.get(detailed_players_url)
-            detailed_response.raise_for_status()
-            
-            detailed_players_list = detailed_response.json().get('people', [])
-            
-            for player in detailed_players_list:
-                team_info = player.get('currentTeam', {})
-                position_info = player.get('primaryPosition', {})
-                processed_results.append({
-                    'id': f"player-{player['id']}", 'type': 'player',
-                    'name': player.get('fullName', 'N/A'),
-                    'photo': f"https://img.mlbstatic.com/mlb-photos/image/upload/d_people:generic:headshot:67:current.png/w_426,q_auto:best/v1/people/{player['id']}/headshot/67/current",
-                    'age': player.get('currentAge'),
-                    'team': team_info.get('name'),
-                    'position': position_info.get('abbreviation')
-                })
-
         all_teams_url = f"{MLB_API_BASE}/teams?sportId=1"
-        team_response = requests.get(all_teams_url)
-        team_response.raise_for_status()
-        teams_data = team_response.json().get('teams', [])
+        detailed_players_list, all_teams = gather(
+            lambda: _search_players(query),
+            lambda: fetch_json(all_teams_url, ttl=Config.CACHE_TTL_TEAM)
+        )
+
+        for player in detailed_players_list:
+            team_info = player.get('currentTeam', {})
+            position_info = player.get('primaryPosition', {})
+            processed_results.append({
+                'id': f"player-{player['id']}", 'type': 'player',
+                'name': player.get('fullName', 'N/A'),
+                'photo': f"https://img.mlbstatic.com/mlb-photos/image/upload/d_people:generic:headshot:67:current.png/w_426,q_auto:best/v1/people/{player['id']}/headshot/67/current",
+                'age': player.get('currentAge'),
+                'team': team_info.get('name'),
+                'position': position_info.get('abbreviation')
+            })
+
+        teams_data = all_teams.get('teams', [])
         query_lower = query.lower()
         for team in teams_data:
             if query_lower in team.get('name', '').lower() or \
@@ -87,30 +96,55 @@ def search_mlb_data(query):
     except requests.exceptions.RequestException as e:
         print(f"Error fetching search data from MLB API: {e}")
         return {"error": f"Failed to fetch data from external provider. Details: {e}"}
-        
+
+    if not processed_results and reference_index.ready:
+        return _search_reference_index(query, fuzzy=True)
     return processed_results
 
+def suggest_mlb_data(query, limit=8):
+    return reference_index.suggest(query, limit=max(limit, 1))
+
+def merge_season_splits(raw_stats, season_stats=None):
+    if season_stats is None:
+        season_stats = {}
+    for stat_group in raw_stats:
+        group_name = stat_group.get('group', {}).get('displayName', '').lower()
+        splits = stat_group.get('splits', [])
+        last_split_by_season = {}
+        for split in splits:
+            season = split.get('season')
+            if season:
+                last_split_by_season[season] = split
+        for season, split in last_split_by_season.items():
+            if season not in season_stats:
+                season_stats[season] = {}
+            stat_data = dict(split.get('stat', {}))
+            stat_data['team_name'] = split.get('team', {}).get('name', 'N/A')
+            season_stats[season][group_name] = stat_data
+    return season_stats
+
+def _store_completed_seasons(player_id, season_stats, current_season):
+    history_store.put('player_seasons', player_id, {
+        'through': current_season - 1,
+        'seasons': {season: stats for season, stats in season_stats.items()
+                    if int(season) < current_season}
+    })
+
 def get_player_stats(player_id):
+    current_season = datetime.now().year
     try:
-        stats_url = f"{MLB_API_BASE}/people/{player_id}/stats?stats=yearByYear&group=hitting,pitching"
-        response = requests.get(stats_url)
-        response.raise_for_status()
-        raw_stats = response.json().get('stats', [])
-        season_stats = {}
-        for stat_group in raw_stats:
-            group_name = stat_group.get('group', {}).get('displayName', '').lower()
-            splits = stat_group.get('splits', [])
-            last_split_by_season = {}
-            for split in splits:
-                season = split.get('season')
-                if season:
-                    last_split_by_season[season] = split
-            for season, split in last_split_by_season.items():
-                if season not in season_stats:
-                    season_stats[season] = {}
-                stat_data = split.get('stat', {})
-                stat_data['team_name'] = split.get('team', {}).get('name', 'N/A')
-                season_stats[season][group_name] = stat_data
+        # Completed seasons never change, so once stored only the current season is fetched.
+        history = history_store.get('player_seasons', player_id)
+        if history and history.get('through') == current_season - 1:
+            stats_url = (f"{MLB_API_BASE}/people/{player_id}/stats?stats=season"
+                         f"&season={current_season}&group=hitting,pitching")
+            raw_stats = fetch_json(stats_url, ttl=Config.CACHE_TTL_PLAYER).get('stats', [])
+            season_stats = merge_season_splits(raw_stats, dict(history['seasons']))
+        else:
+            stats_url = f"{MLB_API_BASE}/people/{player_id}/stats?stats=yearByYear&group=hitting,pitching"
+            raw_stats = fetch_json(stats_url, ttl=Config.CACHE_TTL_PLAYER).get('stats', [])
+            season_stats = merge_season_splits(raw_stats)
+            _store_completed_seasons(player_id, season_stats, current_season)
         if not season_stats:
              return {"error": "No statistical data found for this player."}
         return season_stats
@@ -118,109 +152,200 @@ def get_player_stats(player_id):
         print(f"Error fetching player stats from MLB API: {e}")
         return {"error": "Failed to fetch player stats from the provider."}
 
+def build_player_details(player):
+    team_info = player.get('currentTeam', {})
+    position_info = player.get('primaryPosition', {})
+    return {
+        'id': f"player-{player['id']}", 'type': 'player',
+        'name': player.get('fullName', 'N/A'),
+        'photo': f"https://img.mlbstatic.com/mlb-photos/image/upload/d_people:generic:headshot:67:current.png/w_426,q_auto:best/v1/people/{player['id']}/headshot/67/current",
+        'age': player.get('currentAge'),
+        'team': team_info.get('name'),
+        'position': position_info.get('abbreviation'),
+        'jerseyNumber': player.get('primaryNumber', '-'),
+        'birthDate': player.get('birthDate', 'N/A')
+    }
+
 def get_player_details(player_id):
     try:
         detailed_player_url = f"{MLB_API_BASE}/people/{player_id}?hydrate=currentTeam,primaryPosition"
-        response = requests.get(detailed_player_url)
-        response.raise_for_status()
-        player_list = response.json().get('people', [])
+        player_list = fetch_json(detailed_player_url, ttl=Config.CACHE_TTL_PLAYER).get('people', [])
         if not player_list:
             return {"error": "Player not found."}
-        player = player_list[0]
-        team_info = player.get('currentTeam', {})
-        position_info = player.get('primaryPosition', {})
-        player_details = {
-            'id': f"player-{player['id']}", 'type': 'player',
-            'name': player.get('fullName', 'N/A'),
-            'photo': f"https://img.mlbstatic.com/mlb-photos/image/upload/d_people:generic:headshot:67:current.png/w_426,q_auto:best/v1/people/{player['id']}/headshot/67/current",
-            'age': player.get('currentAge'),
-            'team': team_info.get('name'),
-            'position': position_info.get('abbreviation'),
-            'jerseyNumber': player.get('primaryNumber', '-'),
-            'birthDate': player.get('birthDate', 'N/A')
-        }
-        return player_details
+        return build_player_details(player_list[0])
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching player details from MLB API: {e}")
+        return {"error": "Failed to fetch player details from the provider."}
+
+def _fetch_people_in_chunks(player_ids, hydrate):
+    chunk_size = Config.BULK_CHUNK_SIZE
+    chunks = [player_ids[i:i + chunk_size] for i in range(0, len(player_ids), chunk_size)]
+    results = gather(*[
+        (lambda chunk: lambda: fetch_json(
+            f"{MLB_API_BASE}/people?personIds={','.join(str(i) for i in chunk)}&hydrate={hydrate}",
+            ttl=Config.CACHE_TTL_PLAYER).get('people', []))(chunk)
+        for chunk in chunks
+    ], return_exceptions=True)
+    people = {}
+    failed_ids = set()
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            print(f"Error fetching players {chunk} from MLB API: {result}")
+            failed_ids.update(chunk)
+            continue
+        for person in result:
+            people[person.get('id')] = person
+    if failed_ids and len(failed_ids) == len(player_ids):
+        raise requests.exceptions.RequestException("All player chunks failed.")
+    return people, failed_ids
+
+def get_players_stats(player_ids):
+    current_season = datetime.now().year
+    # As in get_player_stats: players whose completed seasons are stored only need the current one,
+    # and only the others are fetched year by year and written back.
+    stored = {}
+    for key, history in history_store.get_many('player_seasons', player_ids).items():
+        if history.get('through') == current_season - 1:
+            stored[int(key)] = history['seasons']
+    new_ids = [player_id for player_id in player_ids if player_id not in stored]
+    stored_ids = [player_id for player_id in player_ids if player_id in stored]
+    people = {}
+    failed_ids = set()
+    for ids, hydrate in ((new_ids, "stats(group=[hitting,pitching],type=[yearByYear])"),
+                         (stored_ids, f"stats(group=[hitting,pitching],type=[season],season={current_season})")):
+        if not ids:
+            continue
+        try:
+            fetched, failed = _fetch_people_in_chunks(ids, hydrate)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching player stats from MLB API: {e}")
+            fetched, failed = {}, set(ids)
+        people.update(fetched)
+        failed_ids.update(failed)
+    if failed_ids and len(failed_ids) == len(player_ids):
+        return {"error": "Failed to fetch player stats from the provider."}
+    results = {}
+    for player_id in player_ids:
+        if player_id in failed_ids:
+            results[str(player_id)] = {"error": "Failed to fetch player stats from the provider."}
+            continue
+        raw_stats = people.get(player_id, {}).get('stats', [])
+        if player_id in stored:
+            season_stats = merge_season_splits(raw_stats, dict(stored[player_id]))
+        else:
+            season_stats = merge_season_splits(raw_stats)
+            if season_stats:
+                _store_completed_seasons(player_id, season_stats, current_season)
+        if not season_stats:
+            results[str(player_id)] = {"error": "No statistical data found for this player."}
+            continue
+        results[str(player_id)] = season_stats
+    return results
+
+def get_players_details(player_ids):
+    try:
+        people, failed_ids = _fetch_people_in_chunks(player_ids, "currentTeam,primaryPosition")
     except requests.exceptions.RequestException as e:
         print(f"Error fetching player details from MLB API: {e}")
         return {"error": "Failed to fetch player details from the provider."}
+    results = {}
+    for player_id in player_ids:
+        if player_id in failed_ids:
+            results[str(player_id)] = {"error": "Failed to fetch player details from the provider."}
+        elif player_id in people:
+            results[str(player_id)] = build_player_details(people[player_id])
+        else:
+            results[str(player_id)] = {"error": "Player not found."}
+    return results
+
+def _process_leader_categories(data):
+    return {
+        category.get('leaderCategory'): [
+            {
+                "rank": leader.get('rank'), "value": leader.get('value'),
+                "id": leader.get('person', {}).get('id'),
+                "name": leader.get('person', {}).get('fullName')
+            } for leader in category.get('leaders', [])
+        ] for category in data.get('leagueLeaders', [])
+    }
 
-def get_league_leaders():
+def process_leaders(hitting_data, pitching_data):
+    return {
+        "hitting": _process_leader_categories(hitting_data),
+        "pitching": _process_leader_categories(pitching_data)
+    }
+
+def fetch_leaders_data(season=None, limit=5):
+    season = season or datetime.now().year
+    ttl = IMMUTABLE if int(season) < datetime.now().year else Config.CACHE_TTL_LEADERS
+    hitting_url = (f"{MLB_API_BASE}/stats/leaders?leaderCategories={Config.LEADER_HITTING_CATEGORIES}"
+                   f"&sportId=1&season={season}&gameType=R&limit={limit}&statGroup=hitting")
+    pitching_url = (f"{MLB_API_BASE}/stats/leaders?leaderCategories={Config.LEADER_PITCHING_CATEGORIES}"
+                    f"&sportId=1&season={season}&gameType=R&limit={limit}&statGroup=pitching")
+    return gather(
+        lambda: fetch_json(hitting_url, ttl=ttl),
+        lambda: fetch_json(pitching_url, ttl=ttl)
+    )
+
+def get_league_leaders(season=None, limit=5):
     try:
-        current_season = datetime.now().year
-        hitting_categories = "homeRuns,battingAverage,runsBattedIn,onBasePlusSlugging,hits,runs"
-        pitching_categories = "earnedRunAverage,wins,strikeouts,walksAndHitsPerInningPitched,saves,inningsPitched"
-        leaders_data = { "hitting": {}, "pitching": {} }
-        hitting_url = (f"{MLB_API_BASE}/stats/leaders?leaderCategories={hitting_categories}"
-                       f"&sportId=1&season={current_season}&gameType=R&limit=5&statGroup=hitting")
-        hitting_response = requests.get(hitting_url)
-        hitting_response.raise_for_status()
-        for category in hitting_response.json().get('leagueLeaders', []):
-            stat_name = category.get('leaderCategory')
-            leaders_data["hitting"][stat_name] = [
-                {
-                    "rank": leader.get('rank'), "value": leader.get('value'),
-                    "id": leader.get('person', {}).get('id'),
-                    "name": leader.get('person', {}).get('fullName')
-                } for leader in category.get('leaders', [])
-            ]
-        pitching_url = (f"{MLB_API_BASE}/stats/leaders?leaderCategories={pitching_categories}"
-                        f"&sportId=1&season={current_season}&gameType=R&limit=5&statGroup=pitching")
-        pitching_response = requests.get(pitching_url)
-        pitching_response.raise_for_status()
-        for category in pitching_response.json().get('leagueLeaders', []):
-            stat_name = category.get('leaderCategory')
-            leaders_data["pitching"][stat_name] = [
-                {
-                    "rank": leader.get('rank'), "value": leader.get('value'),
-                    "id": leader.get('person', {}).get('id'),
-                    "name": leader.get('person', {}).get('fullName')
-                } for leader in category.get('leaders', [])
-            ]
-        return leaders_data
+        hitting_data, pitching_data = fetch_leaders_data(season, limit)
+        return process_leaders(hitting_data, pitching_data)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching league leaders from MLB API: {e}")
         return {"error": "Failed to fetch league leaders from the provider."}
 
+def weather_city_for_team(team_data):
+    team_name_for_map = team_data.get('teamName')
+    if team_name_for_map in ["NY Mets", "NY Yankees", "Chi Cubs", "Chi White Sox"]:
+        return team_name_for_map
+    return team_data.get('locationName')
+
+def build_team_details(team_id, team_data, roster_data, weather):
+    roster_list = []
+    for player_entry in roster_data.get('roster', []):
+        person = player_entry.get('person', {})
+        position = player_entry.get('position', {})
+        roster_list.append({
+            "id": person.get('id'),
+            "name": person.get('fullName'),
+            "jerseyNumber": player_entry.get('jerseyNumber', '-'),
+            "position": position.get('abbreviation')
+        })
+
+    return {
+        'id': team_data.get('id'),
+        'name': team_data.get('name'),
+        'logo': f"https://www.mlbstatic.com/team-logos/{team_id}.svg",
+        'venue': team_data.get('venue', {}).get('name'),
+        'city': team_data.get('locationName'),
+        'firstYear': team_data.get('firstYearOfPlay'),
+        'league': team_data.get('league', {}).get('name'),
+        'division': team_data.get('division', {}).get('name'),
+        'roster': roster_list,
+        'weather': weather
+    }
+
 def get_team_details(team_id):
     try:
         team_info_url = f"{MLB_API_BASE}/teams/{team_id}"
-        team_info_response = requests.get(team_info_url)
-        team_info_response.raise_for_status()
-        
-        teams = team_info_response.json().get('teams', [])
+        roster_url = f"{MLB_API_BASE}/teams/{team_id}/roster"
+        team_info_future = submit(fetch_json, team_info_url, ttl=Config.CACHE_TTL_TEAM)
+        roster_future = submit(fetch_json, roster_url, ttl=Config.CACHE_TTL_ROSTER)
+
+        teams = team_info_future.result().get('teams', [])
         if not teams:
             return {"error": "Team not found."}
         team_data = teams[0]
-        city = team_data.get('locationName')
-        team_name_for_map = team_data.get('teamName')
-        roster_url = f"{MLB_API_BASE}/teams/{team_id}/roster"
-        roster_response = requests.get(roster_url)
-        roster_response.raise_for_status()
-        
-        roster_list = []
-        for player_entry in roster_response.json().get('roster', []):
-            person = player_entry.get('person', {})
-            position = player_entry.get('position', {})
-            roster_list.append({
-                "id": person.get('id'),
-                "name": person.get('fullName'),
-                "jerseyNumber": player_entry.get('jerseyNumber', '-'),
-                "position": position.get('abbreviation')
-            })
-        
-        team_details = {
-            'id': team_data.get('id'),
-            'name': team_data.get('name'),
-            'logo': f"https://www.mlbstatic.com/team-logos/{team_id}.svg",
-            'venue': team_data.get('venue', {}).get('name'),
-            'city': city,
-            'firstYear': team_data.get('firstYearOfPlay'),
-            'league': team_data.get('league', {}).get('name'),
-            'division': team_data.get('division', {}).get('name'),
-            'roster': roster_list,
-            'weather': get_weather_for_city(team_name_for_map if team_name_for_map in ["NY Mets", "NY Yankees", "Chi Cubs", "Chi White Sox"] else city)
-        }
-        return team_details
+        venue_id = team_data.get('venue', {}).get('id')
+        if venue_weather.knows(venue_id):
+            weather_future = submit(venue_weather.get, venue_id)
+        else:
+            weather_future = submit(get_weather_for_city, weather_city_for_team(team_data))
+        roster_data = roster_future.result()
+
+        weather = optional_result(weather_future, default={"error": "Weather service unavailable"})
+        return build_team_details(team_id, team_data, roster_data, weather)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching team details from MLB API: {e}")
@@ -235,188 +360,123 @@ def get_weather_for_city(city_name):
         "Chi Cubs": "Chicago", "Chi White Sox": "Chicago",
     }
     search_city = city_map.get(city_name, city_name)
-    weather_url = ("https://api.openweathermap.org/data/2.5/weather"
+    weather_url = (f"{Config.OPENWEATHER_API_BASE}/weather"
                    f"?q={search_city}&appid={Config.OPENWEATHER_API_KEY}&units=metric")
     try:
-        response = requests.get(weather_url)
-        if response.status_code == 401:
+        return process_weather(fetch_json(weather_url, ttl=Config.CACHE_TTL_WEATHER))
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 401:
             print("Error: OpenWeather API Key is invalid or not yet active.")
             return {"error": "Invalid Weather API Key"}
-        response.raise_for_status()
-        data = response.json()
-        weather_info = data.get('weather', [{}])[0]
-        main_info = data.get('main', {})
-        return {
-            "temperature": round(main_info.get('temp')),
-            "description": weather_info.get('main'),
-            "icon": weather_info.get('icon')
-        }
+        print(f"Could not fetch weather for city '{search_city}': {e}")
+        return {"error": "Weather service unavailable"}
     except requests.exceptions.RequestException as e:
         print(f"Could not fetch weather for city '{search_city}': {e}")
         return {"error": "Weather service unavailable"}
 
+def build_game_details(game_data, linescore, boxscore):
+    players_data = { "away": [], "home": [] }
+    for team in ["away", "home"]:
+        team_players = boxscore.get(team, {}).get('players', {})
+        for player_id_key, player_stats in team_players.items():
+            players_data[team].append({
+                "id": player_stats.get('person', {}).get('id'),
+                "name": player_stats.get('person', {}).get('fullName'),
+                "jerseyNumber": player_stats.get('jerseyNumber', '-'),
+                "position": player_stats.get('position', {}).get('abbreviation'),
+                "stats": {
+                    "batting": player_stats.get('stats', {}).get('batting', {}),
+                    "pitching": player_stats.get('stats', {}).get('pitching', {})
+                }
+            })
+    
+    away_team_box_info = boxscore.get('away', {}).get('team', {})
+    home_team_box_info = boxscore.get('home', {}).get('team', {})
+
+    return {
+        "status": game_data.get('status', {}).get('detailedState', 'Final'),
+        "venue": game_data.get('venue', {}).get('name'),
+        "away_team": away_team_box_info.get('name'),
+        "home_team": home_team_box_info.get('name'),
+        "away_logo": f"https://www.mlbstatic.com/team-logos/{away_team_box_info.get('id')}.svg",
+        "home_logo": f"https://www.mlbstatic.com/team-logos/{home_team_box_info.get('id')}.svg",
+        "linescore": linescore,
+        "players": players_data,
+        "away_team_id": away_team_box_info.get('id'),
+        "home_team_id": home_team_box_info.get('id')
+    }
+
+def game_fallback_urls(game_id):
+    return (f"{MLB_API_BASE}/game/{game_id}/contextMetrics",
+            f"{MLB_API_BASE}/game/{game_id}/linescore",
+            f"{MLB_API_BASE}/game/{game_id}/boxscore")
+
+def finish_game_details(game_id, game_data, linescore, boxscore):
+    game_details = build_game_details(game_data, linescore, boxscore)
+    if game_data.get('status', {}).get('abstractGameState') == 'Final':
+        history_store.put('games', game_id, game_details)
+    else:
+        game_details['weather'] = venue_weather.get(game_data.get('venue', {}).get('id'))
+    return game_details
+
 def get_game_details(game_id):
+    stored = history_store.get('games', game_id)
+    if stored is not None:
+        return stored
     try:
         game_url_live = f"{MLB_API_BASE}/game/{game_id}/feed/live"
-        response = requests.get(game_url_live)
-
-        if response.status_code == 404:
-            game_url_context = f"{MLB_API_BASE}/game/{game_id}/contextMetrics"
-            linescore_url = f"{MLB_API_BASE}/game/{game_id}/linescore"
-            boxscore_url = f"{MLB_API_BASE}/game/{game_id}/boxscore"
-            
-            game_resp = requests.get(game_url_context)
-            game_resp.raise_for_status()
-            game_data = game_resp.json().get('game', {})
-            
-            linescore_resp = requests.get(linescore_url)
-            linescore_resp.raise_for_status()
-            linescore = linescore_resp.json()
-            
-            boxscore_resp = requests.get(boxscore_url)
-            boxscore_resp.raise_for_status()
-            boxscore = boxscore_resp.json().get('teams', {})
+        try:
+            data = fetch_json(game_url_live, ttl=_game_feed_ttl)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            data = None
+
+        if data is None:
+            context_data, linescore, boxscore_data = gather(*[
+                (lambda url: lambda: fetch_json(url, ttl=Config.CACHE_TTL_GAME))(url)
+                for url in game_fallback_urls(game_id)
+            ])
+            game_data = context_data.get('game', {})
+            boxscore = boxscore_data.get('teams', {})
         
         else:
-            response.raise_for_status()
-            data = response.json()
             live_data = data.get('liveData', {})
             game_data = data.get('gameData', {})
             linescore = live_data.get('linescore', {})
             boxscore = live_data.get('boxscore', {}).get('teams', {})
 
-        players_data = { "away": [], "home": [] }
-        for team in ["away", "home"]:
-            team_players = boxscore.get(team, {}).get('players', {})
-            for player_id_key, player_stats in team_players.items():
-                players_data[team].append({
-                    "id": player_stats.get('person', {}).get('id'),
-                    "name": player_stats.get('person', {}).get('fullName'),
-                    "jerseyNumber": player_stats.get('jerseyNumber', '-'),
-                    "position": player_stats.get('position', {}).get('abbreviation'),
-                    "stats": {
-                        "batting": player_stats.get('stats', {}).get('batting', {}),
-                        "pitching": player_stats.get('stats', {}).get('pitching', {})
-                    }
-                })
-        
-        away_team_box_info = boxscore.get('away', {}).get('team', {})
-        home_team_box_info = boxscore.get('home', {}).get('team', {})
-
-        return {
-            "status": game_data.get('status', {}).get('detailedState', 'Final'),
-            "venue": game_data.get('venue', {}).get('name'),
-            "away_team": away_team_box_info.get('name'),
-            "home_team": home_team_box_info.get('name'),
-            "away_logo": f"https://www.mlbstatic.com/team-logos/{away_team_box_info.get('id')}.svg",
-            "home_logo": f"https://www.mlbstatic.com/team-logos/{home_team_box_info.get('id')}.svg",
-            "linescore": linescore,
-            "players": players_data,
-            "away_team_id": away_team_box_info.get('id'),
-            "home_team_id": home_team_box_info.get('id')
-        }
+        return finish_game_details(game_id, game_data, linescore, boxscore)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching game details from MLB API: {e}")
         return {"error": "Failed to fetch game details from the provider."}
 
-MLB_TEAM_KEYWORDS = [
-    'd-backs', 'diamondbacks', 'braves', 'orioles', 'red sox', 'cubs', 'white sox', 
-    'reds', 'guardians', 'rockies', 'tigers', 'astros', 'royals', 'angels', 
-    'dodgers', 'marlins', 'brewers', 'twins', 'mets', 'yankees', 'athletics', 
-    'a\'s', 'phillies', 'pirates', 'padres', 'giants', 'mariners', 'cardinals', 
-    'rays', 'rangers', 'blue jays', 'nationals'
-]
-MLB_SUPERSTAR_KEYWORDS = [
-    'ohtani', 'judge', 'trout', 'soto', 'betts', 'acuna',  'raleigh', 'springer', 
-    'freeman', 'harper', 'kershaw', 'degrom', 'scherzer', 'verlander', 'cole', 'schwarber', 
-    'skenes', 'skubal', 'duran', 'snell', 'yamamoto'
-]
-MLB_JARGON_KEYWORDS = [
-    'pitcher', 'catcher', 'infielder', 'outfielder', 'hitter', 'batter', 'bullpen',
-    'strikeout', 'home run', 'grand slam', 'no-hitter', 'perfect game', 'inning',
-    'dugout', 'umpire', 'world series', 'cy young', 'double play'
-]
-MLB_GENERAL_KEYWORDS = [
-    'playoffs', 'all-star', 'mvp', 'championship', 'division series'
-]
-COMPETITOR_LEAGUE_KEYWORDS = [
-    'nfl', 'nba', 'nhl', 'pga', 'nascar', 'mls', 'premier league', 'f1', 'formula 1'
-]
-
 def get_mlb_news(page=1, per_page=20):
     if not Config.NEWSAPI_KEY:
         print("Warning: NewsAPI Key not configured.")
         return {"error": "News service is not configured on the server."}
 
-    news_api_url = "https://newsapi.org/v2/everything"
-    sources = "espn,fox-sports,cbs-sports,bleacher-report,nbc-sports"
-    params = {
-        'q': '"MLB" OR "baseball"', 'apiKey': Config.NEWSAPI_KEY,
-        'sources': sources, 'sortBy': 'publishedAt',
-        'pageSize': 100, 'language': 'en'
-    }
-
     try:
-        response = requests.get(news_api_url, params=params)
-        response.raise_for_status()
-        articles = response.json().get('articles', [])
-        
-        scored_articles = []
-        for article in articles:
-            if not article.get('content') or article.get('title') == '[Removed]':
-                continue
-
-            title = article.get('title', '').lower()
-            description = article.get('description', '').lower()
-            content_to_check = title + " " + description
-
-            score = 0
-            if any(keyword in content_to_check for keyword in MLB_TEAM_KEYWORDS): score += 4
-            if 'mlb' in content_to_check or 'major league baseball' in content_to_check: score += 3
-            if any(keyword in content_to_check for keyword in MLB_SUPERSTAR_KEYWORDS): score += 3
-            if any(keyword in content_to_check for keyword in MLB_JARGON_KEYWORDS): score += 2
-            if any(keyword in content_to_check for keyword in MLB_GENERAL_KEYWORDS): score += 1
-            if any(keyword in title for keyword in COMPETITOR_LEAGUE_KEYWORDS): score -= 3
-
-            if score >= 1:
-                processed_article = {
-                    'id': article.get('url'), 'title': article.get('title'),
-                    'url': article.get('url'), 'date': article.get('publishedAt'),
-                    'summary': article.get('description'), 'thumbnail': article.get('urlToImage')
-                }
-                scored_articles.append({'article': processed_article, 'score': score})
-
-        scored_articles.sort(key=lambda x: x['score'], reverse=True)
-        top_40_articles = [item['article'] for item in scored_articles[:40]]
-
-        top_40_articles.sort(key=lambda x: x['date'], reverse=True)
-
-        total_results = len(top_40_articles)
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        paginated_articles = top_40_articles[start_index:end_index]
-        has_more = end_index < total_results
-
-        return {
-            "articles": paginated_articles, "page": page,
-            "totalResults": total_results, "hasMore": has_more
-        }
-
+        news_feed.ensure_fresh()
     except requests.exceptions.RequestException as e:
         print(f"Error fetching news from NewsAPI: {e}")
-        return {"error": "Failed to fetch news from the provider."}
+        if news_feed.fetched_at is None:
+            return {"error": "Failed to fetch news from the provider."}
+    return news_feed.page(page, per_page)
 
 def get_youtube_highlights(query=None):
     if not Config.YOUTUBE_API_KEY:
         print("Warning: YouTube API Key not configured.")
         return {"error": "Video service is not configured on the server."}
 
-    youtube_api_url = "https://www.googleapis.com/youtube/v3/search"
+    youtube_api_url = f"{Config.YOUTUBE_API_BASE}/search"
     
+    # Normalizing the query lets equivalent searches share one cached, quota-metered call.
+    normalized_query = ' '.join(query.lower().split()) if query else ''
     search_term = ""
-    if query:
-        search_term = f"MLB {query}"
+    if normalized_query:
+        search_term = f"MLB {normalized_query}"
     else:
         search_term = "MLB Highlights"
 
@@ -430,9 +490,7 @@ def get_youtube_highlights(query=None):
     }
 
     try:
-        response = requests.get(youtube_api_url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_json(youtube_api_url, params=params, ttl=Config.CACHE_TTL_HIGHLIGHTS)
         
         processed_videos = []
         for item in data.get('items', []):
@@ -452,46 +510,53 @@ def get_youtube_highlights(query=None):
         print(f"Error fetching videos from YouTube API: {e.response.text if e.response else e}")
         return {"error": "Failed to fetch videos from the provider."}
     
-def get_league_standings(season=None):
-    if not season:
-        season = datetime.now().year
-        
+def fetch_standings_data(season=None):
+    season = season or datetime.now().year
     url = f"{MLB_API_BASE}/standings?leagueId=103,104&season={season}"
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+    if int(season) >= datetime.now().year:
+        return fetch_json(url, ttl=Config.CACHE_TTL_STANDINGS)
+
+    # Past seasons are final: memory first, then the on-disk store, then upstream once.
+    def load():
+        stored = history_store.get('standings_records', season)
+        if stored is None:
+            stored = fetch_json(url)
+            if stored.get('records'):
+                history_store.put('standings_records', season, stored)
+        return stored
+    return response_cache.get_or_fetch(normalize_key(url), load, IMMUTABLE)
+
+def process_standings(data):
+    processed_standings = []
+    for record in data.get('records', []):
+        division_name = record.get('division', {}).get('name')
+        league_name = record.get('league', {}).get('name')
         
-        processed_standings = []
-        for record in data.get('records', []):
-            division_name = record.get('division', {}).get('name')
-            league_name = record.get('league', {}).get('name')
-            
-            teams_in_division = []
-            for team_entry in record.get('teamRecords', []):
-                team_info = team_entry.get('team', {})
-                league_record = team_entry.get('leagueRecord', {})
-                teams_in_division.append({
-                    'id': team_info.get('id'),
-                    'name': team_info.get('name'),
-                    'logo': f"https://www.mlbstatic.com/team-logos/{team_info.get('id')}.svg",
-                    'wins': league_record.get('wins', 0),
-                    'losses': league_record.get('losses', 0),
-                    'pct': league_record.get('pct', '.000'),
-                    'gb': team_entry.get('gamesBack', '--'),
-                    'streak': team_entry.get('streak', {}).get('streakCode', '-')
-                })
-            
-            processed_standings.append({
-                'league': league_name,
-                'division': division_name,
-                'teams': teams_in_division
+        teams_in_division = []
+        for team_entry in record.get('teamRecords', []):
+            team_info = team_entry.get('team', {})
+            league_record = team_entry.get('leagueRecord', {})
+            teams_in_division.append({
+                'id': team_info.get('id'),
+                'name': team_info.get('name'),
+                'logo': f"https://www.mlbstatic.com/team-logos/{team_info.get('id')}.svg",
+                'wins': league_record.get('wins', 0),
+                'losses': league_record.get('losses', 0),
+                'pct': league_record.get('pct', '.000'),
+                'gb': team_entry.get('gamesBack', '--'),
+                'streak': team_entry.get('streak', {}).get('streakCode', '-')
             })
-            
-        return processed_standings
+        
+        processed_standings.append({
+            'league': league_name,
+            'division': division_name,
+            'teams': teams_in_division
+        })
+    return processed_standings
 
+def get_league_standings(season=None):
+    try:
+        return process_standings(fetch_standings_data(season))
     except requests.exceptions.RequestException as e:
         print(f"Error fetching standings from MLB API: {e}")
         return {"error": "Failed to fetch league standings from the provider."}
-
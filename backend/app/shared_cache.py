@@ -0,0 +1,250 @@
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from config import Config
+from .codec import dumps, loads
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Every backend stores (value, stored_at, ttl) and returns (value, age, ttl) for
+# entries that are still fresh, so any worker can adopt another worker's fill.
+# Counters (incr/counter) are atomic across workers and expire ttl seconds after
+# their first increment.
+
+def _expires_at(stored_at, ttl):
+    return None if ttl == float('inf') else stored_at + ttl
+
+class MemoryCacheBackend:
+    # Process-local stand-in with the same behaviour, for tests and single-process runs.
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            data, stored_at, ttl = item
+            if now - stored_at >= ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return loads(data), now - stored_at, ttl
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (dumps(value), time.time(), ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def incr(self, key, amount, ttl):
+        now = time.time()
+        with self._lock:
+            value, expires_at = self._counters.get(key, (0, None))
+            if expires_at is None or expires_at <= now:
+                value, expires_at = 0, now + ttl
+            value += amount
+            self._counters[key] = (value, expires_at)
+            if len(self._counters) > self.max_entries:
+                self._counters = {k: item for k, item in self._counters.items() if item[1] > now}
+            return value
+
+    def counter(self, key):
+        with self._lock:
+            value, expires_at = self._counters.get(key, (0, None))
+        return value if expires_at is not None and expires_at > time.time() else 0
+
+class SQLiteCacheBackend:
+    # A WAL-mode SQLite file is shared by every worker on the host; readers never block writers.
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS shared_cache ("
+                         "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                         "stored_at REAL NOT NULL, expires_at REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS shared_cache_stored_at ON shared_cache (stored_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS shared_counters ("
+                         "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        try:
+            row = self._connection().execute(
+                "SELECT value, stored_at, expires_at FROM shared_cache "
+                "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, now)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading '{key}' from shared cache: {e}")
+            return None
+        if row is None:
+            return None
+        data, stored_at, expires_at = row
+        ttl = float('inf') if expires_at is None else expires_at - stored_at
+        return loads(data), now - stored_at, ttl
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO shared_cache (key, value, stored_at, expires_at) "
+                         "VALUES (?, ?, ?, ?)", (key, dumps(value), now, _expires_at(now, ttl)))
+            self._writes += 1
+            if self._writes % Config.SHARED_CACHE_PURGE_EVERY == 0:
+                conn.execute("DELETE FROM shared_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+                # Immutable entries never expire, so past the cap the oldest fills go first.
+                conn.execute("DELETE FROM shared_cache WHERE key IN (SELECT key FROM shared_cache "
+                             "ORDER BY stored_at DESC LIMIT -1 OFFSET ?)", (Config.SHARED_CACHE_MAX_ENTRIES,))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing '{key}' to shared cache: {e}")
+
+    def delete(self, key):
+        try:
+            conn = self._connection()
+            conn.execute("DELETE FROM shared_cache WHERE key = ?", (key,))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error deleting '{key}' from shared cache: {e}")
+
+    def clear(self):
+        try:
+            conn = self._connection()
+            conn.execute("DELETE FROM shared_cache")
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error clearing shared cache: {e}")
+
+    def incr(self, key, amount, ttl):
+        # The first write takes the database lock, so the read-back sees only this increment.
+        now = time.time()
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM shared_counters WHERE key = ? AND expires_at <= ?", (key, now))
+                conn.execute("INSERT INTO shared_counters (key, value, expires_at) VALUES (?, ?, ?) "
+                             "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                             (key, amount, now + ttl))
+                value = conn.execute("SELECT value FROM shared_counters WHERE key = ?", (key,)).fetchone()[0]
+                self._writes += 1
+                if self._writes % Config.SHARED_CACHE_PURGE_EVERY == 0:
+                    conn.execute("DELETE FROM shared_counters WHERE expires_at <= ?", (now,))
+            return value
+        except sqlite3.Error as e:
+            print(f"Error incrementing '{key}' in shared cache: {e}")
+            return None
+
+    def counter(self, key):
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM shared_counters WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading '{key}' from shared cache: {e}")
+            return 0
+        return 0 if row is None else row[0]
+
+_HEADER = struct.Struct('!dd')
+
+class RedisCacheBackend:
+    def __init__(self, url, prefix='mlb:cache:'):
+        if redis is None:
+            raise RuntimeError("The 'redis' package is required for a redis:// shared cache.")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        try:
+            data = self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            print(f"Error reading '{key}' from shared cache: {e}")
+            return None
+        if data is None:
+            return None
+        stored_at, ttl = _HEADER.unpack_from(data)
+        return loads(data[_HEADER.size:]), time.time() - stored_at, ttl
+
+    def set(self, key, value, ttl):
+        data = _HEADER.pack(time.time(), ttl) + dumps(value)
+        try:
+            if ttl == float('inf'):
+                self.client.set(self.prefix + key, data)
+            else:
+                self.client.set(self.prefix + key, data, px=max(int(ttl * 1000), 1))
+        except redis.RedisError as e:
+            print(f"Error writing '{key}' to shared cache: {e}")
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.prefix + key)
+        except redis.RedisError as e:
+            print(f"Error deleting '{key}' from shared cache: {e}")
+
+    def clear(self):
+        try:
+            for key in self.client.scan_iter(self.prefix + '*'):
+                self.client.delete(key)
+        except redis.RedisError as e:
+            print(f"Error clearing shared cache: {e}")
+
+    def incr(self, key, amount, ttl):
+        name = self.prefix + 'counter:' + key
+        try:
+            value = self.client.incrby(name, amount)
+            if self.client.ttl(name) < 0:
+                self.client.expire(name, max(int(ttl), 1))
+            return value
+        except redis.RedisError as e:
+            print(f"Error incrementing '{key}' in shared cache: {e}")
+            return None
+
+    def counter(self, key):
+        try:
+            value = self.client.get(self.prefix + 'counter:' + key)
+        except redis.RedisError as e:
+            print(f"Error reading '{key}' from shared cache: {e}")
+            return 0
+        return 0 if value is None else int(value)
+
+def create_backend(url):
+    if not url:
+        return None
+    scheme = urlsplit(url).scheme
+    if scheme == 'memory':
+        return MemoryCacheBackend()
+    if scheme == 'sqlite':
+        return SQLiteCacheBackend(url[len('sqlite://'):])
+    if scheme in ('redis', 'rediss', 'unix'):
+        return RedisCacheBackend(url)
+    raise ValueError(f"Unsupported shared cache URL: {url}")
@@ -0,0 +1,66 @@
+import json
+import os
+import sqlite3
+import threading
+from config import Config
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS history ("
+                         "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                         "stored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+                         "PRIMARY KEY (namespace, key))")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, namespace, key):
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT value FROM history WHERE namespace = ? AND key = ?",
+                    (namespace, str(key))).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading '{namespace}/{key}' from history store: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, namespace, keys):
+        keys = [str(key) for key in keys]
+        found = {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT key, value FROM history WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                        (namespace, *chunk)).fetchall()
+                    found.update((key, json.loads(value)) for key, value in rows)
+        except sqlite3.Error as e:
+            print(f"Error reading '{namespace}' entries from history store: {e}")
+        return found
+
+    def put(self, namespace, key, value):
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("INSERT OR REPLACE INTO history (namespace, key, value) VALUES (?, ?, ?)",
+                             (namespace, str(key), json.dumps(value)))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing '{namespace}/{key}' to history store: {e}")
+
+history_store = HistoryStore(Config.HISTORY_DB_PATH)
@@ -0,0 +1,116 @@
+import threading
+import time
+import requests
+from config import Config
+from .cache import fetch_json
+from .fanout import gather
+
+OPENWEATHER_URL = f"{Config.OPENWEATHER_API_BASE}/weather"
+
+# MLB venue id -> (name, latitude, longitude)
+VENUES = {
+    1: ("Angel Stadium", 33.8003, -117.8827),
+    2: ("Oriole Park at Camden Yards", 39.2838, -76.6217),
+    3: ("Fenway Park", 42.3467, -71.0972),
+    4: ("Rate Field", 41.8300, -87.6339),
+    5: ("Progressive Field", 41.4962, -81.6852),
+    7: ("Kauffman Stadium", 39.0517, -94.4803),
+    10: ("Oakland Coliseum", 37.7516, -122.2005),
+    12: ("Tropicana Field", 27.7683, -82.6534),
+    14: ("Rogers Centre", 43.6414, -79.3894),
+    15: ("Chase Field", 33.4455, -112.0667),
+    17: ("Wrigley Field", 41.9484, -87.6553),
+    19: ("Coors Field", 39.7559, -104.9942),
+    22: ("Dodger Stadium", 34.0739, -118.2400),
+    31: ("PNC Park", 40.4469, -80.0057),
+    32: ("American Family Field", 43.0280, -87.9712),
+    680: ("T-Mobile Park", 47.5914, -122.3325),
+    2392: ("Daikin Park", 29.7573, -95.3555),
+    2394: ("Comerica Park", 42.3390, -83.0485),
+    2395: ("Oracle Park", 37.7786, -122.3893),
+    2523: ("George M. Steinbrenner Field", 27.9803, -82.5067),
+    2529: ("Sutter Health Park", 38.5804, -121.5136),
+    2602: ("Great American Ball Park", 39.0979, -84.5066),
+    2680: ("Petco Park", 32.7073, -117.1566),
+    2681: ("Citizens Bank Park", 39.9061, -75.1665),
+    2889: ("Busch Stadium", 38.6226, -90.1928),
+    3289: ("Citi Field", 40.7571, -73.8458),
+    3309: ("Nationals Park", 38.8730, -77.0074),
+    3312: ("Target Field", 44.9817, -93.2776),
+    3313: ("Yankee Stadium", 40.8296, -73.9262),
+    4169: ("loanDepot park", 25.7781, -80.2197),
+    4705: ("Truist Park", 33.8907, -84.4677),
+    5325: ("Globe Life Field", 32.7473, -97.0847),
+}
+
+def process_weather(data):
+    weather_info = data.get('weather', [{}])[0]
+    main_info = data.get('main', {})
+    return {
+        "temperature": round(main_info.get('temp')),
+        "description": weather_info.get('main'),
+        "icon": weather_info.get('icon')
+    }
+
+class VenueWeather:
+    def __init__(self, venues):
+        self.venues = venues
+        self._weather = {}
+        self.refreshed_at = None
+        self._refreshing = threading.Lock()
+
+    def knows(self, venue_id):
+        return venue_id in self.venues
+
+    def get(self, venue_id):
+        self.refresh_in_background()
+        weather = self._weather.get(venue_id)
+        if weather is None and venue_id in self.venues and Config.OPENWEATHER_API_KEY:
+            # Until this worker's first refresh lands, read the venue on its own through the
+            # cache, which another worker's refresh has usually filled already.
+            try:
+                weather = self._weather[venue_id] = self._fetch(venue_id)
+            except requests.exceptions.RequestException as e:
+                print(f"Could not fetch weather for venue {venue_id}: {e}")
+        return weather
+
+    def is_due(self):
+        return (self.refreshed_at is None or
+                time.monotonic() - self.refreshed_at >= Config.VENUE_WEATHER_REFRESH_SECONDS)
+
+    def refresh_in_background(self):
+        if Config.OPENWEATHER_API_KEY and self.is_due() and not self._refreshing.locked():
+            threading.Thread(target=self.refresh_if_due, name='venue-weather', daemon=True).start()
+
+    def refresh_if_due(self):
+        if not Config.OPENWEATHER_API_KEY or not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            if self.is_due():
+                self.refresh_all()
+        finally:
+            self._refreshing.release()
+
+    def refresh_all(self):
+        # OpenWeather's bulk "group" endpoint only takes city ids, so every venue is
+        # fetched by coordinates in one concurrent pass instead.
+        venue_ids = list(self.venues)
+        results = gather(*[
+            (lambda venue_id: lambda: self._fetch(venue_id))(venue_id) for venue_id in venue_ids
+        ], return_exceptions=True)
+        weather = dict(self._weather)
+        for venue_id, result in zip(venue_ids, results):
+            if isinstance(result, Exception):
+                print(f"Could not fetch weather for venue {venue_id}: {result}")
+            else:
+                weather[venue_id] = result
+        self._weather = weather
+        self.refreshed_at = time.monotonic()
+
+    def _fetch(self, venue_id):
+        _, lat, lon = self.venues[venue_id]
+        params = {'lat': lat, 'lon': lon, 'appid': Config.OPENWEATHER_API_KEY, 'units': 'metric'}
+        # Cached for a refresh interval, so whichever worker refreshes first fills the shared tier for the rest.
+        return process_weather(fetch_json(OPENWEATHER_URL, params=params, ttl=Config.VENUE_WEATHER_REFRESH_SECONDS))
+
+venue_weather = VenueWeather(VENUES)
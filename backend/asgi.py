@@ -0,0 +1,263 @@
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+from run import app as flask_app
+from config import Config
+from app import async_client
+from app.lifecycle import lifecycle
+from app.live import live_hub
+from app.async_services import (get_game_details_async, get_team_details_async,
+                                get_player_stats_async, get_player_details_async)
+from app.payload import shape_game_details
+from app.codec import dumps
+from app.metrics import begin_trace, end_trace, finish_request, served_stale
+from app.responses import STALE_WARNING, encoded_bodies, negotiate
+
+# Upstream-heavy routes are served natively on the event loop; every other
+# route (and every non-GET method) falls through to the Flask app unchanged.
+
+async def player_stats(args, player_id):
+    stats = await get_player_stats_async(player_id)
+    if 'error' in stats:
+        return (404 if "No statistical data" in stats['error'] else 500), stats
+    return 200, stats
+
+async def player_details(args, player_id):
+    details = await get_player_details_async(player_id)
+    return (404 if 'error' in details else 200), details
+
+async def team_details(args, team_id):
+    details = await get_team_details_async(team_id)
+    return (404 if 'error' in details else 200), details
+
+async def game_details(args, game_id):
+    details = await get_game_details_async(game_id)
+    if 'error' in details:
+        return 500, details
+    return 200, shape_game_details(
+        details,
+        fields=args.get('fields'),
+        active_only=args.get('active', '').lower() in ('1', 'true'),
+        compact=args.get('format') == 'compact'
+    )
+
+async def game_stream(scope, receive, send, game_id):
+    # Server-sent events straight off the event loop: the stream waits on an
+    # asyncio.Queue, so open viewers do not tie up WSGI threads.
+    subscription = live_hub.subscribe(game_id, loop=asyncio.get_running_loop())
+    cors = _cors_headers({name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']})
+    if subscription is None:
+        data = dumps({"error": "Too many live streams open on this server."})
+        await send({'type': 'http.response.start', 'status': 503, 'headers': [
+            (b'content-type', b'application/json'), (b'retry-after', b'5'),
+            (b'content-length', str(len(data)).encode())] + cors})
+        await send({'type': 'http.response.body', 'body': data})
+        return
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'), (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no')] + cors})
+        await send({'type': 'http.response.body', 'body': b"retry: 5000\n\n", 'more_body': True})
+        async for event, data in subscription.events():
+            if disconnected.is_set():
+                break
+            if event == 'heartbeat':
+                chunk = b": keep-alive\n\n"
+            else:
+                chunk = b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        watcher.cancel()
+        subscription.close()
+
+_wsgi_executor = ThreadPoolExecutor(max_workers=Config.ASGI_WSGI_THREADS, thread_name_prefix='wsgi')
+
+def _wsgi_environ(scope, body):
+    # PEP 3333 environ for an ASGI HTTP scope; paths are UTF-8 bytes carried in latin-1 strings.
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+class PooledWsgiToAsgi:
+    # Fallback routes run the Flask app on a pool of their own threads, so a slow
+    # WSGI request never holds up the others (or the event loop).
+    def __init__(self, wsgi_application):
+        self.wsgi_application = wsgi_application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(f"The WSGI fallback only serves HTTP, not '{scope['type']}'.")
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        loop = asyncio.get_running_loop()
+
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        await loop.run_in_executor(_wsgi_executor, self._run, _wsgi_environ(scope, bytes(body)),
+                                   send_from_thread)
+
+    def _run(self, environ, send_from_thread):
+        response_start = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            if exc_info and response_start.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_start.update(status=int(status.split(' ', 1)[0]), headers=[
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response_headers])
+
+        def send_start():
+            if not response_start.get('sent'):
+                response_start['sent'] = True
+                send_from_thread({'type': 'http.response.start', 'status': response_start['status'],
+                                  'headers': response_start['headers']})
+
+        result = self.wsgi_application(environ, start_response)
+        try:
+            # Chunks go out as the app yields them, so streamed responses stay streamed.
+            for chunk in result:
+                send_start()
+                if chunk:
+                    send_from_thread({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            send_start()
+            send_from_thread({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+NATIVE_ROUTES = Map([
+    Rule('/api/player/<int:player_id>/stats', endpoint=player_stats, methods=['GET']),
+    Rule('/api/player/<int:player_id>/details', endpoint=player_details, methods=['GET']),
+    Rule('/api/team/<int:team_id>/details', endpoint=team_details, methods=['GET']),
+    Rule('/api/game/<int:game_id>/details', endpoint=game_details, methods=['GET']),
+])
+
+STREAM_ROUTES = Map([
+    Rule('/api/game/<int:game_id>/stream', endpoint=game_stream, methods=['GET']),
+])
+
+def _cors_headers(request_headers):
+    origin = request_headers.get('origin')
+    if origin and origin in Config.CORS_ORIGINS:
+        return [(b'access-control-allow-origin', origin.encode()), (b'vary', b'Origin')]
+    return []
+
+class AsyncApp:
+    def __init__(self, wsgi_app):
+        self.fallback = PooledWsgiToAsgi(wsgi_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http':
+            return await self.fallback(scope, receive, send)
+        rule, values = self._match(STREAM_ROUTES, scope)
+        if rule is not None:
+            # Streams stay open for minutes, so they are kept out of the request latency metrics.
+            return await rule.endpoint(scope, receive, send, **values)
+        rule, values = self._match(NATIVE_ROUTES, scope)
+        if rule is None:
+            return await self.fallback(scope, receive, send)
+        trace, token = begin_trace()
+        try:
+            status, size = await self._handle(rule, values, scope, send)
+        finally:
+            end_trace(token)
+        finish_request(trace, scope['method'], scope['path'], rule.rule, status, size)
+
+    def _match(self, routes, scope):
+        try:
+            return routes.bind('', path_info=scope['path']).match(method=scope['method'], return_rule=True)
+        except HTTPException:
+            return None, None
+
+    async def _handle(self, rule, values, scope, send):
+        request_headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        query_string = scope.get('query_string', b'').decode('latin-1')
+        args = MultiDict(parse_qsl(query_string, keep_blank_values=True))
+        status, payload = await rule.endpoint(args, **values)
+        if status == 200:
+            # Serialising and compressing a large body is CPU work; keep it off the event loop.
+            body = await asyncio.to_thread(encoded_bodies.get, f"{scope['path']}?{query_string}", payload)
+            status, data, headers = negotiate(body, request_headers.get('if-none-match'),
+                                              request_headers.get('accept-encoding'))
+        else:
+            data, headers = dumps(payload), {'Content-Type': 'application/json'}
+        if served_stale():
+            headers['Warning'] = STALE_WARNING
+        headers = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+        headers.append((b'content-length', str(len(data)).encode()))
+        headers.extend(_cors_headers(request_headers))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': data})
+        return status, len(data)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await asyncio.to_thread(lifecycle.start)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_client.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+app = AsyncApp(flask_app)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run('asgi:app', host=Config.SERVER_HOST, port=Config.SERVER_PORT)
@@ -0,0 +1,67 @@
+import argparse
+import json
+import sys
+
+# Lower is better for latency and upstream calls, higher is better for throughput.
+METRICS = [
+    ('p50_ms', 'p50', False),
+    ('p95_ms', 'p95', False),
+    ('p99_ms', 'p99', False),
+    ('throughput_rps', 'rps', True),
+    ('upstream_calls_per_request', 'up/req', False),
+]
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def change(old, new):
+    if old == 0:
+        return 0.0 if new == 0 else float('inf')
+    return (new - old) / old
+
+def compare(baseline, candidate, threshold):
+    regressions = []
+    rows = []
+    for name, new in candidate['routes'].items():
+        old = baseline['routes'].get(name)
+        if old is None:
+            rows.append((name, 'new route'))
+            continue
+        cells = []
+        for key, label, higher_is_better in METRICS:
+            delta = change(old[key], new[key])
+            worse = -delta if higher_is_better else delta
+            # Sub-millisecond latencies are too noisy for a relative threshold alone.
+            if worse > threshold and not (key.endswith('_ms') and new[key] - old[key] < 1):
+                regressions.append((name, label, old[key], new[key]))
+                marker = '!'
+            else:
+                marker = ' '
+            cells.append(f"{label} {old[key]:.2f}->{new[key]:.2f} ({delta:+.0%}){marker}")
+        rows.append((name, '  '.join(cells)))
+    return rows, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative change that counts as a regression (default 0.10).")
+    args = parser.parse_args(argv)
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    for key in ('mode', 'cold', 'concurrency', 'latency_ms'):
+        if baseline['meta'].get(key) != candidate['meta'].get(key):
+            print(f"Warning: runs differ in {key}: {baseline['meta'].get(key)} vs {candidate['meta'].get(key)}")
+    rows, regressions = compare(baseline, candidate, args.threshold)
+    for name, cells in rows:
+        print(f"{name:<22}{cells}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name, label, old, new in regressions:
+            print(f"  {name} {label}: {old} -> {new}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from .fixtures import start_fixture_servers
+from .synthetic import DATE, SEASON, TEAMS, PLAYER_IDS, GAME_LOG_CHUNK_SIZE
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+BENCH_PLAYER_IDS = [592450] + PLAYER_IDS[:39]
+# Synthetic rosters fill slots 0-12 with position players, so these all have hitting game logs.
+BENCH_HITTER_IDS = [592450] + [player_id for player_id in PLAYER_IDS if player_id % 100 < 13][:39]
+GAME_IDS = [745000 + i for i in range(15)]
+TEAM_IDS = sorted(TEAMS)
+BULK_IDS = ','.join(str(player_id) for player_id in PLAYER_IDS[:50])
+
+# name -> path template; {player}, {hitter}, {game} and {team} rotate through the pools above.
+ROUTES = {
+    'schedule': f"/api/schedule/{DATE}",
+    'search': "/api/search?q=judge",
+    'search_suggest': "/api/search/suggest?q=ju",
+    'player_stats': "/api/player/{player}/stats",
+    'player_details': "/api/player/{player}/details",
+    'players_stats': f"/api/players/stats?ids={BULK_IDS}",
+    'players_details': f"/api/players/details?ids={BULK_IDS}",
+    'leaders': f"/api/leaders?season={SEASON}",
+    'leaderboard': f"/api/leaderboard?season={SEASON}&stat=ops&league=AL&limit=25",
+    'gamelog_rolling': f"/api/player/{{hitter}}/gamelog/rolling?season={SEASON}&windows=7,15,30",
+    'gamelog_splits': f"/api/player/{{hitter}}/gamelog/splits?season={SEASON}",
+    'gamelog_leaders': f"/api/gamelog/leaders?season={SEASON}&stat=ops&days=30&limit=25",
+    'standings': f"/api/standings?season={SEASON}",
+    'standings_wildcard': f"/api/standings?season={SEASON}&view=wildcard",
+    'team_details': "/api/team/{team}/details",
+    'game_details': "/api/game/{game}/details",
+    'game_details_compact': "/api/game/{game}/details?format=compact&active=1",
+    'news': "/api/news?page=1",
+    'highlights': "/api/highlights?q=judge",
+}
+
+BENCH_ENV = {
+    'NEWSAPI_KEY': 'bench', 'YOUTUBE_API_KEY': 'bench', 'OPENWEATHER_API_KEY': 'bench',
+    'PREFETCH_ENABLED': 'false', 'SHARED_CACHE_URL': 'memory://', 'SLOW_REQUEST_MS': '0',
+    'BULK_CHUNK_SIZE': str(GAME_LOG_CHUNK_SIZE),
+    'QUOTA_YOUTUBE_DAILY_UNITS': '100000000', 'QUOTA_YOUTUBE_PER_MINUTE': '1000000',
+    'QUOTA_NEWSAPI_DAILY_UNITS': '100000000', 'QUOTA_NEWSAPI_PER_MINUTE': '1000000',
+    'QUOTA_OPENWEATHER_DAILY_UNITS': '100000000', 'QUOTA_OPENWEATHER_PER_MINUTE': '1000000',
+}
+
+def route_path(template, index):
+    return template.format(player=BENCH_PLAYER_IDS[index % len(BENCH_PLAYER_IDS)],
+                           hitter=BENCH_HITTER_IDS[index % len(BENCH_HITTER_IDS)], game=GAME_IDS[index % len(GAME_IDS)],
+                           team=TEAM_IDS[index % len(TEAM_IDS)])
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+class WsgiTarget:
+    def __init__(self, cold):
+        import run
+        from app.cache import forced_refresh
+        self.client = run.app.test_client()
+        self.forced_refresh = forced_refresh
+        self.cold = cold
+
+    def request(self, path):
+        started = time.perf_counter()
+        if self.cold:
+            with self.forced_refresh():
+                response = self.client.get(path)
+        else:
+            response = self.client.get(path)
+        status = response.status_code
+        response.close()
+        return status, time.perf_counter() - started
+
+    def run_batch(self, paths, concurrency):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(self.request, paths))
+
+class AsgiTarget:
+    def __init__(self, cold):
+        import httpx
+        import asgi
+        from app.cache import forced_refresh
+        self.httpx = httpx
+        self.app = asgi.app
+        self.forced_refresh = forced_refresh
+        self.cold = cold
+        self.loop = asyncio.new_event_loop()
+
+    async def _request(self, client, semaphore, path):
+        async with semaphore:
+            started = time.perf_counter()
+            if self.cold:
+                with self.forced_refresh():
+                    response = await client.get(path)
+            else:
+                response = await client.get(path)
+            return response.status_code, time.perf_counter() - started
+
+    async def _batch(self, paths, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+        transport = self.httpx.ASGITransport(app=self.app)
+        async with self.httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            return await asyncio.gather(*[self._request(client, semaphore, path) for path in paths])
+
+    def request(self, path):
+        return self.run_batch([path], 1)[0]
+
+    def run_batch(self, paths, concurrency):
+        return self.loop.run_until_complete(self._batch(paths, concurrency))
+
+def upstream_calls(servers):
+    return sum(server.calls for server in servers.values())
+
+def measure_memory(target, template, samples):
+    # Measured sequentially in a separate pass because tracemalloc slows every allocation.
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    peaks = []
+    for index in range(samples):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        target.request(route_path(template, index))
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'peak_bytes_per_request': int(sum(peaks) / len(peaks)), 'max_peak_bytes': max(peaks),
+            'retained_bytes_per_request': int((after - before) / samples)}
+
+def bench_route(target, servers, name, template, args):
+    if not args.cold:
+        target.request(route_path(template, 0))
+    paths = [route_path(template, index) for index in range(args.requests)]
+    calls_before = upstream_calls(servers)
+    started = time.perf_counter()
+    results = target.run_batch(paths, args.concurrency)
+    elapsed = time.perf_counter() - started
+    calls = upstream_calls(servers) - calls_before
+    latencies = sorted(seconds * 1000 for _, seconds in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    result = {
+        'requests': len(results),
+        'errors': sum(count for status, count in statuses.items() if int(status) >= 500),
+        'status_codes': statuses,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'throughput_rps': round(len(results) / elapsed, 1),
+        'upstream_calls_per_request': round(calls / len(results), 3),
+    }
+    if args.memory_samples:
+        result['memory'] = measure_memory(target, template, args.memory_samples)
+    return result
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def wait_for_reference_index(timeout=30):
+    from app.reference_index import reference_index
+    deadline = time.monotonic() + timeout
+    while not reference_index.ready and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return reference_index.ready
+
+def print_table(results):
+    print(f"{'route':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>10}{'up/req':>8}{'err':>5}")
+    for name, result in results.items():
+        print(f"{name:<22}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+              f"{result['throughput_rps']:>10.1f}{result['upstream_calls_per_request']:>8.2f}{result['errors']:>5}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every /api route against recorded upstream fixtures.")
+    parser.add_argument('--routes', default='all', help="Comma-separated route names, or 'all'.")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per route.")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=50, help="Injected upstream latency.")
+    parser.add_argument('--jitter', type=float, default=0.2, help="Latency jitter as a fraction of --latency-ms.")
+    parser.add_argument('--cold', action='store_true', help="Bypass caches on every request.")
+    parser.add_argument('--asgi', action='store_true', help="Drive the ASGI app instead of the Flask app.")
+    parser.add_argument('--memory-samples', type=int, default=20, help="Sequential requests traced for memory; 0 skips.")
+    parser.add_argument('--synthetic', action='store_true', help="Ignore recorded fixtures and use synthetic data.")
+    parser.add_argument('--record', action='store_true',
+                        help="Proxy fixture misses to the real providers and save them under bench/fixtures/.")
+    parser.add_argument('--output', help="Results file (default: bench/results/<timestamp>.json).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = list(ROUTES) if args.routes == 'all' else [name.strip() for name in args.routes.split(',')]
+    unknown = [name for name in names if name not in ROUTES]
+    if unknown:
+        sys.exit(f"Unknown routes: {', '.join(unknown)}")
+    if args.record:
+        args.requests, args.concurrency, args.memory_samples, args.latency_ms = len(BENCH_PLAYER_IDS), 1, 0, 0
+
+    # The app reads its configuration at import time, so the environment is prepared first.
+    servers = start_fixture_servers(args.latency_ms, args.jitter, record=args.record, synthetic=args.synthetic)
+    os.environ.setdefault('DATA_DIR', tempfile.mkdtemp(prefix='mlb-bench-'))
+    for name, value in BENCH_ENV.items():
+        if not (args.record and name.endswith('_KEY')):
+            os.environ.setdefault(name, value)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    target = AsgiTarget(args.cold) if args.asgi else WsgiTarget(args.cold)
+    # A server starts the background subsystems once it accepts connections; the driver does so up front.
+    from app.lifecycle import lifecycle
+    lifecycle.start()
+    if not wait_for_reference_index():
+        print("Warning: reference index did not load; search results come from upstream.")
+    if any(name.startswith('gamelog_') for name in names):
+        # The game-log routes read the local columnar store, which is filled by a scheduled ingest.
+        from app.game_logs import game_log_store
+        ingested = game_log_store.ingest(season=SEASON)
+        if 'error' in ingested:
+            print(f"Warning: game-log ingest failed: {ingested['error']}")
+
+    results = {}
+    for name in names:
+        results[name] = bench_route(target, servers, name, ROUTES[name], args)
+    print_table(results)
+
+    misses = sorted(miss for server in servers.values() for miss in server.misses)
+    if misses:
+        print(f"{len(misses)} upstream requests had no fixture, e.g. {misses[:3]}")
+    if args.record:
+        for server in servers.values():
+            server.store.save()
+        print("Recorded fixtures saved to bench/fixtures/.")
+        return
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'), 'revision': git_revision(),
+            'python': platform.python_version(), 'mode': 'asgi' if args.asgi else 'wsgi',
+            'cold': args.cold, 'requests': args.requests, 'concurrency': args.concurrency,
+            'latency_ms': args.latency_ms, 'jitter': args.jitter, 'fixture_misses': len(misses),
+        },
+        'routes': results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{report['meta']['mode']}{'-cold' if args.cold else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Results written to {output}")
+    for server in servers.values():
+        server.stop()
+
+if __name__ == '__main__':
+    main()
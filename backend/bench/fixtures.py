@@ -0,0 +1,144 @@
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import requests
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# provider -> (env var(s) pointing the app at it, real upstream origin, base path)
+PROVIDERS = {
+    'mlb': ({'MLB_API_BASE': '/api/v1', 'MLB_LIVE_API_BASE': '/api/v1.1'}, 'https://statsapi.mlb.com'),
+    'news': ({'NEWSAPI_BASE': '/v2'}, 'https://newsapi.org'),
+    'youtube': ({'YOUTUBE_API_BASE': '/youtube/v3'}, 'https://www.googleapis.com'),
+    'weather': ({'OPENWEATHER_API_BASE': '/data/2.5'}, 'https://api.openweathermap.org'),
+}
+
+SECRET_PARAMS = frozenset(['apikey', 'appid', 'key'])
+
+def fixture_key(path, query):
+    pairs = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    return f"{path}?{urlencode(pairs)}" if pairs else path
+
+class FixtureStore:
+    # Responses are matched on path plus query (minus credentials), then on the bare path.
+    def __init__(self, provider, fixtures=None):
+        self.provider = provider
+        self.fixtures = fixtures or {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return os.path.join(FIXTURE_DIR, f"{self.provider}.json")
+
+    def load(self):
+        with open(self.path) as f:
+            self.fixtures = json.load(f)
+        return self
+
+    def save(self):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        with self._lock:
+            data = dict(sorted(self.fixtures.items()))
+        with open(self.path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    def lookup(self, path, query):
+        return self.fixtures.get(fixture_key(path, query)) or self.fixtures.get(path)
+
+    def put(self, path, query, status, body):
+        with self._lock:
+            self.fixtures[fixture_key(path, query)] = {'status': status, 'body': body}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        server.delay()
+        fixture = server.store.lookup(parts.path, parts.query)
+        if fixture is None and server.upstream is not None:
+            fixture = server.record(parts.path, parts.query)
+        with server.counter_lock:
+            server.calls += 1
+            if fixture is None:
+                server.misses.add(fixture_key(parts.path, parts.query))
+        if fixture is None:
+            status, body = 404, {'message': 'No fixture recorded for this request.'}
+        else:
+            status, body = fixture['status'], fixture['body']
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, store, latency_ms=0, jitter=0.0, upstream=None):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.upstream = upstream
+        self.calls = 0
+        self.misses = set()
+        self.counter_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def origin(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def delay(self):
+        if self.latency_ms:
+            spread = self.latency_ms * self.jitter
+            time.sleep(max(random.uniform(self.latency_ms - spread, self.latency_ms + spread), 0) / 1000)
+
+    def record(self, path, query):
+        # Record mode: proxy the miss to the real provider and keep what it returned.
+        url = f"{self.upstream}{path}" + (f"?{query}" if query else '')
+        try:
+            response = requests.get(url, timeout=(3.05, 15))
+            body = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Could not record {path}: {e}")
+            return None
+        self.store.put(path, query, response.status_code, body)
+        return self.store.lookup(path, query)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name=f"fixtures-{self.store.provider}",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def start_fixture_servers(latency_ms=0, jitter=0.0, record=False, synthetic=False):
+    from .synthetic import build_fixtures
+    servers = {}
+    generated = None
+    for provider, (env_paths, upstream) in PROVIDERS.items():
+        store = FixtureStore(provider)
+        if os.path.exists(store.path) and (record or not synthetic):
+            store.load()
+        elif not record:
+            generated = generated or build_fixtures()
+            store.fixtures = generated[provider]
+        server = FixtureServer(store, latency_ms, jitter, upstream if record else None).start()
+        servers[provider] = server
+        for env_name, base_path in env_paths.items():
+            os.environ[env_name] = server.origin + base_path
+    return servers
@@ -0,0 +1,64 @@
+import random
+import sys
+from app.keywords import (MLB_TEAM_KEYWORDS, MLB_SUPERSTAR_KEYWORDS, MLB_JARGON_KEYWORDS,
+                          MLB_GENERAL_KEYWORDS, COMPETITOR_LEAGUE_KEYWORDS)
+from app.news import score_article
+from .synthetic import _articles
+
+# Checks the news relevance matcher against the substring scorer it replaced.
+# Wherever the old scorer was right the two must agree; the boundary cases are
+# substring false positives the matcher is meant to reject.
+
+AGREES_WITH_SUBSTRING = [
+    ("Pitchers and catchers report", ""),
+    ("Hitters struggle as strikeouts pile up", "The bullpen went nine innings."),
+    ("Two home runs in the ninth inning", ""),
+    ("Umpires review double plays", "Infielders and outfielders collide."),
+    ("Dodgers beat Giants", "Ohtani homered twice."),
+    ("Yankees ace Cole strikes out 12", ""),
+    ("MLB announces All-Star rosters", ""),
+    ("Red Sox trade for a closer", "The deal came after the NFL draft."),
+    ("NFL playoffs preview", "Quarterbacks and pitchers compared."),
+    ("Cy Young race heats up", "Skenes and Skubal lead the way."),
+    ("World Series: Mets vs. Blue Jays", ""),
+]
+
+BOUNDARY_CASES = [
+    ("Coleman shreds defense in NBA opener", "", -3),
+    ("Arrays of numbers in the spelling bee", "", 0),
+    ("Championships and MVPs", "", 1),
+]
+
+def legacy_score(title, description):
+    title = (title or '').lower()
+    text = title + " " + (description or '').lower()
+    score = 0
+    if any(keyword in text for keyword in MLB_TEAM_KEYWORDS): score += 4
+    if 'mlb' in text or 'major league baseball' in text: score += 3
+    if any(keyword in text for keyword in MLB_SUPERSTAR_KEYWORDS): score += 3
+    if any(keyword in text for keyword in MLB_JARGON_KEYWORDS): score += 2
+    if any(keyword in text for keyword in MLB_GENERAL_KEYWORDS): score += 1
+    if any(keyword in title for keyword in COMPETITOR_LEAGUE_KEYWORDS): score -= 3
+    return score
+
+def main():
+    cases = AGREES_WITH_SUBSTRING + [(a['title'], a['description']) for a in _articles(random.Random(0))['articles']]
+    failures = []
+    for title, description in cases:
+        expected, actual = legacy_score(title, description), score_article(title, description)
+        if expected != actual:
+            failures.append((title, expected, actual))
+    for title, description, expected in BOUNDARY_CASES:
+        actual = score_article(title, description)
+        if expected != actual:
+            failures.append((title, expected, actual))
+    for title, expected, actual in failures:
+        print(f"  {title!r}: expected {expected}, got {actual}")
+    checked = len(cases) + len(BOUNDARY_CASES)
+    if failures:
+        print(f"{len(failures)} of {checked} headlines scored differently.")
+        sys.exit(1)
+    print(f"All {checked} headlines scored as expected.")
+
+if __name__ == '__main__':
+    main()
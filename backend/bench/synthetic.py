@@ -0,0 +1,299 @@
+import random
+from datetime import date, timedelta
+from .fixtures import fixture_key
+
+# Deterministic stand-ins shaped like the real provider responses, used when no
+# recorded fixtures exist under bench/fixtures/.
+
+SEASON = 2024
+DATE = '2024-07-04'
+SEASON_DAYS = [date(SEASON, 3, 28) + timedelta(days=offset) for offset in range(186)]
+# Game-log ingestion asks for players in chunks of this size (BULK_CHUNK_SIZE).
+GAME_LOG_CHUNK_SIZE = 50
+
+DIVISIONS = {
+    200: 'American League West', 201: 'American League East', 202: 'American League Central',
+    203: 'National League West', 204: 'National League East', 205: 'National League Central',
+}
+
+# team id -> (name, teamName, locationName, venue id, division id)
+TEAMS = {
+    108: ('Los Angeles Angels', 'Angels', 'Anaheim', 1, 200),
+    110: ('Baltimore Orioles', 'Orioles', 'Baltimore', 2, 201),
+    111: ('Boston Red Sox', 'Red Sox', 'Boston', 3, 201),
+    145: ('Chicago White Sox', 'White Sox', 'Chicago', 4, 202),
+    114: ('Cleveland Guardians', 'Guardians', 'Cleveland', 5, 202),
+    118: ('Kansas City Royals', 'Royals', 'Kansas City', 7, 202),
+    133: ('Athletics', 'Athletics', 'Sacramento', 2529, 200),
+    139: ('Tampa Bay Rays', 'Rays', 'Tampa', 2523, 201),
+    141: ('Toronto Blue Jays', 'Blue Jays', 'Toronto', 14, 201),
+    109: ('Arizona Diamondbacks', 'D-backs', 'Phoenix', 15, 203),
+    112: ('Chicago Cubs', 'Cubs', 'Chicago', 17, 205),
+    115: ('Colorado Rockies', 'Rockies', 'Denver', 19, 203),
+    119: ('Los Angeles Dodgers', 'Dodgers', 'Los Angeles', 22, 203),
+    134: ('Pittsburgh Pirates', 'Pirates', 'Pittsburgh', 31, 205),
+    158: ('Milwaukee Brewers', 'Brewers', 'Milwaukee', 32, 205),
+    136: ('Seattle Mariners', 'Mariners', 'Seattle', 680, 200),
+    117: ('Houston Astros', 'Astros', 'Houston', 2392, 200),
+    116: ('Detroit Tigers', 'Tigers', 'Detroit', 2394, 202),
+    137: ('San Francisco Giants', 'Giants', 'San Francisco', 2395, 203),
+    113: ('Cincinnati Reds', 'Reds', 'Cincinnati', 2602, 205),
+    135: ('San Diego Padres', 'Padres', 'San Diego', 2680, 203),
+    143: ('Philadelphia Phillies', 'Phillies', 'Philadelphia', 2681, 204),
+    138: ('St. Louis Cardinals', 'Cardinals', 'St. Louis', 2889, 205),
+    121: ('New York Mets', 'Mets', 'Flushing', 3289, 204),
+    120: ('Washington Nationals', 'Nationals', 'Washington', 3309, 204),
+    142: ('Minnesota Twins', 'Twins', 'Minneapolis', 3312, 202),
+    147: ('New York Yankees', 'Yankees', 'Bronx', 3313, 201),
+    146: ('Miami Marlins', 'Marlins', 'Miami', 4169, 204),
+    144: ('Atlanta Braves', 'Braves', 'Atlanta', 4705, 204),
+    140: ('Texas Rangers', 'Rangers', 'Arlington', 5325, 200),
+}
+
+FIRST_NAMES = ['Aaron', 'Juan', 'Shohei', 'Mookie', 'Freddie', 'Jose', 'Bobby', 'Gunnar', 'Corey', 'Kyle',
+               'Marcus', 'Rafael', 'Yordan', 'Julio', 'Pete', 'Francisco', 'Adley', 'Spencer', 'Zack', 'Logan']
+LAST_NAMES = ['Ramirez', 'Soto', 'Rodriguez', 'Alvarez', 'Martinez', 'Witt', 'Henderson', 'Seager', 'Tucker',
+              'Semien', 'Devers', 'Lindor', 'Alonso', 'Rutschman', 'Strider', 'Wheeler', 'Webb', 'Gallen',
+              'Burnes', 'Cole', 'Skenes', 'Harper', 'Turner', 'Betts', 'Freeman', 'Bichette', 'Riley']
+POSITIONS = ['C', '1B', '2B', '3B', 'SS', 'LF', 'CF', 'RF', 'DH', 'P']
+
+HITTING_CATEGORIES = ['homeRuns', 'battingAverage', 'runsBattedIn', 'onBasePlusSlugging', 'stolenBases', 'hits']
+PITCHING_CATEGORIES = ['earnedRunAverage', 'wins', 'strikeouts', 'walksAndHitsPerInningPitched', 'saves',
+                       'inningsPitched']
+
+def player_id(team_index, slot):
+    if sorted(TEAMS)[team_index] == 147 and slot == 7:
+        return 592450
+    return 600000 + team_index * 100 + slot
+
+PLAYER_IDS = [player_id(team_index, slot) for team_index in range(len(TEAMS)) for slot in range(26)]
+
+def _team(team_id):
+    name, team_name, location, venue_id, division_id = TEAMS[team_id]
+    league_id = 103 if division_id in (200, 201, 202) else 104
+    return {
+        'id': team_id, 'name': name, 'teamName': team_name, 'locationName': location,
+        'clubName': team_name, 'franchiseName': location, 'abbreviation': team_name[:3].upper(),
+        'firstYearOfPlay': '1901', 'venue': {'id': venue_id, 'name': f"{team_name} Park"},
+        'league': {'id': league_id, 'name': 'American League' if league_id == 103 else 'National League'},
+        'division': {'id': division_id, 'name': DIVISIONS[division_id]},
+    }
+
+def _players(rng):
+    players = {}
+    for index, team_id in enumerate(sorted(TEAMS)):
+        roster = []
+        for slot in range(26):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            position = 'P' if slot >= 13 else POSITIONS[slot % 9]
+            if player_id(index, slot) == 592450:
+                name, position = 'Aaron Judge', 'RF'
+            roster.append({
+                'id': player_id(index, slot), 'fullName': name, 'currentAge': rng.randint(21, 38),
+                'primaryNumber': str(rng.randint(1, 99)), 'birthDate': f"{rng.randint(1986, 2003)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+                'primaryPosition': {'abbreviation': position, 'code': position},
+                'currentTeam': {'id': team_id, 'name': TEAMS[team_id][0]}, 'active': True,
+            })
+        players[team_id] = roster
+    return players
+
+def _season_stats(rng, person):
+    pitcher = person['primaryPosition']['abbreviation'] == 'P'
+    splits = []
+    for season in range(SEASON - 5, SEASON + 1):
+        if pitcher:
+            stat = {'era': f"{rng.uniform(2, 6):.2f}", 'wins': rng.randint(0, 18), 'strikeOuts': rng.randint(20, 250),
+                    'inningsPitched': f"{rng.randint(20, 200)}.{rng.randint(0, 2)}", 'whip': f"{rng.uniform(0.9, 1.6):.2f}"}
+        else:
+            at_bats = rng.randint(100, 650)
+            hits = int(at_bats * rng.uniform(0.2, 0.32))
+            stat = {'atBats': at_bats, 'hits': hits, 'homeRuns': rng.randint(0, 55), 'rbi': rng.randint(5, 140),
+                    'avg': f".{hits * 1000 // at_bats:03d}", 'ops': f"{rng.uniform(0.55, 1.1):.3f}",
+                    'plateAppearances': at_bats + rng.randint(20, 90), 'stolenBases': rng.randint(0, 40)}
+        splits.append({'season': str(season), 'stat': stat, 'team': person['currentTeam']})
+    return [{'group': {'displayName': 'pitching' if pitcher else 'hitting'}, 'type': {'displayName': 'yearByYear'},
+             'splits': splits}]
+
+def _season_split(rng, person, group):
+    team = person['currentTeam']
+    league_id = 103 if TEAMS[team['id']][4] in (200, 201, 202) else 104
+    if group == 'pitching':
+        outs = rng.randint(10, 600)
+        earned_runs = int(outs / 27 * rng.uniform(2, 6))
+        stat = {'gamesPlayed': rng.randint(5, 60), 'inningsPitched': f"{outs // 3}.{outs % 3}",
+                'earnedRuns': earned_runs, 'era': f"{earned_runs * 27 / outs:.2f}", 'wins': rng.randint(0, 18),
+                'strikeOuts': rng.randint(5, 250), 'saves': rng.randint(0, 40), 'whip': f"{rng.uniform(0.9, 1.6):.2f}"}
+    else:
+        at_bats = rng.randint(20, 600)
+        hits = int(at_bats * rng.uniform(0.18, 0.33))
+        stat = {'gamesPlayed': rng.randint(10, 88), 'plateAppearances': at_bats + rng.randint(2, 70),
+                'atBats': at_bats, 'hits': hits, 'homeRuns': rng.randint(0, 35), 'rbi': rng.randint(0, 90),
+                'stolenBases': rng.randint(0, 30), 'avg': f".{hits * 1000 // at_bats:03d}",
+                'ops': f"{rng.uniform(0.5, 1.1):.3f}"}
+    return {'season': str(SEASON), 'stat': stat, 'team': {'id': team['id'], 'name': team['name']},
+            'league': {'id': league_id}, 'player': {'id': person['id'], 'fullName': person['fullName']}}
+
+def _box_player(rng, person):
+    batting = {'atBats': rng.randint(0, 5), 'hits': rng.randint(0, 3), 'runs': rng.randint(0, 2),
+               'homeRuns': rng.randint(0, 1), 'rbi': rng.randint(0, 3), 'plateAppearances': rng.randint(0, 5)}
+    return {'person': {'id': person['id'], 'fullName': person['fullName']},
+            'jerseyNumber': person['primaryNumber'], 'position': person['primaryPosition'],
+            'stats': {'batting': batting, 'pitching': {}}}
+
+def _game_feed(rng, game_pk, home_id, away_id, players, state):
+    innings = [{'num': n, 'home': {'runs': rng.randint(0, 2)}, 'away': {'runs': rng.randint(0, 2)}} for n in range(1, 10)]
+    teams = {}
+    for side, team_id in (('home', home_id), ('away', away_id)):
+        teams[side] = {'team': {'id': team_id, 'name': TEAMS[team_id][0]},
+                       'players': {f"ID{p['id']}": _box_player(rng, p) for p in players[team_id]}}
+    detailed = {'Final': 'Final', 'Live': 'In Progress', 'Preview': 'Scheduled'}[state]
+    return {'gamePk': game_pk,
+            'gameData': {'status': {'abstractGameState': state, 'detailedState': detailed},
+                         'venue': {'id': TEAMS[home_id][3], 'name': f"{TEAMS[home_id][1]} Park"},
+                         'datetime': {'dateTime': f"{DATE}T23:05:00Z"}},
+            'metaData': {'timeStamp': '20240704_230500'},
+            'liveData': {'linescore': {'currentInning': 9, 'innings': innings,
+                                       'teams': {'home': {'runs': sum(i['home']['runs'] for i in innings)},
+                                                 'away': {'runs': sum(i['away']['runs'] for i in innings)}}},
+                         'boxscore': {'teams': teams}}}
+
+def _game_log(rng, person):
+    pitcher = person['primaryPosition']['abbreviation'] == 'P'
+    splits = []
+    if pitcher:
+        starter = rng.random() < 0.4
+        for day in SEASON_DAYS[rng.randrange(5)::5 if starter else 3]:
+            outs = rng.randint(9, 21) if starter else rng.randint(1, 6)
+            hits, walks = rng.randint(0, outs // 3 + 2), rng.randint(0, 3)
+            earned_runs = rng.randint(0, min(hits + walks, 6))
+            splits.append({'date': day.isoformat(), 'isHome': rng.random() < 0.5, 'stat': {
+                'inningsPitched': f"{outs // 3}.{outs % 3}", 'battersFaced': outs + hits + walks, 'hits': hits,
+                'runs': earned_runs + rng.randint(0, 1), 'earnedRuns': earned_runs, 'homeRuns': rng.randint(0, 2),
+                'baseOnBalls': walks, 'strikeOuts': rng.randint(0, outs // 2 + 1), 'hitByPitch': rng.randint(0, 1),
+                'numberOfPitches': outs * 5 + rng.randint(0, 20), 'gamesStarted': int(starter),
+                'wins': int(starter and rng.random() < 0.35), 'losses': int(starter and rng.random() < 0.3),
+                'saves': int(not starter and rng.random() < 0.1), 'holds': int(not starter and rng.random() < 0.15)}})
+    else:
+        for day in SEASON_DAYS:
+            if rng.random() < 0.15:
+                continue
+            at_bats = rng.randint(2, 5)
+            hits = sum(1 for _ in range(at_bats) if rng.random() < 0.25)
+            doubles, home_runs = rng.randint(0, min(hits, 1)), int(hits > 0 and rng.random() < 0.15)
+            walks = int(rng.random() < 0.35)
+            splits.append({'date': day.isoformat(), 'isHome': rng.random() < 0.5, 'stat': {
+                'plateAppearances': at_bats + walks, 'atBats': at_bats, 'runs': rng.randint(0, hits + walks),
+                'hits': hits, 'doubles': doubles, 'triples': 0, 'homeRuns': home_runs,
+                'rbi': home_runs + rng.randint(0, hits), 'baseOnBalls': walks, 'strikeOuts': rng.randint(0, at_bats - hits),
+                'hitByPitch': 0, 'sacFlies': 0, 'stolenBases': int(rng.random() < 0.05), 'caughtStealing': 0,
+                'totalBases': hits + doubles + 3 * home_runs}})
+    return [{'group': {'displayName': 'pitching' if pitcher else 'hitting'}, 'type': {'displayName': 'gameLog'},
+             'splits': splits}]
+
+def _articles(rng):
+    teams = [team[0] for team in TEAMS.values()]
+    articles = []
+    for index in range(100):
+        team = rng.choice(teams)
+        articles.append({
+            'source': {'id': 'espn', 'name': 'ESPN'}, 'author': 'Staff',
+            'title': f"{team} {rng.choice(['rally past', 'edge', 'shut out', 'outlast'])} {rng.choice(teams)} in extra innings",
+            'description': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} homered as the {team} won again.",
+            'url': f"https://news.example.com/{index}", 'urlToImage': f"https://img.example.com/{index}.jpg",
+            'publishedAt': f"{DATE}T{index % 24:02d}:00:00Z", 'content': 'Full story inside.',
+        })
+    return {'status': 'ok', 'totalResults': len(articles), 'articles': articles}
+
+def _ok(body):
+    return {'status': 200, 'body': body}
+
+def build_fixtures(seed=20240704):
+    rng = random.Random(seed)
+    players = _players(rng)
+    people = {p['id']: p for roster in players.values() for p in roster}
+    mlb = {}
+
+    mlb['/api/v1/teams'] = _ok({'teams': [_team(team_id) for team_id in sorted(TEAMS)]})
+    for team_id in TEAMS:
+        mlb[f"/api/v1/teams/{team_id}"] = _ok({'teams': [_team(team_id)]})
+        mlb[f"/api/v1/teams/{team_id}/roster"] = _ok({'roster': [
+            {'person': person, 'jerseyNumber': person['primaryNumber'], 'position': person['primaryPosition'],
+             'status': {'code': 'A'}} for person in players[team_id]]})
+
+    team_ids = sorted(TEAMS)
+    games = []
+    for index in range(15):
+        home_id, away_id = team_ids[index * 2], team_ids[index * 2 + 1]
+        game_pk = 745000 + index
+        state = 'Live' if index < 3 else 'Final'
+        feed = _game_feed(rng, game_pk, home_id, away_id, players, state)
+        mlb[f"/api/v1/game/{game_pk}/feed/live"] = _ok(feed)
+        mlb[f"/api/v1.1/game/{game_pk}/feed/live"] = _ok(feed)
+        games.append({
+            'gamePk': game_pk, 'gameDate': f"{DATE}T23:05:00Z", 'gameType': 'R',
+            'status': {'abstractGameState': state, 'detailedState': feed['gameData']['status']['detailedState']},
+            'teams': {'home': {'team': {'id': home_id, 'name': TEAMS[home_id][0]},
+                               'score': feed['liveData']['linescore']['teams']['home']['runs']},
+                      'away': {'team': {'id': away_id, 'name': TEAMS[away_id][0]},
+                               'score': feed['liveData']['linescore']['teams']['away']['runs']}},
+            'venue': feed['gameData']['venue'],
+        })
+    mlb['/api/v1/schedule'] = _ok({'dates': [{'date': DATE, 'games': games}]})
+
+    stats = {person_id: _season_stats(rng, person) for person_id, person in people.items()}
+    for person_id, person in people.items():
+        mlb[f"/api/v1/people/{person_id}"] = _ok({'people': [person]})
+        mlb[f"/api/v1/people/{person_id}/stats"] = _ok({'stats': stats[person_id]})
+    mlb['/api/v1/people'] = _ok({'people': [dict(people[person_id], stats=stats[person_id])
+                                            for person_id in PLAYER_IDS[:60]]})
+    mlb['/api/v1/people/search'] = _ok({'people': [{'id': 592450, 'fullName': 'Aaron Judge'}]})
+
+    for group in ('hitting', 'pitching'):
+        query = f"stats=season&group={group}&playerPool=ALL&sportId=1&season={SEASON}&gameType=R&limit=3000"
+        mlb[fixture_key('/api/v1/stats', query)] = _ok({'stats': [{'group': {'displayName': group}, 'splits': [
+            _season_split(rng, person, group) for person in people.values()
+            if (person['primaryPosition']['abbreviation'] == 'P') == (group == 'pitching')]}]})
+
+    # Game-log ingestion: the season's player pool, then one hydrated request per chunk of players.
+    # Its own generator keeps every other fixture identical to earlier runs.
+    log_rng = random.Random(seed + 1)
+    pool = list(people.values())
+    mlb[fixture_key('/api/v1/sports/1/players', f"season={SEASON}")] = _ok({'people': pool})
+    hydrate = f"stats(group=[hitting,pitching],type=[gameLog],season={SEASON})"
+    for start in range(0, len(pool), GAME_LOG_CHUNK_SIZE):
+        chunk = pool[start:start + GAME_LOG_CHUNK_SIZE]
+        query = f"personIds={','.join(str(person['id']) for person in chunk)}&hydrate={hydrate}"
+        mlb[fixture_key('/api/v1/people', query)] = _ok({'people': [
+            {'id': person['id'], 'fullName': person['fullName'], 'stats': _game_log(log_rng, person)} for person in chunk]})
+
+    mlb['/api/v1/stats/leaders'] = _ok({'leagueLeaders': [
+        {'leaderCategory': category, 'leaders': [
+            {'rank': rank, 'value': str(rng.randint(10, 60)), 'person': {'id': person['id'], 'fullName': person['fullName']},
+             'team': person['currentTeam']}
+            for rank, person in enumerate(rng.sample(list(people.values()), 10), start=1)]}
+        for category in HITTING_CATEGORIES + PITCHING_CATEGORIES]})
+
+    records = []
+    for division_id, division_name in DIVISIONS.items():
+        team_records = []
+        for team_id in [t for t in team_ids if TEAMS[t][4] == division_id]:
+            wins = rng.randint(60, 100)
+            losses = 162 - wins
+            team_records.append({'team': {'id': team_id, 'name': TEAMS[team_id][0]}, 'wins': wins, 'losses': losses,
+                                 'leagueRecord': {'wins': wins, 'losses': losses, 'pct': f".{wins * 1000 // 162:03d}"},
+                                 'runDifferential': rng.randint(-150, 150), 'gamesBack': '-',
+                                 'streak': {'streakCode': rng.choice(['W1', 'W3', 'L2', 'L1'])}})
+        records.append({'league': {'id': 103 if division_id < 203 else 104,
+                                   'name': 'American League' if division_id < 203 else 'National League'},
+                        'division': {'id': division_id, 'name': division_name}, 'teamRecords': team_records})
+    mlb['/api/v1/standings'] = _ok({'records': records})
+
+    news = {'/v2/everything': _ok(_articles(rng))}
+    youtube = {'/youtube/v3/search': _ok({'items': [
+        {'id': {'videoId': f"vid{index:04d}"},
+         'snippet': {'title': f"MLB Highlights #{index}", 'publishedAt': f"{DATE}T12:00:00Z",
+                     'thumbnails': {'high': {'url': f"https://i.ytimg.com/vi/vid{index:04d}/hq.jpg"}}}}
+        for index in range(12)]})}
+    weather = {'/data/2.5/weather': _ok({'weather': [{'main': 'Clear', 'icon': '01d'}], 'main': {'temp': 24.6},
+                                         'name': 'Ballpark'})}
+    return {'mlb': mlb, 'news': news, 'youtube': youtube, 'weather': weather}
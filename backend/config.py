@@ -7,4 +7,147 @@ load_dotenv(dotenv_path=dotenv_path)
 class Config:
     OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY')
     NEWSAPI_KEY = os.getenv('NEWSAPI_KEY')
-    YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
\ No newline at end of file
+    YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+
+    MLB_API_BASE = os.getenv('MLB_API_BASE', 'https://statsapi.mlb.com/api/v1')
+    NEWSAPI_BASE = os.getenv('NEWSAPI_BASE', 'https://newsapi.org/v2')
+    YOUTUBE_API_BASE = os.getenv('YOUTUBE_API_BASE', 'https://www.googleapis.com/youtube/v3')
+    OPENWEATHER_API_BASE = os.getenv('OPENWEATHER_API_BASE', 'https://api.openweathermap.org/data/2.5')
+
+    SERVER_HOST = os.getenv('SERVER_HOST', '127.0.0.1')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', 5000))
+    CORS_ORIGINS = [origin.strip() for origin in os.getenv('CORS_ORIGINS', 'http://localhost:8080').split(',')]
+    SERVER_ASYNC = os.getenv('SERVER_ASYNC', 'false').lower() == 'true'
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', 0))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 8))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 30))
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', 0))
+    SERVER_PID_FILE = os.getenv('SERVER_PID_FILE')
+    SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 1000))
+    # Set (by serve.py, or PROMETHEUS_MULTIPROC_DIR) when several worker processes share one /metrics endpoint.
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR') or os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+
+    DATA_DIR = os.getenv('DATA_DIR', os.path.join(os.path.dirname(__file__), 'data'))
+    # 'lazy' starts background subsystems once the process serves (see app/lifecycle.py); 'eager' at import.
+    STARTUP_MODE = os.getenv('STARTUP_MODE', 'lazy')
+    CACHE_SNAPSHOT_ENABLED = os.getenv('CACHE_SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    CACHE_SNAPSHOT_PATH = os.getenv('CACHE_SNAPSHOT_PATH', os.path.join(DATA_DIR, 'cache_snapshot.json'))
+    CACHE_SNAPSHOT_SECONDS = float(os.getenv('CACHE_SNAPSHOT_SECONDS', 300))
+
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10))
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 8))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 32))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 2))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.3))
+    # Longest Retry-After a request will sleep through before giving up on the retry.
+    HTTP_MAX_RETRY_AFTER = float(os.getenv('HTTP_MAX_RETRY_AFTER', 5))
+    ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', 256))
+
+    CIRCUIT_ENABLED = os.getenv('CIRCUIT_ENABLED', 'true').lower() == 'true'
+    CIRCUIT_WINDOW_SECONDS = float(os.getenv('CIRCUIT_WINDOW_SECONDS', 60))
+    CIRCUIT_MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', 10))
+    CIRCUIT_ERROR_RATE = float(os.getenv('CIRCUIT_ERROR_RATE', 0.5))
+    CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', 5))
+    CIRCUIT_SLOW_RATE = float(os.getenv('CIRCUIT_SLOW_RATE', 0.8))
+    CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', 30))
+    CIRCUIT_HALF_OPEN_PROBES = int(os.getenv('CIRCUIT_HALF_OPEN_PROBES', 1))
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 64))
+
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 2048))
+    # memory://, sqlite:///path/to/file or redis://host:port/db; empty disables the shared tier.
+    # Off for run.py; serve.py defaults it to a SQLite file under DATA_DIR so its workers share fills.
+    SHARED_CACHE_URL = os.getenv('SHARED_CACHE_URL', '')
+    SHARED_CACHE_PURGE_EVERY = int(os.getenv('SHARED_CACHE_PURGE_EVERY', 500))
+    SHARED_CACHE_MAX_ENTRIES = int(os.getenv('SHARED_CACHE_MAX_ENTRIES', 5000))
+    CACHE_STALE_SECONDS = float(os.getenv('CACHE_STALE_SECONDS', 300))
+    CACHE_TTL_LIVE = float(os.getenv('CACHE_TTL_LIVE', 10))
+    CACHE_TTL_SCHEDULE = float(os.getenv('CACHE_TTL_SCHEDULE', 60))
+    CACHE_TTL_GAME = float(os.getenv('CACHE_TTL_GAME', 120))
+    CACHE_TTL_STANDINGS = float(os.getenv('CACHE_TTL_STANDINGS', 600))
+    CACHE_TTL_LEADERS = float(os.getenv('CACHE_TTL_LEADERS', 600))
+    CACHE_TTL_TEAM = float(os.getenv('CACHE_TTL_TEAM', 3600))
+    CACHE_TTL_ROSTER = float(os.getenv('CACHE_TTL_ROSTER', 900))
+    CACHE_TTL_PLAYER = float(os.getenv('CACHE_TTL_PLAYER', 900))
+    CACHE_TTL_SEARCH = float(os.getenv('CACHE_TTL_SEARCH', 300))
+    CACHE_TTL_WEATHER = float(os.getenv('CACHE_TTL_WEATHER', 600))
+
+    FANOUT_MAX_WORKERS = int(os.getenv('FANOUT_MAX_WORKERS', 16))
+    FANOUT_OPTIONAL_TIMEOUT = float(os.getenv('FANOUT_OPTIONAL_TIMEOUT', 2.0))
+
+    REFERENCE_INDEX_REFRESH_SECONDS = float(os.getenv('REFERENCE_INDEX_REFRESH_SECONDS', 6 * 3600))
+    REFERENCE_INDEX_FUZZY_THRESHOLD = float(os.getenv('REFERENCE_INDEX_FUZZY_THRESHOLD', 0.35))
+
+    MLB_LIVE_API_BASE = os.getenv('MLB_LIVE_API_BASE', 'https://statsapi.mlb.com/api/v1.1')
+    LIVE_POLL_SECONDS = float(os.getenv('LIVE_POLL_SECONDS', 5))
+    LIVE_IDLE_POLL_SECONDS = float(os.getenv('LIVE_IDLE_POLL_SECONDS', 60))
+    LIVE_HEARTBEAT_SECONDS = float(os.getenv('LIVE_HEARTBEAT_SECONDS', 15))
+    LIVE_SUBSCRIBER_QUEUE_SIZE = int(os.getenv('LIVE_SUBSCRIBER_QUEUE_SIZE', 32))
+    # Per worker. Threaded streams hold a request thread each, so leave most threads for ordinary requests.
+    LIVE_MAX_THREAD_STREAMS = int(os.getenv('LIVE_MAX_THREAD_STREAMS', max(SERVER_THREADS // 2, 1)))
+    LIVE_MAX_ASYNC_STREAMS = int(os.getenv('LIVE_MAX_ASYNC_STREAMS', 1000))
+
+    SCOREBOARD_LIVE_SECONDS = float(os.getenv('SCOREBOARD_LIVE_SECONDS', 10))
+    SCOREBOARD_IDLE_SECONDS = float(os.getenv('SCOREBOARD_IDLE_SECONDS', 120))
+    SCOREBOARD_MAX_DATES = int(os.getenv('SCOREBOARD_MAX_DATES', 64))
+    SCOREBOARD_HISTORY_SECONDS = float(os.getenv('SCOREBOARD_HISTORY_SECONDS', 3600))
+
+    HISTORY_DB_PATH = os.getenv('HISTORY_DB_PATH', os.path.join(DATA_DIR, 'history.sqlite3'))
+
+    BULK_MAX_IDS = int(os.getenv('BULK_MAX_IDS', 200))
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 50))
+
+    CACHE_TTL_SEASON_STATS = float(os.getenv('CACHE_TTL_SEASON_STATS', 900))
+    PREFETCH_SEASON_STATS_SECONDS = float(os.getenv('PREFETCH_SEASON_STATS_SECONDS', 600))
+    SEASON_STATS_POOL_LIMIT = int(os.getenv('SEASON_STATS_POOL_LIMIT', 3000))
+    SEASON_STATS_QUALIFY_PA_PER_GAME = float(os.getenv('SEASON_STATS_QUALIFY_PA_PER_GAME', 3.1))
+    SEASON_STATS_QUALIFY_IP_PER_GAME = float(os.getenv('SEASON_STATS_QUALIFY_IP_PER_GAME', 1.0))
+
+    GAME_LOG_DIR = os.getenv('GAME_LOG_DIR', os.path.join(DATA_DIR, 'game_logs'))
+    GAME_LOG_REFRESH_SECONDS = float(os.getenv('GAME_LOG_REFRESH_SECONDS', 10800))
+    GAME_LOG_DEFAULT_WINDOWS = os.getenv('GAME_LOG_DEFAULT_WINDOWS', '7,15,30')
+    GAME_LOG_MAX_WINDOW_DAYS = int(os.getenv('GAME_LOG_MAX_WINDOW_DAYS', 200))
+    GAME_LOG_QUALIFY_PER_DAY = {
+        'hitting': float(os.getenv('GAME_LOG_QUALIFY_PA_PER_DAY', 2.9)),
+        'pitching': float(os.getenv('GAME_LOG_QUALIFY_IP_PER_DAY', 0.93)),
+    }
+
+    PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'true').lower() == 'true'
+    PREFETCH_LOCK_PATH = os.getenv('PREFETCH_LOCK_PATH', os.path.join(DATA_DIR, 'prefetch.lock'))
+    PREFETCH_LEADER_RETRY_SECONDS = float(os.getenv('PREFETCH_LEADER_RETRY_SECONDS', 30))
+    PREFETCH_SCHEDULE_SECONDS = float(os.getenv('PREFETCH_SCHEDULE_SECONDS', 30))
+    PREFETCH_STANDINGS_SECONDS = float(os.getenv('PREFETCH_STANDINGS_SECONDS', 300))
+    PREFETCH_LEADERS_SECONDS = float(os.getenv('PREFETCH_LEADERS_SECONDS', 300))
+    PREFETCH_TEAMS_SECONDS = float(os.getenv('PREFETCH_TEAMS_SECONDS', 600))
+    PREFETCH_OFF_PEAK_FACTOR = float(os.getenv('PREFETCH_OFF_PEAK_FACTOR', 6))
+    PREFETCH_WINDOW_LEAD_MINUTES = int(os.getenv('PREFETCH_WINDOW_LEAD_MINUTES', 60))
+    PREFETCH_WINDOW_GAME_MINUTES = int(os.getenv('PREFETCH_WINDOW_GAME_MINUTES', 240))
+
+    NEWS_REFRESH_SECONDS = float(os.getenv('NEWS_REFRESH_SECONDS', 900))
+    NEWS_TOP_ARTICLES = int(os.getenv('NEWS_TOP_ARTICLES', 40))
+    NEWS_MAX_STORED_ARTICLES = int(os.getenv('NEWS_MAX_STORED_ARTICLES', 500))
+    NEWS_SEEN_URLS = int(os.getenv('NEWS_SEEN_URLS', 1000))
+
+    QUOTA_RESET_UTC_OFFSET_HOURS = float(os.getenv('QUOTA_RESET_UTC_OFFSET_HOURS', -8))
+    QUOTA_LOW_WATER_FRACTION = float(os.getenv('QUOTA_LOW_WATER_FRACTION', 0.1))
+    QUOTA_YOUTUBE_DAILY_UNITS = int(os.getenv('QUOTA_YOUTUBE_DAILY_UNITS', 10000))
+    QUOTA_YOUTUBE_PER_MINUTE = float(os.getenv('QUOTA_YOUTUBE_PER_MINUTE', 5))
+    QUOTA_NEWSAPI_DAILY_UNITS = int(os.getenv('QUOTA_NEWSAPI_DAILY_UNITS', 100))
+    QUOTA_NEWSAPI_PER_MINUTE = float(os.getenv('QUOTA_NEWSAPI_PER_MINUTE', 2))
+    QUOTA_OPENWEATHER_DAILY_UNITS = int(os.getenv('QUOTA_OPENWEATHER_DAILY_UNITS', 30000))
+    QUOTA_OPENWEATHER_PER_MINUTE = float(os.getenv('QUOTA_OPENWEATHER_PER_MINUTE', 60))
+    CACHE_TTL_HIGHLIGHTS = float(os.getenv('CACHE_TTL_HIGHLIGHTS', 1800))
+
+    VENUE_WEATHER_REFRESH_SECONDS = float(os.getenv('VENUE_WEATHER_REFRESH_SECONDS', 600))
+
+    LEADER_HITTING_CATEGORIES = os.getenv('LEADER_HITTING_CATEGORIES', 'homeRuns,battingAverage,runsBattedIn,onBasePlusSlugging,hits,runs')
+    LEADER_PITCHING_CATEGORIES = os.getenv('LEADER_PITCHING_CATEGORIES', 'earnedRunAverage,wins,strikeouts,walksAndHitsPerInningPitched,saves,inningsPitched')
+    LEADERS_MAX_LIMIT = int(os.getenv('LEADERS_MAX_LIMIT', 50))
+    MATERIALIZED_MAX_VIEWS = int(os.getenv('MATERIALIZED_MAX_VIEWS', 64))
+
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512))
+    RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESS_MIN_BYTES', 1024))
+    RESPONSE_GZIP_LEVEL = int(os.getenv('RESPONSE_GZIP_LEVEL', 6))
+    RESPONSE_BROTLI_QUALITY = int(os.getenv('RESPONSE_BROTLI_QUALITY', 5))
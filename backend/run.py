@@ -1,12 +1,38 @@
 from flask import Flask
 from flask_cors import CORS
-from app.routes import api_bp
+from config import Config
+from app import http_client
+from app.cache import load_cache_snapshot
+from app.game_logs import game_log_store
+from app.lifecycle import lifecycle
+from app.metrics import start_metrics_flusher
+from app.routes import api_bp, metrics_bp
+from app.reference_index import reference_index
+from app.scheduler import prefetch_scheduler
 
 app = Flask(__name__)
 
-CORS(app, resources={r"/api/*": {"origins": "http://localhost:8080"}})
+CORS(app, resources={r"/api/*": {"origins": Config.CORS_ORIGINS}})
 
 app.register_blueprint(api_bp)
+app.register_blueprint(metrics_bp)
+
+# Loading the snapshot is a single file read, so it runs before the first request is served.
+if Config.CACHE_SNAPSHOT_ENABLED:
+    lifecycle.register('cache_snapshot', load_cache_snapshot, required=True, blocking=True)
+lifecycle.register('metrics_flush', start_metrics_flusher)
+lifecycle.register('http_pool', http_client.warm_up, is_warm=http_client.is_warm)
+lifecycle.register('reference_index', reference_index.start_background_refresh,
+                   is_warm=lambda: reference_index.ready)
+lifecycle.register('prefetch_scheduler', prefetch_scheduler.start,
+                   is_warm=lambda: prefetch_scheduler.started or not Config.PREFETCH_ENABLED)
+lifecycle.register('game_logs', is_warm=lambda: game_log_store.table('hitting') is not None)
+
+# Servers that expose a post-fork hook (serve.py, the ASGI lifespan) start the
+# subsystems there; the first request covers everything else.
+app.before_request(lifecycle.start)
+if Config.STARTUP_MODE == 'eager':
+    lifecycle.start()
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=Config.SERVER_PORT)
\ No newline at end of file
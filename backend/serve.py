@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+from gunicorn.app.base import BaseApplication
+from config import Config
+
+# Production entry point: `python serve.py`. Send SIGHUP to the master process
+# for a graceful reload (new workers start before old ones are retired).
+# Workers share cache fills through SHARED_CACHE_URL (default data/shared_cache.sqlite3).
+# Workers flush their metrics to METRICS_MULTIPROC_DIR (default data/metrics)
+# so /metrics reports the whole server, up to METRICS_FLUSH_SECONDS behind;
+# files of recycled workers are folded into retired.json.
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Each worker imports the app itself so its background threads start after the fork.
+        if Config.SERVER_ASYNC:
+            from asgi import app
+        else:
+            from run import app
+        return app
+
+def on_starting(server):
+    # Runs once in the master before any worker forks, so every worker inherits these settings.
+    from app.metrics import reset_metrics_dir
+    Config.SHARED_CACHE_URL = Config.SHARED_CACHE_URL or 'sqlite://' + os.path.join(Config.DATA_DIR, 'shared_cache.sqlite3')
+    Config.METRICS_MULTIPROC_DIR = Config.METRICS_MULTIPROC_DIR or os.path.join(Config.DATA_DIR, 'metrics')
+    reset_metrics_dir()
+
+def post_worker_init(worker):
+    # Runs in each worker once the app is loaded, just before it starts accepting connections.
+    from app.lifecycle import lifecycle
+    lifecycle.start()
+
+def server_options():
+    cores = multiprocessing.cpu_count()
+    workers = Config.SERVER_WORKERS or (cores if Config.SERVER_ASYNC else cores * 2 + 1)
+    return {
+        'bind': f"{Config.SERVER_HOST}:{Config.SERVER_PORT}",
+        'workers': workers,
+        'worker_class': 'uvicorn.workers.UvicornWorker' if Config.SERVER_ASYNC else 'gthread',
+        'threads': Config.SERVER_THREADS,
+        'timeout': Config.SERVER_TIMEOUT,
+        'graceful_timeout': Config.SERVER_GRACEFUL_TIMEOUT,
+        'keepalive': 5,
+        'max_requests': Config.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': Config.SERVER_MAX_REQUESTS // 10,
+        'preload_app': False,
+        'pidfile': Config.SERVER_PID_FILE,
+        'accesslog': '-',
+        'on_starting': on_starting,
+        'post_worker_init': post_worker_init,
+    }
+
+if __name__ == '__main__':
+    ProductionServer(server_options()).run()
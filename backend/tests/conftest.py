@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# Settle the environment before config is imported: scratch data directory,
+# no background prefetching, and no shared cache tier.
+os.environ['DATA_DIR'] = tempfile.mkdtemp(prefix='mlb-hub-tests-')
+os.environ['PREFETCH_ENABLED'] = 'false'
+os.environ['SHARED_CACHE_URL'] = ''
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.cache import ResponseCache
+
+def _wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def test_concurrent_misses_share_one_fetch():
+    cache = ResponseCache(16, 0)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'value': 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('k', fetch, 60)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{'value': 1}] * 8
+
+def test_leader_error_reaches_followers_and_is_not_cached():
+    cache = ResponseCache(16, 0)
+    started = threading.Event()
+
+    def failing_fetch():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError('upstream down')
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_fetch('k', failing_fetch, 60)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=call) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader] + followers:
+        thread.join()
+    assert len(errors) == 4
+    assert len({id(error) for error in errors}) == 1
+    assert cache.get_or_fetch('k', lambda: 'recovered', 60) == 'recovered'
+
+def test_stale_entry_is_served_while_revalidating():
+    cache = ResponseCache(16, stale_seconds=10)
+    cache.set('k', 'old', 0.05)
+    time.sleep(0.08)
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.set()
+        return 'new'
+
+    assert cache.get_or_fetch('k', fetch, 60) == 'old'
+    assert refreshed.wait(2)
+    assert _wait_for(lambda: cache.get_or_fetch('k', fetch, 60) == 'new')
+
+def test_entry_past_the_stale_window_is_fetched_inline():
+    # The stale window is capped at the entry's own TTL.
+    cache = ResponseCache(16, stale_seconds=10)
+    cache.set('k', 'old', 0.02)
+    time.sleep(0.06)
+    assert cache.get_or_fetch('k', lambda: 'new', 60) == 'new'
+
+def test_zero_ttl_values_are_not_cached():
+    cache = ResponseCache(16, 0)
+    cache.set('k', 'value', lambda value: 0)
+    assert cache.get_or_fetch('k', lambda: 'fetched', 60) == 'fetched'
+
+def test_async_misses_share_one_fetch():
+    cache = ResponseCache(16, 0)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'value'
+
+    async def main():
+        return await asyncio.gather(*[cache.get_or_fetch_async('k', fetch, 60) for _ in range(10)])
+
+    assert asyncio.run(main()) == ['value'] * 10
+    assert len(calls) == 1
+
+def test_async_leader_error_reaches_followers():
+    cache = ResponseCache(16, 0)
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        raise ValueError('upstream down')
+
+    async def main():
+        return await asyncio.gather(*[cache.get_or_fetch_async('k', fetch, 60) for _ in range(3)],
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_cancelled_async_leader_hands_the_fetch_to_a_follower():
+    cache = ResponseCache(16, 0)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return 'value'
+
+    async def main():
+        leader = asyncio.ensure_future(cache.get_or_fetch_async('k', fetch, 60))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.get_or_fetch_async('k', fetch, 60))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.wait_for(follower, 2)
+
+    assert asyncio.run(main()) == 'value'
+    assert len(calls) == 2
+
+def test_cancelled_async_follower_leaves_the_leader_running():
+    cache = ResponseCache(16, 0)
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 'value'
+
+    async def main():
+        leader = asyncio.ensure_future(cache.get_or_fetch_async('k', fetch, 60))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.get_or_fetch_async('k', fetch, 60))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(main()) == 'value'
@@ -0,0 +1,125 @@
+import types
+import pytest
+from app import circuit
+from app.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from config import Config
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit, 'time', types.SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(Config, 'CIRCUIT_ENABLED', True)
+    monkeypatch.setattr(Config, 'CIRCUIT_WINDOW_SECONDS', 60)
+    monkeypatch.setattr(Config, 'CIRCUIT_MIN_CALLS', 4)
+    monkeypatch.setattr(Config, 'CIRCUIT_ERROR_RATE', 0.5)
+    monkeypatch.setattr(Config, 'CIRCUIT_SLOW_RATE', 0.5)
+    monkeypatch.setattr(Config, 'CIRCUIT_SLOW_CALL_SECONDS', 5)
+    monkeypatch.setattr(Config, 'CIRCUIT_OPEN_SECONDS', 30)
+    monkeypatch.setattr(Config, 'CIRCUIT_HALF_OPEN_PROBES', 1)
+    return clock
+
+def _call(breaker, failed=False, seconds=0.1):
+    breaker.before_call()
+    breaker.record(failed, seconds)
+
+def _open(breaker):
+    for failed in (False, True, True, True):
+        _call(breaker, failed)
+    assert breaker.state == OPEN
+
+def test_stays_closed_below_the_minimum_calls(clock):
+    breaker = CircuitBreaker('example.com')
+    for _ in range(3):
+        _call(breaker, failed=True)
+    assert breaker.state == CLOSED
+
+def test_opens_on_error_rate_and_rejects_calls(clock):
+    breaker = CircuitBreaker('example.com')
+    _open(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.times_opened == 1
+
+def test_opens_on_slow_calls(clock):
+    breaker = CircuitBreaker('example.com')
+    for _ in range(4):
+        _call(breaker, seconds=10)
+    assert breaker.state == OPEN
+
+def test_old_calls_leave_the_window(clock):
+    breaker = CircuitBreaker('example.com')
+    for _ in range(3):
+        _call(breaker, failed=True)
+    clock.now += 61
+    _call(breaker)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()['window_calls'] == 1
+
+def test_half_open_admits_one_probe_and_closes_on_success(clock):
+    breaker = CircuitBreaker('example.com')
+    _open(breaker)
+    clock.now += 31
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(False, 0.1)
+    assert breaker.state == CLOSED
+    _call(breaker)
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker('example.com')
+    _open(breaker)
+    clock.now += 31
+    _call(breaker, failed=True)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_cancelled_probe_frees_its_slot(clock):
+    breaker = CircuitBreaker('example.com')
+    _open(breaker)
+    clock.now += 31
+    breaker.before_call()
+    breaker.cancel()
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+def test_trip_holds_the_circuit_open_for_retry_after(clock):
+    breaker = CircuitBreaker('example.com')
+    breaker.trip(120)
+    clock.now += 31
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now += 90
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    breaker.record(False, 0.1)
+    # A later ordinary opening uses the configured cool-down again.
+    _open(breaker)
+    clock.now += 31
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+def test_short_trip_uses_the_configured_cool_down(clock):
+    breaker = CircuitBreaker('example.com')
+    breaker.trip(1)
+    clock.now += 10
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_disabled_breaker_never_rejects(clock, monkeypatch):
+    monkeypatch.setattr(Config, 'CIRCUIT_ENABLED', False)
+    breaker = CircuitBreaker('example.com')
+    for _ in range(10):
+        _call(breaker, failed=True)
+    breaker.trip(120)
+    assert breaker.state == CLOSED
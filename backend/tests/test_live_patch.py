@@ -0,0 +1,52 @@
+import pytest
+from app.live import apply_json_patch
+
+def _doc():
+    return {'gameData': {'status': {'abstractGameState': 'Live'}},
+            'liveData': {'plays': [{'id': 'a'}, {'id': 'b'}], 'linescore': {'home': 1, 'away': 0}},
+            'a/b': {'m~n': 1}}
+
+def test_replace_add_and_remove_object_members():
+    doc = apply_json_patch(_doc(), [
+        {'op': 'replace', 'path': '/liveData/linescore/home', 'value': 2},
+        {'op': 'add', 'path': '/liveData/linescore/inning', 'value': 5},
+        {'op': 'remove', 'path': '/liveData/linescore/away'},
+    ])
+    assert doc['liveData']['linescore'] == {'home': 2, 'inning': 5}
+
+def test_list_insert_append_replace_and_remove():
+    doc = apply_json_patch(_doc(), [
+        {'op': 'add', 'path': '/liveData/plays/1', 'value': {'id': 'x'}},
+        {'op': 'add', 'path': '/liveData/plays/-', 'value': {'id': 'c'}},
+        {'op': 'replace', 'path': '/liveData/plays/0', 'value': {'id': 'a2'}},
+        {'op': 'remove', 'path': '/liveData/plays/2'},
+    ])
+    assert [play['id'] for play in doc['liveData']['plays']] == ['a2', 'x', 'c']
+
+def test_escaped_pointer_segments():
+    doc = apply_json_patch(_doc(), [{'op': 'replace', 'path': '/a~1b/m~0n', 'value': 2}])
+    assert doc['a/b'] == {'m~n': 2}
+
+def test_move_and_copy():
+    doc = apply_json_patch(_doc(), [
+        {'op': 'copy', 'from': '/liveData/linescore', 'path': '/linescoreCopy'},
+        {'op': 'move', 'from': '/liveData/plays/0', 'path': '/firstPlay'},
+    ])
+    assert doc['linescoreCopy'] == {'home': 1, 'away': 0}
+    assert doc['firstPlay'] == {'id': 'a'}
+    assert [play['id'] for play in doc['liveData']['plays']] == ['b']
+
+def test_copied_value_is_independent_of_its_source():
+    doc = apply_json_patch(_doc(), [
+        {'op': 'copy', 'from': '/liveData/linescore', 'path': '/linescoreCopy'},
+        {'op': 'replace', 'path': '/linescoreCopy/home', 'value': 9},
+    ])
+    assert doc['liveData']['linescore']['home'] == 1
+    assert doc['linescoreCopy']['home'] == 9
+
+def test_root_replace_swaps_the_document():
+    assert apply_json_patch(_doc(), [{'op': 'replace', 'path': '', 'value': {'new': True}}]) == {'new': True}
+
+def test_missing_parent_raises():
+    with pytest.raises(KeyError):
+        apply_json_patch(_doc(), [{'op': 'add', 'path': '/nope/child', 'value': 1}])
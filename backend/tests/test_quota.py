@@ -0,0 +1,74 @@
+import pytest
+from app.quota import ProviderPolicy, QuotaExceededError, QuotaLimiter
+from app.shared_cache import MemoryCacheBackend, SQLiteCacheBackend
+
+URL = 'https://api.example.com/v1/search'
+
+def _policy(daily_units=5, per_minute=100, path_costs=None):
+    return ProviderPolicy('example', 'api.example.com', 'key', daily_units, per_minute, path_costs)
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def counters(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryCacheBackend()
+    return SQLiteCacheBackend(str(tmp_path / 'shared.sqlite3'))
+
+def test_daily_budget_is_enforced(counters):
+    limiter = QuotaLimiter([_policy(daily_units=3)], counters)
+    for _ in range(3):
+        limiter.acquire(URL, {'key': 'secret'})
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire(URL, {'key': 'secret'})
+    [quota] = limiter.snapshot()
+    assert (quota['used_units'], quota['remaining_units'], quota['calls'], quota['denied']) == (3, 0, 3, 1)
+
+def test_path_costs_are_charged(counters):
+    limiter = QuotaLimiter([_policy(daily_units=150, path_costs={'/v1/search': 100})], counters)
+    limiter.acquire(URL, {'key': 'secret'})
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire(URL, {'key': 'secret'})
+    # The denied call was rolled back, so cheaper calls still fit.
+    limiter.acquire('https://api.example.com/v1/other', {'key': 'secret'})
+    assert limiter.snapshot()[0]['used_units'] == 101
+
+def test_per_minute_limit(counters):
+    limiter = QuotaLimiter([_policy(daily_units=100, per_minute=2)], counters)
+    limiter.acquire(URL, {'key': 'secret'})
+    limiter.acquire(URL, {'key': 'secret'})
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire(URL, {'key': 'secret'})
+    assert limiter.snapshot()[0]['used_units'] == 2
+
+def test_workers_share_one_budget(counters):
+    first = QuotaLimiter([_policy(daily_units=4)], counters)
+    second = QuotaLimiter([_policy(daily_units=4)], counters)
+    first.acquire(URL, {'key': 'secret'})
+    second.acquire(URL, {'key': 'secret'})
+    first.acquire(URL, {'key': 'secret'})
+    second.acquire(URL, {'key': 'secret'})
+    with pytest.raises(QuotaExceededError):
+        first.acquire(URL, {'key': 'secret'})
+    assert second.snapshot()[0]['remaining_units'] == 0
+
+def test_keys_have_separate_budgets_and_are_not_exposed(counters):
+    limiter = QuotaLimiter([_policy(daily_units=1)], counters)
+    limiter.acquire(URL + '?key=first-secret')
+    limiter.acquire(URL, {'key': 'second-secret'})
+    snapshot = limiter.snapshot()
+    assert len(snapshot) == 2
+    assert not any('secret' in quota['key'] for quota in snapshot)
+
+def test_untracked_hosts_are_not_metered(counters):
+    limiter = QuotaLimiter([_policy(daily_units=0)], counters)
+    limiter.acquire('https://statsapi.mlb.com/api/v1/teams')
+    assert not limiter.is_tracked('https://statsapi.mlb.com/api/v1/teams')
+    assert limiter.snapshot() == []
+
+def test_is_low_near_the_end_of_the_budget(counters, monkeypatch):
+    from config import Config
+    monkeypatch.setattr(Config, 'QUOTA_LOW_WATER_FRACTION', 0.5)
+    limiter = QuotaLimiter([_policy(daily_units=4)], counters)
+    assert not limiter.is_low(URL, {'key': 'secret'})
+    limiter.acquire(URL, {'key': 'secret'})
+    limiter.acquire(URL, {'key': 'secret'})
+    assert limiter.is_low(URL, {'key': 'secret'})
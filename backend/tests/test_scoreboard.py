@@ -0,0 +1,71 @@
+from app.cache import IMMUTABLE
+from app.scoreboard import DateBoard, _schedule_ttl
+from config import Config
+
+def _game(game_pk, home_score=0, state='Final'):
+    return {'gamePk': game_pk, 'gameDate': '2026-04-01T23:05:00Z', 'gameType': 'R',
+            'status': {'abstractGameState': state, 'detailedState': state},
+            'teams': {'home': {'team': {'id': 147, 'name': 'New York Yankees'}, 'score': home_score},
+                      'away': {'team': {'id': 111, 'name': 'Boston Red Sox'}, 'score': 1}},
+            'venue': {'id': 3313, 'name': 'Yankee Stadium'}}
+
+def _schedule(*games):
+    return {'dates': [{'date': '2026-04-01', 'games': list(games)}]}
+
+def test_same_content_gives_every_worker_the_same_version():
+    first, second = DateBoard('2026-04-01'), DateBoard('2026-04-01')
+    first.apply(_schedule(_game(1), _game(2)), 0)
+    second.apply(_schedule(_game(1), _game(2)), 5)
+    assert first.etag == second.etag
+    second.apply(_schedule(_game(1), _game(2, home_score=3)), 10)
+    assert first.etag != second.etag
+
+def test_delta_lists_only_changed_and_removed_games():
+    board = DateBoard('2026-04-02')
+    board.apply(_schedule(_game(1), _game(2), _game(3)), 0)
+    version, _ = board.current()
+    board.apply(_schedule(_game(1), _game(2, home_score=4), _game(4)), 1)
+    delta = board.delta(version)
+    assert delta['full'] is False
+    assert delta['version'] == board.etag
+    assert [game['id'] for game in delta['games']] == [2, 4]
+    assert delta['removed'] == [3]
+
+def test_delta_against_the_current_version_is_empty():
+    board = DateBoard('2026-04-03')
+    board.apply(_schedule(_game(1)), 0)
+    delta = board.delta(board.etag)
+    assert (delta['full'], delta['games'], delta['removed']) == (False, [], [])
+
+def test_unknown_or_missing_version_gets_the_full_board():
+    board = DateBoard('2026-04-04')
+    board.apply(_schedule(_game(1), _game(2)), 0)
+    for since in (None, 'not-a-version'):
+        delta = board.delta(since)
+        assert delta['full'] is True
+        assert [game['id'] for game in delta['games']] == [1, 2]
+
+def test_delta_from_another_workers_version():
+    # Versions are recorded in the response cache, so a board that never held
+    # the old version can still compute the delta from it.
+    other = DateBoard('2026-04-05')
+    other.apply(_schedule(_game(1), _game(2)), 0)
+    board = DateBoard('2026-04-05')
+    board.apply(_schedule(_game(1), _game(2, home_score=7)), 0)
+    delta = board.delta(other.etag)
+    assert delta['full'] is False
+    assert [game['id'] for game in delta['games']] == [2]
+
+def test_settled_past_dates_stop_refreshing():
+    board = DateBoard('2026-04-06')
+    board.apply(_schedule(_game(1), _game(2)), 0)
+    assert board.settled and not board.is_due(10 ** 6)
+    board = DateBoard('2026-04-06')
+    board.apply(_schedule(_game(1), _game(2, state='Live')), 0)
+    assert board.live and not board.settled
+    assert board.is_due(Config.SCOREBOARD_LIVE_SECONDS)
+
+def test_schedule_ttl_follows_game_states():
+    assert _schedule_ttl('2026-04-06')(_schedule(_game(1))) == IMMUTABLE
+    assert _schedule_ttl('2026-04-06')(_schedule(_game(1, state='Live'))) == Config.SCOREBOARD_LIVE_SECONDS
+    assert _schedule_ttl('9999-01-01')(_schedule(_game(1))) == Config.SCOREBOARD_IDLE_SECONDS
@@ -12,17 +12,35 @@ export default {
     const url = dateString ? `/schedule/${dateString}` : '/schedule';
     return apiClient.get(url);
   },
+  getScheduleChanges(dateString, since, etag) {
+    const url = dateString ? `/schedule/${dateString}` : '/schedule';
+    const headers = etag ? { 'If-None-Match': etag } : {};
+    return apiClient.get(url, {
+      params: { since },
+      headers,
+      validateStatus: status => (status >= 200 && status < 300) || status === 304
+    });
+  },
   searchData(query) {
     return apiClient.get('/search', { params: { q: query } });
   },
+  getSearchSuggestions(query, limit = 8) {
+    return apiClient.get('/search/suggest', { params: { q: query, limit } });
+  },
   getPlayerStats(playerId) {
     return apiClient.get(`/player/${playerId}/stats`);
   },
   getPlayerDetails(playerId) {
     return apiClient.get(`/player/${playerId}/details`);
   },
-  getLeagueLeaders() {
-    return apiClient.get('/leaders');
+  getPlayersStats(playerIds) {
+    return apiClient.get('/players/stats', { params: { ids: playerIds.join(',') } });
+  },
+  getPlayersDetails(playerIds) {
+    return apiClient.get('/players/details', { params: { ids: playerIds.join(',') } });
+  },
+  getLeagueLeaders(params = {}) {
+    return apiClient.get('/leaders', { params });
   },
   getTeamDetails(teamId) {
     return apiClient.get(`/team/${teamId}/details`);
@@ -30,6 +48,9 @@ export default {
   getGameDetails(gameId) {
     return apiClient.get(`/game/${gameId}/details`);
   },
+  openGameStream(gameId) {
+    return new EventSource(`${apiClient.defaults.baseURL}/game/${gameId}/stream`);
+  },
   getNews(page = 1) {
     return apiClient.get('/news', { params: { page } });
   },
@@ -40,7 +61,7 @@ export default {
     }
     return apiClient.get(url);
   },
-  getStandings() {
-    return apiClient.get('/standings');
+  getStandings(params = {}) {
+    return apiClient.get('/standings', { params });
   }
 };
\ No newline at end of file